@@ -0,0 +1,65 @@
+"""
+토큰 검증 캐시 on/off 상태에서 요청당 지연 시간을 비교합니다.
+로컬 스텁 auth-service를 띄운 뒤 Django 테스트 클라이언트로 편지 목록 API를 호출합니다.
+
+    python benchmarks/bench_auth_cache.py --requests 2000 --users 50 --auth-latency 0.005
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def run(client, n_requests, n_users):
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n_requests):
+            token = f"user-{i % n_users + 1}"
+            started = time.perf_counter()
+            response = client.get('/api/letters/', HTTP_AUTHORIZATION=f"Bearer {token}")
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.status_code
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--auth-latency', type=float, default=0.002, help='스텁 auth-service 응답 지연(초)')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler, latency=args.auth_latency)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    setup_django()
+
+    from django.test import Client
+    from letters import auth_client
+
+    client = Client()
+
+    auth_client.TOKEN_CACHE_ENABLED = False
+    calls_before = server.RequestHandlerClass.calls
+    print_summary('cache off', run(client, args.requests, args.users))
+    print(f"  auth-service calls: {server.RequestHandlerClass.calls - calls_before}")
+
+    auth_client.TOKEN_CACHE_ENABLED = True
+    auth_client.token_cache.clear()
+    calls_before = server.RequestHandlerClass.calls
+    print_summary('cache on', run(client, args.requests, args.users))
+    print(f"  auth-service calls: {server.RequestHandlerClass.calls - calls_before}")
+    print(f"  cache stats: {auth_client.token_cache.stats()}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+편지 작성 처리량(letters/sec)을 단건 API(write/)와 일괄 API(write/bulk/)로 비교합니다.
+로컬 스텁 auth-service를 사용하며, 감정 분석 요청은 아웃박스에만 기록됩니다.
+
+    python benchmarks/bench_bulk_write.py --letters 2000 --batch-size 500
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+def payload(i):
+    return {'title': f"편지 {i}", 'content': "가져온 편지 내용 " * 20, 'open_date': f"20{30 + i % 10}-01-{i % 28 + 1:02d}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--letters', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    setup_django()
+    from django.test import Client
+
+    client = Client()
+    headers = {'HTTP_AUTHORIZATION': 'Bearer user-1'}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for i in range(args.letters):
+            response = client.post('/api/letters/write/', json.dumps(payload(i)), content_type='application/json', **headers)
+            assert response.status_code == 201, response.content
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for offset in range(0, args.letters, args.batch_size):
+            batch = [payload(i) for i in range(offset, min(offset + args.batch_size, args.letters))]
+            response = client.post('/api/letters/write/bulk/', json.dumps(batch), content_type='application/json', **headers)
+            assert response.status_code == 201, response.content
+        bulk = time.perf_counter() - started
+
+    print(f"{'write/ (one per request)':<32} {args.letters / single:>10,.0f} letters/sec")
+    print(f"{'write/bulk/ (batch ' + str(args.batch_size) + ')':<32} {args.letters / bulk:>10,.0f} letters/sec")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
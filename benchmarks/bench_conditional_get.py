@@ -0,0 +1,84 @@
+"""
+폴링 시나리오에서 조건부 GET(If-None-Match -> 304)과 매번 전체 응답(200)의 지연을 비교합니다.
+클라이언트는 받은 ETag를 보내며 목록/상세를 계속 폴링하고, --write-every번마다 편지가 하나씩 추가됩니다.
+
+    python benchmarks/bench_conditional_get.py --letters 200 --polls 2000 --write-every 50
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, StubStorageHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def poll(client, path, polls, write_every, conditional, headers):
+    samples, not_modified, etag = [], 0, None
+    for i in range(polls):
+        if write_every and i and i % write_every == 0:
+            response = client.post('/api/letters/write/', json.dumps(
+                {'title': f"새 편지 {i}", 'content': "내용", 'open_date': (date.today() + timedelta(days=30)).isoformat()}
+            ), content_type='application/json', **headers)
+            assert response.status_code == 201, response.content
+        extra = {'HTTP_IF_NONE_MATCH': etag} if conditional and etag else {}
+        t0 = time.perf_counter()
+        response = client.get(path, **headers, **extra)
+        samples.append(time.perf_counter() - t0)
+        assert response.status_code in (200, 304), response.status_code
+        if response.status_code == 304:
+            not_modified += 1
+        etag = response.get('ETag', etag)
+    return samples, not_modified
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--letters', type=int, default=200)
+    parser.add_argument('--polls', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--write-every', type=int, default=50, help='이 횟수의 폴링마다 편지 1개 작성 (0이면 작성 안 함)')
+    parser.add_argument('--storage-latency', type=float, default=0.002, help='스텁 스토리지 응답 지연(초)')
+    args = parser.parse_args()
+
+    auth_server, auth_url = start_stub_server(StubAuthHandler)
+    storage_server, _ = start_stub_server(StubStorageHandler, port=18002, latency=args.storage_latency)
+    os.environ['AUTH_SERVICE_URL'] = f"{auth_url}/api/auth"
+    setup_django()
+
+    from django.test import Client
+    from letters.models import Letters
+
+    start = date.today() - timedelta(days=args.letters // 2)
+    Letters.objects.bulk_create([
+        Letters(user_id=1, title=f"편지 {i}", content="내용 " * 50, open_date=start + timedelta(days=i),
+                image_url=f"letters/{i}.jpg")
+        for i in range(args.letters)
+    ])
+    detail_id = Letters.objects.filter(user_id=1).order_by('id').values_list('id', flat=True).first()
+
+    client = Client()
+    headers = {'HTTP_AUTHORIZATION': 'Bearer user-1'}
+    targets = (('list', f"/api/letters/?limit={args.limit}"), ('detail', f"/api/letters/{detail_id}/"))
+    for label, path in targets:
+        for conditional in (False, True):
+            with contextlib.redirect_stdout(io.StringIO()):
+                samples, not_modified = poll(client, path, args.polls, args.write_every, conditional, headers)
+            mode = 'If-None-Match' if conditional else 'always 200'
+            print_summary(f"{label} ({mode})", samples)
+            if conditional:
+                print(f"{'':<32} 304 responses: {not_modified}/{len(samples)}")
+
+    auth_server.shutdown()
+    storage_server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
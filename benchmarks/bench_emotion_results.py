@@ -0,0 +1,60 @@
+"""
+감정 분석 결과 반영 속도(results/sec)를 비교합니다.
+
+  - save() per letter : 결과마다 편지를 조회해 save() (카테고리 재계산 포함)
+  - bulk_update batch : apply_emotion_results로 묶음당 bulk_update 한 번
+
+    python benchmarks/bench_emotion_results.py --letters 20000 --batch-size 200
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--letters', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils.timezone import now
+    from letters.emotion_results import VALID_DETAILED_MOODS, VALID_MOODS, apply_emotion_results
+    from letters.models import Letters
+
+    Letters.objects.bulk_create(
+        [Letters(user_id=i % 500, title=f"편지 {i}", content="내용", open_date=date.today() + timedelta(days=i % 60 - 30))
+         for i in range(args.letters)],
+        batch_size=2000,
+    )
+    ids = list(Letters.objects.values_list('id', flat=True))
+    moods, detailed = sorted(VALID_MOODS), sorted(VALID_DETAILED_MOODS)
+    results = [(letter_id, random.choice(moods), random.choice(detailed), now()) for letter_id in ids]
+
+    # 한 건씩 save() 하는 방식은 느리므로 일부만 측정
+    sample = results[: min(len(results), 2000)]
+    started = time.perf_counter()
+    for letter_id, mood, detailed_mood, analyzed_at in sample:
+        letter = Letters.objects.get(id=letter_id)
+        letter.mood, letter.detailed_mood, letter.analyzed_at = mood, detailed_mood, analyzed_at
+        letter.save()
+    elapsed = time.perf_counter() - started
+    print(f"{'save() per letter':<24} {len(sample) / elapsed:>12,.0f} results/sec ({len(sample)} results)")
+
+    started = time.perf_counter()
+    applied = 0
+    for i in range(0, len(results), args.batch_size):
+        applied += apply_emotion_results(results[i:i + args.batch_size])
+    elapsed = time.perf_counter() - started
+    print(f"{'bulk_update batch':<24} {applied / elapsed:>12,.0f} results/sec ({applied} results, batch={args.batch_size})")
+
+
+if __name__ == '__main__':
+    main()
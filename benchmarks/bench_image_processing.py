@@ -0,0 +1,75 @@
+"""
+업로드 이미지 정규화(letters.image_processing.normalize_image)의 처리량과 줄어든 바이트를 측정합니다.
+휴대폰 사진과 비슷한 크기의 JPEG(EXIF 포함, 노이즈가 있어 압축이 잘 안 되는 이미지)을 만들어
+요청 스레드에서 직접 처리하는 경우와 프로세스 풀(워커 수별)로 처리하는 경우를 비교합니다.
+
+    python benchmarks/bench_image_processing.py --images 48 --width 4032 --height 3024 --workers 1,2,4
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+def make_photo(width, height, seed):
+    from PIL import Image
+
+    # 그라데이션 + 노이즈: 단색 이미지보다 실제 사진에 가까운 압축률
+    gradient = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    noise = Image.effect_noise((width, height), 40 + seed % 10).convert('RGB')
+    photo = Image.blend(gradient, noise, 0.35)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: 90도 회전
+    exif[0x010F] = 'PhoneMaker'
+    exif[0x8825] = {1: 'N', 2: (37.0, 33.0, 0.0)}  # GPS
+    buffer = io.BytesIO()
+    photo.save(buffer, 'JPEG', quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def report(label, elapsed, images, outcomes):
+    original = sum(len(data) for data in images)
+    normalized = sum(len(image) for image, _, _ in outcomes)
+    thumbnails = sum(len(thumbnail) for _, thumbnail, _ in outcomes)
+    print(f"{label:<24} {len(images) / elapsed:7.2f} images/s  "
+          f"in={original / len(images) / 1024:8.1f} KiB  out={normalized / len(images) / 1024:7.1f} KiB  "
+          f"thumb={thumbnails / len(images) / 1024:5.1f} KiB  saved={(1 - normalized / original) * 100:5.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--images', type=int, default=48)
+    parser.add_argument('--width', type=int, default=4032)
+    parser.add_argument('--height', type=int, default=3024)
+    parser.add_argument('--workers', default='1,2,4', help='비교할 프로세스 풀 크기 (쉼표 구분)')
+    args = parser.parse_args()
+
+    setup_django(migrate=False)
+    from letters.image_processing import normalize_image
+
+    distinct = [make_photo(args.width, args.height, seed) for seed in range(4)]
+    images = [distinct[i % len(distinct)] for i in range(args.images)]
+    print(f"CPU count: {os.cpu_count()}, source {args.width}x{args.height}")
+
+    t0 = time.perf_counter()
+    outcomes = [normalize_image(data) for data in images]
+    report('inline (request thread)', time.perf_counter() - t0, images, outcomes)
+
+    for workers in (int(value) for value in args.workers.split(',') if value):
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            list(pool.map(normalize_image, distinct[:workers]))  # 워커 기동 / 워밍업은 제외
+            t0 = time.perf_counter()
+            outcomes = list(pool.map(normalize_image, images))
+            report(f"process pool x{workers}", time.perf_counter() - t0, images, outcomes)
+
+
+if __name__ == '__main__':
+    main()
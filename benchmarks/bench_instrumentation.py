@@ -0,0 +1,124 @@
+"""
+요청 / 의존성 지연 측정(RequestMetricsMiddleware, DB execute wrapper, timed)의 오버헤드를 측정합니다.
+1) timed() 한 번의 비용 (ns/호출)
+2) 편지 목록 / 상세 API 지연: 측정을 켠 상태와 끈 상태를 번갈아 실행해 비교
+목록 응답 캐시는 끈 상태로 측정합니다 (요청마다 쿼리가 실행되도록).
+
+    python benchmarks/bench_instrumentation.py --letters 200 --repeat 500
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def bench_timed(iterations):
+    from letters import metrics
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.timed('bench', 'noop'):
+            pass
+    with_metrics = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    baseline = time.perf_counter() - t0
+    print(f"timed() overhead: {(with_metrics - baseline) / iterations * 1e9:,.0f} ns/call (no request context)")
+
+    state = metrics.start_request()
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.timed('bench', 'noop'):
+            pass
+    in_request = time.perf_counter() - t0
+    metrics.finish_request(state, '/bench', 'GET', 200)
+    print(f"timed() overhead: {(in_request - baseline) / iterations * 1e9:,.0f} ns/call (inside a request)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--letters', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    os.environ['LETTER_LIST_CACHE_ENABLED'] = 'False'
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client
+    from letters import metrics
+    from letters.models import Letters
+
+    bench_timed(1_000_000)
+
+    start = date.today() - timedelta(days=args.letters // 2)
+    Letters.objects.bulk_create(
+        [Letters(user_id=1, title=f"편지 {i}", content="내용 " * 50, open_date=start + timedelta(days=i), mood='joy')
+         for i in range(args.letters)],
+        batch_size=1000,
+    )
+    letter_id = Letters.objects.filter(open_date__lte=date.today()).values_list('id', flat=True).first()
+
+    instrumented_middleware = list(settings.MIDDLEWARE)
+    plain_middleware = [m for m in instrumented_middleware if m != 'letters.middleware.RequestMetricsMiddleware']
+
+    def configure(enabled):
+        # 미들웨어 체인은 Client(핸들러)를 만들 때 읽히므로 설정을 바꾼 뒤 새 Client를 만든다
+        settings.MIDDLEWARE = instrumented_middleware if enabled else plain_middleware
+        metrics.METRICS_ENABLED = enabled
+        wrappers = connection.execute_wrappers
+        if enabled and metrics.db_execute_wrapper not in wrappers:
+            wrappers.append(metrics.db_execute_wrapper)
+        elif not enabled and metrics.db_execute_wrapper in wrappers:
+            wrappers.remove(metrics.db_execute_wrapper)
+        return Client()
+
+    endpoints = (
+        ('list', '/api/letters/', {'limit': args.limit}),
+        ('detail', f'/api/letters/{letter_id}/', {}),
+    )
+    samples = {(name, enabled): [] for name, _, _ in endpoints for enabled in (True, False)}
+    server_timing = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # 측정 on / off를 번갈아 여러 번 실행해 시간에 따른 잡음을 양쪽에 고르게 나눔
+        for _ in range(args.rounds):
+            for enabled in (False, True):
+                client = configure(enabled)
+                for name, path, query in endpoints:
+                    for _ in range(args.repeat // args.rounds):
+                        t0 = time.perf_counter()
+                        response = client.get(path, query, HTTP_AUTHORIZATION='Bearer user-1')
+                        samples[(name, enabled)].append(time.perf_counter() - t0)
+                        assert response.status_code == 200, response.content
+                    if enabled:
+                        server_timing[name] = response.get('Server-Timing')
+
+    for name, _, _ in endpoints:
+        print_summary(f"{name} (metrics off)", samples[(name, False)])
+        print_summary(f"{name} (metrics on)", samples[(name, True)])
+        off = sorted(samples[(name, False)])[len(samples[(name, False)]) // 2]
+        on = sorted(samples[(name, True)])[len(samples[(name, True)]) // 2]
+        print(f"{'':<32} p50 overhead={(on - off) * 1e6:,.0f} µs ({(on - off) / off * 100:+.1f}%)")
+        print(f"{'':<32} Server-Timing: {server_timing[name]}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
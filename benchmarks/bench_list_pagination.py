@@ -0,0 +1,63 @@
+"""
+사용자의 편지 수(10 ~ 100k)에 따른 편지 목록 페이지 지연을 측정합니다.
+첫 페이지와 마지막 부근 페이지(cursor)를 모두 측정해 지연이 평탄한지 확인합니다.
+
+    python benchmarks/bench_list_pagination.py --sizes 10 1000 100000 --limit 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    setup_django()
+
+    from django.test import Client
+    from letters.models import Letters
+    from letters.pagination import encode_cursor
+
+    client = Client()
+    for user_id, size in enumerate(args.sizes, start=1):
+        start = date.today() - timedelta(days=size // 4)
+        Letters.objects.bulk_create(
+            [Letters(user_id=user_id, title=f"편지 {i}", content="내용 " * 50, open_date=start + timedelta(days=i // 3))
+             for i in range(size)],
+            batch_size=5000,
+        )
+        last = Letters.objects.filter(user_id=user_id).order_by('-open_date', '-id')[min(size - 1, args.limit)]
+        deep_cursor = encode_cursor(last.open_date, last.id)
+
+        for label, query in (('first page', {}), ('deep page', {'cursor': deep_cursor})):
+            samples = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    response = client.get('/api/letters/', {'limit': args.limit, **query},
+                                          HTTP_AUTHORIZATION=f"Bearer user-{user_id}")
+                    samples.append(time.perf_counter() - t0)
+                    assert response.status_code == 200
+            print_summary(f"{size:>7} letters, {label}", samples)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
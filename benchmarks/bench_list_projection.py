@@ -0,0 +1,69 @@
+"""
+편지 목록의 응답 크기와 지연을 전체 필드 / view=summary / view=preview / fields=... 별로 비교합니다.
+본문이 긴 편지를 많이 쓴 사용자를 가정하며, 목록 응답 캐시는 끈 상태로 측정합니다.
+
+    python benchmarks/bench_list_projection.py --letters 2000 --content-chars 4000 --limit 200
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--letters', type=int, default=2000)
+    parser.add_argument('--content-chars', type=int, default=4000)
+    parser.add_argument('--limit', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    os.environ['LETTER_LIST_CACHE_ENABLED'] = 'False'
+    setup_django()
+
+    from django.test import Client
+    from letters.models import Letters
+
+    body = ("오늘 있었던 일을 적어 둔다. " * (args.content_chars // 16 + 1))[:args.content_chars]
+    start = date.today() - timedelta(days=args.letters // 2)
+    Letters.objects.bulk_create(
+        [Letters(user_id=1, title=f"편지 {i}", content=body, open_date=start + timedelta(days=i), mood='joy')
+         for i in range(args.letters)],
+        batch_size=1000,
+    )
+
+    client = Client()
+    variants = (
+        ('full (default)', {}),
+        ('view=summary', {'view': 'summary'}),
+        ('view=preview', {'view': 'preview'}),
+        ('fields=id,title,open_date', {'fields': 'id,title,open_date'}),
+    )
+    for label, query in variants:
+        samples, size = [], 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                response = client.get('/api/letters/', {'limit': args.limit, **query}, HTTP_AUTHORIZATION='Bearer user-1')
+                samples.append(time.perf_counter() - t0)
+                assert response.status_code == 200, response.content
+                size = len(response.content)
+        print_summary(label, samples)
+        print(f"{'':<32} payload={size / 1024:,.1f} KiB per page of {args.limit}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
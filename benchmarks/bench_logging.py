@@ -0,0 +1,134 @@
+"""
+로그 방식에 따른 요청 지연을 비교합니다. 작성 / 목록 / 상세(이미지 포함) 요청을 섞어 보냅니다.
+- print (before)        : 기존 print()처럼 모든 로그를 요청 스레드에서 바로 stdout에 쓰는 경우 (DEBUG, 동기 StreamHandler)
+- queue INFO (prod)     : settings.LOGGING 그대로 (INFO, JSON, NonBlockingQueueHandler)
+- queue DEBUG           : 같은 구성에서 DEBUG까지 남기는 경우
+- queue DEBUG 1% sample : DEBUG를 1%만 샘플링
+로그는 임시 파일에 쓰며, --write-delay로 느린 stdout(로그 수집기 backpressure)을 흉내 낼 수 있습니다.
+
+    python benchmarks/bench_logging.py --requests 2000 --write-delay 0.0002
+"""
+import argparse
+import copy
+import json
+import logging.config
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, StubStorageHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+class SlowStream:
+    """ write마다 delay초 동안 블로킹되는 출력 스트림 (파이프가 막힌 stdout 흉내) """
+
+    def __init__(self, stream, delay):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, text):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def logging_config(base, variant, stream):
+    config = copy.deepcopy(base)
+    if variant == 'print':
+        config['handlers'] = {'sync': {'class': 'logging.StreamHandler', 'stream': stream, 'formatter': 'text'}}
+        config['formatters']['text'] = {'format': '%(message)s'}
+        handlers, level = ['sync'], 'DEBUG'
+    else:
+        config['handlers']['queue']['stream'] = stream
+        config['handlers']['queue']['formatter'] = 'json'
+        config['filters']['sampling']['rate'] = 0.01 if variant == 'debug-sampled' else 1.0
+        handlers, level = ['queue'], 'INFO' if variant == 'info' else 'DEBUG'
+    config['root']['handlers'] = handlers
+    config['loggers'] = {name: {'handlers': handlers, 'level': level if name == 'letters' else 'WARNING', 'propagate': False}
+                         for name in ('letters', 'django')}
+    return config
+
+
+def run(client, requests, detail_ids, headers):
+    samples = {'write': [], 'list': [], 'detail': []}
+    for i in range(requests):
+        kind = ('write', 'list', 'detail', 'detail')[i % 4]
+        t0 = time.perf_counter()
+        if kind == 'write':
+            response = client.post('/api/letters/write/', json.dumps(
+                {'title': f"새 편지 {i}", 'content': "내용", 'open_date': (date.today() + timedelta(days=30)).isoformat()}
+            ), content_type='application/json', **headers)
+        elif kind == 'list':
+            response = client.get('/api/letters/?limit=50', **headers)
+        else:
+            response = client.get(f"/api/letters/{detail_ids[i % len(detail_ids)]}/", **headers)
+        samples[kind].append(time.perf_counter() - t0)
+        assert response.status_code in (200, 201), (kind, response.status_code)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--letters', type=int, default=200)
+    parser.add_argument('--write-delay', type=float, default=0.0, help='로그 출력 write() 한 번당 지연(초)')
+    args = parser.parse_args()
+
+    auth_server, auth_url = start_stub_server(StubAuthHandler)
+    storage_server, _ = start_stub_server(StubStorageHandler, port=18002)
+    os.environ['AUTH_SERVICE_URL'] = f"{auth_url}/api/auth"
+    # 목록 / 상세가 매번 뷰 코드를 거치도록 응답 캐시와 서명 URL 캐시는 끔
+    os.environ['LETTER_LIST_CACHE_ENABLED'] = 'False'
+    os.environ['SIGNED_URL_CACHE_ENABLED'] = 'False'
+    setup_django()
+
+    from django.conf import settings
+    from django.test import Client
+    from letters.models import Letters
+
+    start = date.today() - timedelta(days=args.letters // 2)
+    Letters.objects.bulk_create([
+        Letters(user_id=1, title=f"편지 {i}", content="내용 " * 50, open_date=start + timedelta(days=i),
+                image_url=f"letters/{i}.jpg")
+        for i in range(args.letters)
+    ])
+    detail_ids = list(Letters.objects.filter(user_id=1, open_date__lte=date.today()).values_list('id', flat=True)[:50])
+    headers = {'HTTP_AUTHORIZATION': 'Bearer user-1'}
+
+    variants = (
+        ('print (before)', 'print'),
+        ('queue INFO (prod)', 'info'),
+        ('queue DEBUG', 'debug'),
+        ('queue DEBUG 1% sample', 'debug-sampled'),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, variant in variants:
+            path = os.path.join(tmp, f"{variant}.log")
+            with open(path, 'w', buffering=1, encoding='utf-8') as sink:  # PYTHONUNBUFFERED처럼 줄 단위로 flush
+                logging.config.dictConfig(logging_config(settings.LOGGING, variant, SlowStream(sink, args.write_delay)))
+                client = Client()
+                run(client, 40, detail_ids, headers)  # 워밍업
+                samples = run(client, args.requests, detail_ids, headers)
+                logging.shutdown()  # 큐에 남은 레코드까지 기록
+                logging.config.dictConfig({'version': 1, 'disable_existing_loggers': False})
+            with open(path, encoding='utf-8') as f:
+                lines = sum(1 for _ in f)
+            for kind, kind_samples in samples.items():
+                print_summary(f"{label} / {kind}", kind_samples)
+            print(f"{'':<32} log lines written: {lines:,}")
+
+    auth_server.shutdown()
+    storage_server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
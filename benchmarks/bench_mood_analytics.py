@@ -0,0 +1,98 @@
+"""
+감정 추이 API(/api/letters/analytics/moods/)의 지연을 편지 수에 따라 측정합니다.
+같은 결과를 편지 테이블에서 매번 GROUP BY로 계산하는 경우와 비교하고,
+감정 분석 결과 반영(apply_emotion_results)에 집계 갱신이 더하는 비용과 전체 재구성 시간도 출력합니다.
+
+    python benchmarks/bench_mood_analytics.py --sizes 1000 10000 100000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=200, help='apply_emotion_results 한 번에 반영할 결과 수')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    setup_django()
+
+    from django.db.models import Count, DateField
+    from django.db.models.functions import Trunc
+    from django.test import Client
+    from django.utils.timezone import now
+    from letters import emotion_results
+    from letters.emotion_results import apply_emotion_results
+    from letters.models import DETAILED_MOOD_CHOICES, MOOD_CHOICES, Letters
+    from letters.mood_analytics import rebuild_mood_summary
+
+    rng = random.Random(7)
+    moods = [value for value, _ in MOOD_CHOICES]
+    detailed = [value for value, _ in DETAILED_MOOD_CHOICES] + [None]
+    client = Client()
+    for user_id, size in enumerate(args.sizes, start=1):
+        start = date.today() - timedelta(days=3 * 365)
+        Letters.objects.bulk_create(
+            [Letters(user_id=user_id, title=f"편지 {i}", content="내용", open_date=start + timedelta(days=i % 1460),
+                     mood=rng.choice(moods), detailed_mood=rng.choice(detailed), analyzed_at=now())
+             for i in range(size)],
+            batch_size=5000,
+        )
+        t0 = time.perf_counter()
+        rebuild_mood_summary(user_ids=[user_id])
+        print(f"{size:>7} letters: rebuild_mood_summary {time.perf_counter() - t0:.3f}s")
+
+        samples = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                response = client.get('/api/letters/analytics/moods/', {'period': 'week'},
+                                      HTTP_AUTHORIZATION=f"Bearer user-{user_id}")
+                samples.append(time.perf_counter() - t0)
+                assert response.status_code == 200
+        print_summary(f"{size:>7} letters, summary table", samples)
+
+        # 비교: 요청마다 사용자 편지 전체를 GROUP BY (집계 테이블이 없을 때의 쿼리)
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            list(Letters.objects.filter(user_id=user_id, mood__isnull=False)
+                 .annotate(bucket=Trunc('open_date', 'week', output_field=DateField()))
+                 .values('bucket', 'mood', 'detailed_mood').annotate(total=Count('id')).order_by('bucket'))
+            samples.append(time.perf_counter() - t0)
+        print_summary(f"{size:>7} letters, GROUP BY", samples)
+
+    # 분석 결과 반영 비용: 집계 갱신을 포함한 경우와 뺀 경우
+    ids = list(Letters.objects.values_list('id', flat=True)[:args.batch * 20])
+    for label, patch in (('with summary', contextlib.nullcontext()),
+                         ('without summary', mock.patch.object(emotion_results, 'record_mood_changes'))):
+        samples = []
+        with patch:
+            for start in range(0, len(ids), args.batch):
+                batch = [(letter_id, rng.choice(moods), rng.choice(detailed), now()) for letter_id in ids[start:start + args.batch]]
+                t0 = time.perf_counter()
+                apply_emotion_results(batch)
+                samples.append(time.perf_counter() - t0)
+        print_summary(f"apply {args.batch} results, {label}", samples)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+open_todays_letters 명령의 처리 시간과 메모리를 측정합니다. (기본: 오늘 개봉 편지 100만 통 + 다른 날짜 10만 통)
+RabbitMQ는 인프로세스 대역(FakeBlockingConnection, 묶음마다 tx_commit 왕복)으로 대신합니다.
+  0) 비교용: 편지를 모두 읽어 한 통씩 save() + 발행 (--naive-sample 통만 측정)
+  1) 워커 하나로 전체 처리 (처리량, 따로 한 번 더 실행해 Python 메모리 최대 사용량)
+  2) 이미 처리된 날 다시 실행 (재실행 비용)
+  3) 중간에 발행이 실패한 뒤 다시 실행 (이어서 처리, 중복 발행 없음)
+  4) --shards N으로 나눈 구간을 차례로 실행 (구간별 시간 / 누락·중복 없음 확인)
+
+    python benchmarks/bench_open_todays_letters.py --rows 1000000 --shards 4
+    BENCH_USE_POSTGRES=true python benchmarks/bench_open_todays_letters.py --rows 1000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import FakeBlockingConnection  # noqa: E402
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+class EventCounter:
+    """ FakeBlockingConnection.published 대신 개수만 세는 수신기 (100만 건 본문을 쌓아 RSS가 늘지 않도록) """
+
+    def __init__(self):
+        self.count = 0
+
+    def append(self, _):
+        self.count += 1
+
+
+def peak_mib():
+    # Python 객체 할당의 최대치 (SQLite 인메모리 DB 자체는 포함하지 않음)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.reset_peak()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000, help='오늘 개봉하는 편지 수')
+    parser.add_argument('--other-rows', type=int, default=100000, help='다른 날짜에 개봉하는 편지 수')
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--shards', type=int, default=4)
+    parser.add_argument('--naive-sample', type=int, default=20000, help='비교용 단순 처리로 측정할 편지 수')
+    parser.add_argument('--rtt', type=float, default=0.0005, help='대역 브로커의 왕복 지연(초)')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils.timezone import now
+    from letters import letter_opening, message_producers
+    from letters.letter_opening import open_letters
+    from letters.models import Letters
+
+    FakeBlockingConnection.rtt = args.rtt
+    message_producers._publisher = message_producers.RabbitMQPublisher(
+        confirm=True, connection_factory=FakeBlockingConnection)
+    published = FakeBlockingConnection.published = EventCounter()
+
+    today = now().date()
+    started = time.perf_counter()
+    batch = []
+    for i in range(args.rows + args.other_rows):
+        open_date = today if i < args.rows else today + timedelta(days=1 + i % 300)
+        batch.append(Letters(user_id=i % 50000, title="t", content="c", open_date=open_date, category='future'))
+        if len(batch) == 10000:
+            Letters.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Letters.objects.bulk_create(batch)
+    print(f"seeded {args.rows:,} letters opening today (+{args.other_rows:,} other days) in {time.perf_counter() - started:.1f}s")
+
+    def reset():
+        Letters.objects.filter(open_date=today).update(category='future')
+
+    def run(label, trace=False, **kwargs):
+        # trace=True면 Python 메모리 최대 사용량도 측정 (tracemalloc 때문에 처리 시간은 느려짐)
+        published.count = 0
+        if trace:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        result = open_letters(chunk_size=args.chunk_size, batch_size=args.batch_size, **kwargs)
+        elapsed = time.perf_counter() - t0
+        rate = result['opened'] / elapsed if elapsed else 0
+        memory = ''
+        if trace:
+            memory = f" peak {peak_mib():.1f} MiB"
+            tracemalloc.stop()
+        print(f"{label:<28} opened={result['opened']:>9,} events={published.count:>9,} {elapsed:7.2f}s "
+              f"({rate:,.0f} letters/s){memory}")
+        return result
+
+    # 비교: 모델 인스턴스로 모두 읽어 한 통씩 save()(카테고리 재계산) + 한 건씩 발행 (메모리는 읽은 편지 수에 비례)
+    publisher = message_producers.get_publisher()
+    t0 = time.perf_counter()
+    letters = list(Letters.objects.filter(open_date=today).order_by('id')[:args.naive_sample])
+    for letter in letters:
+        letter.save()
+        publisher.publish(message_producers.LETTER_EVENTS_EXCHANGE, message_producers.LETTER_OPENED_ROUTING_KEY,
+                          message_producers.build_letter_opened_message(letter.id, letter.user_id, today))
+    elapsed = time.perf_counter() - t0
+    del letters
+    tracemalloc.start()
+    letters = list(Letters.objects.filter(open_date=today).order_by('id')[:args.naive_sample])
+    print(f"{'naive save() + publish':<28} opened={len(letters):>9,} {'':>16} {elapsed:7.2f}s "
+          f"({len(letters) / elapsed:,.0f} letters/s) peak {peak_mib():.1f} MiB (list만)")
+    tracemalloc.stop()
+    del letters
+    reset()
+
+    run('single worker')
+    run('rerun (nothing left)')
+    reset()
+    run('single worker (traced)', trace=True)
+
+    # 발행이 중간에 실패한 경우: 실패한 묶음은 롤백되고 다시 실행하면 남은 편지만 처리
+    reset()
+    original = message_producers.publish_letter_opened_events
+    calls = Counter()
+
+    def failing_publish(messages):
+        calls['batches'] += 1
+        if calls['batches'] > (args.rows // args.batch_size) // 2:
+            raise ConnectionError("broker down")
+        return original(messages)
+
+    published.count = 0
+    try:
+        open_letters(chunk_size=args.chunk_size, batch_size=args.batch_size, publish=failing_publish)
+    except ConnectionError:
+        pass
+    first_run = published.count
+    opened_before_failure = Letters.objects.filter(open_date=today, category='today').count()
+    print(f"{'failed halfway':<28} opened={opened_before_failure:>9,} events={first_run:>9,}")
+    resumed = run('resume after failure')
+    assert opened_before_failure + resumed['opened'] == args.rows
+
+    reset()
+    events = 0
+    for shard in range(args.shards):
+        start, end = letter_opening.shard_bounds(today, shard, args.shards)
+        run(f"shard {shard}/{args.shards} id [{start or '-inf'}, {end or '+inf'})", shard=shard, shards=args.shards)
+        events += published.count
+    # 모든 편지가 처리됐고 이벤트 수가 편지 수와 같으면 누락도 중복도 없음
+    remaining = Letters.objects.filter(open_date=today).exclude(category='today').count()
+    assert remaining == 0 and events == args.rows, "샤드 사이에 누락 또는 중복"
+    print(f"{'all shards':<28} opened={events:>9,} (누락 / 중복 없음)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+RabbitMQ 퍼블리셔 처리량(messages/sec)과 발행 지연 p99를 비교합니다.
+
+  - per-message : 메시지마다 연결/채널/익스체인지 선언 후 종료 (기존 방식)
+  - persistent  : 워커당 유지되는 연결로 한 건씩 발행
+  - batch       : 유지되는 연결로 묶음 발행 (--confirm 이면 묶음당 tx_commit 한 번)
+
+기본값은 인프로세스 AMQP 대역(FakeBlockingConnection)을 사용하고,
+--real 을 주면 settings의 RABBITMQ_* 브로커에 실제로 접속합니다.
+
+    python benchmarks/bench_publisher.py --messages 2000 --rtt 0.0005 --confirm
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import FakeBlockingConnection  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+
+def measure(label, n_messages, publish_one, flush=None):
+    samples = []
+    started = time.perf_counter()
+    for i in range(n_messages):
+        t0 = time.perf_counter()
+        publish_one(i)
+        samples.append(time.perf_counter() - t0)
+    if flush:
+        flush()
+    elapsed = time.perf_counter() - started
+    print_summary(label, samples)
+    print(f"  throughput: {n_messages / elapsed:,.0f} messages/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--rtt', type=float, default=0.0005, help='대역 브로커의 왕복 지연(초)')
+    parser.add_argument('--confirm', action='store_true', help='묶음 단위 브로커 수신 확인 사용')
+    parser.add_argument('--real', action='store_true', help='실제 RabbitMQ 브로커 사용')
+    args = parser.parse_args()
+
+    setup_django(migrate=False)
+    import pika
+    from letters.message_producers import (
+        EMOTION_ANALYZE_ROUTING_KEY, EMOTION_EXCHANGE, RabbitMQPublisher, build_emotion_analysis_message,
+    )
+
+    FakeBlockingConnection.rtt = args.rtt
+    factory = pika.BlockingConnection if args.real else FakeBlockingConnection
+
+    def message(i):
+        return build_emotion_analysis_message(i, i % 100, "벤치마크용 편지 내용입니다." * 10)
+
+    def per_message(i):
+        publisher = RabbitMQPublisher(confirm=args.confirm, connection_factory=factory)
+        publisher.publish(EMOTION_EXCHANGE, EMOTION_ANALYZE_ROUTING_KEY, message(i))
+        publisher.close()
+
+    persistent = RabbitMQPublisher(confirm=args.confirm, connection_factory=factory)
+
+    def persistent_one(i):
+        persistent.publish(EMOTION_EXCHANGE, EMOTION_ANALYZE_ROUTING_KEY, message(i))
+
+    batched = RabbitMQPublisher(confirm=args.confirm, connection_factory=factory)
+    pending = []
+
+    def flush():
+        batched.publish_batch(EMOTION_EXCHANGE, EMOTION_ANALYZE_ROUTING_KEY, pending)
+        pending.clear()
+
+    def batch_one(i):
+        pending.append(message(i))
+        if len(pending) >= args.batch_size:
+            flush()
+
+    for label, fn, fl in (
+        ('per-message connection', per_message, None),
+        ('persistent connection', persistent_one, None),
+        (f'batch of {args.batch_size}', batch_one, flush),
+    ):
+        # 접속 로그(print)는 측정 결과에서 제외
+        with contextlib.redirect_stdout(io.StringIO()) as captured:
+            measure(label, args.messages, fn, fl)
+        print('\n'.join(line for line in captured.getvalue().splitlines() if not line.startswith(('📨', '✨'))))
+
+    persistent.close()
+    batched.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+recategorize_letters 명령의 실행 시간을 측정합니다. (기본 100만 행)
+카테고리를 일부러 오래된 값으로 채운 뒤 id 구간별 UPDATE로 재분류합니다.
+
+    python benchmarks/bench_recategorize.py --rows 1000000 --chunk-size 50000
+    BENCH_USE_POSTGRES=true python benchmarks/bench_recategorize.py --rows 5000000
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from letters.models import Letters
+
+    started = time.perf_counter()
+    base = date.today() - timedelta(days=365)
+    batch = []
+    for i in range(args.rows):
+        # 모두 'future'로 저장해 두어 오늘 이전 날짜의 행은 재분류 대상이 됨
+        batch.append(Letters(user_id=i % 10000, title="t", content="c", category='future',
+                             open_date=base + timedelta(days=i % 730)))
+        if len(batch) == 10000:
+            Letters.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Letters.objects.bulk_create(batch)
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    call_command('recategorize_letters', chunk_size=args.chunk_size)
+    print(f"recategorize (stale table): {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    call_command('recategorize_letters', chunk_size=args.chunk_size)
+    print(f"recategorize (already current): {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+편지 전문 검색 API(/api/letters/search/)의 지연과 실행 계획을 측정합니다. (PostgreSQL 필요)
+여러 사용자의 편지를 무작위 문장으로 채운 뒤(기본 50만 행, 그중 한 사용자에 10만 행),
+드문 단어 / 흔한 단어 / 두 단어 / 접두어 검색의 첫 페이지 지연과 EXPLAIN ANALYZE 결과를 출력하고,
+같은 조건을 인덱스 없이 찾는 ILIKE 검색과 비교합니다. 끝나면 넣은 행은 삭제합니다.
+
+    BENCH_USE_POSTGRES=true python benchmarks/bench_search.py --rows 500000 --heavy 100000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.stubs import StubAuthHandler, start_stub_server  # noqa: E402
+from benchmarks.utils import print_summary, setup_django  # noqa: E402
+
+USER_BASE = 900_000_000  # 기존 데이터와 겹치지 않는 사용자 ID 구간
+HEAVY_USER = USER_BASE
+
+# 흔한 단어(앞쪽)일수록 자주 뽑히도록 가중치를 줌
+WORDS = (
+    "오늘 하루 정말 나는 너에게 우리 마음 시간 생각 그리고 친구 가족 학교 회사 여행 바다 하늘 봄 여름 가을 겨울 "
+    "비 눈 바람 커피 책 음악 영화 사진 산책 운동 저녁 아침 약속 기억 추억 미래 꿈 용기 위로 감사 사랑 행복 걱정 "
+    "고민 시험 졸업 이사 생일 선물 편지 고양이 강아지 제주도 부산 서울 도쿄 파리 자전거 기차 비행기 일기 노래"
+).split()
+RARE_WORD = '오로라'
+PARTICLES = ('', '', '', '에게', '와', '을', '이', '는', '도', '에서')
+
+
+def sentence(rng, words):
+    picked = rng.choices(WORDS, weights=[1 / (rank + 1) for rank in range(len(WORDS))], k=words)
+    return ' '.join(word + rng.choice(PARTICLES) for word in picked)
+
+
+def seed(rows, heavy, users):
+    from letters.models import Letters
+
+    rng = random.Random(42)
+    base = date.today() - timedelta(days=365)
+    batch = []
+    started = time.perf_counter()
+    for i in range(rows):
+        user_id = HEAVY_USER if i < heavy else USER_BASE + 1 + i % users
+        content = sentence(rng, rng.randint(30, 120))
+        if i % 5000 == 0:
+            content += f" {RARE_WORD}를 보았다"
+        batch.append(Letters(user_id=user_id, title=sentence(rng, 4), content=content,
+                             open_date=base + timedelta(days=i % 730)))
+        if len(batch) == 10000:
+            Letters.objects.bulk_create(batch)  # search_vector는 INSERT 트리거가 채움
+            batch = []
+    if batch:
+        Letters.objects.bulk_create(batch)
+    print(f"seeded {rows:,} rows ({heavy:,} for one user) in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--heavy', type=int, default=100000, help='검색하는 사용자 한 명의 편지 수')
+    parser.add_argument('--users', type=int, default=5000, help='나머지 편지를 나눠 가질 사용자 수')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(StubAuthHandler)
+    os.environ['AUTH_SERVICE_URL'] = f"{base_url}/api/auth"
+    setup_django()
+
+    from django.db import connection
+    from django.db.models import Q
+    from django.test import Client
+    from letters.models import Letters
+    from letters.search import build_search_query, parse_search_terms, search_available, search_queryset
+
+    if not search_available():
+        sys.exit("검색은 PostgreSQL에서만 동작합니다. BENCH_USE_POSTGRES=true와 DB_* 환경 변수로 실행하세요.")
+
+    seed(args.rows, args.heavy, args.users)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE letters_letters")
+
+    client = Client()
+    queries = (
+        ('rare word', RARE_WORD),
+        ('common word', '오늘'),
+        ('two words', '친구 여행'),
+        ('prefix', '제주'),
+    )
+    try:
+        for label, text in queries:
+            samples = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    # If-None-Match 없이 요청하므로 매번 검색을 실행
+                    response = client.get('/api/letters/search/', {'q': text, 'limit': args.limit},
+                                          HTTP_AUTHORIZATION=f"Bearer user-{HEAVY_USER}")
+                    samples.append(time.perf_counter() - t0)
+                    assert response.status_code == 200, response.content
+            print_summary(f"search / {label}", samples)
+            print(f"{'':<32} first page: {len(response.json()['results'])} results")
+
+            query = build_search_query(parse_search_terms(text))
+            plan = search_queryset(HEAVY_USER, query)[:args.limit].explain(analyze=True, buffers=True)
+            print('\n'.join(f"{'':<4}{line}" for line in plan.splitlines()))
+
+            terms = parse_search_terms(text)
+            ilike = Letters.objects.filter(user_id=HEAVY_USER)
+            for term in terms:
+                ilike = ilike.filter(Q(title__icontains=term) | Q(content__icontains=term))
+            samples = []
+            for _ in range(max(1, args.repeat // 10)):
+                t0 = time.perf_counter()
+                list(ilike.order_by('-id').values('id', 'title')[:args.limit])
+                samples.append(time.perf_counter() - t0)
+            print_summary(f"ILIKE (no index) / {label}", samples)
+    finally:
+        Letters.objects.filter(user_id__gte=USER_BASE).delete()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
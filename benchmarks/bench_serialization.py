@@ -0,0 +1,73 @@
+"""
+편지 목록 직렬화 경로 비교: (A) 모델 인스턴스 + LetterSerializer + DRF JSONRenderer
+(B) values() + serialize_letter_rows + ORJSONRenderer. 조회와 직렬화/렌더링 시간을 나눠 측정합니다.
+
+    python benchmarks/bench_serialization.py --sizes 100 10000 100000
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.utils import setup_django  # noqa: E402
+
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    parser.add_argument('--content-chars', type=int, default=300)
+    parser.add_argument('--fields', default=None, help='쉼표로 구분한 필드 (기본: 전체 필드)')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from letters.fast_serialization import letter_values, serialize_letter_rows
+    from letters.models import Letters
+    from letters.projections import project_queryset
+    from letters.renderers import orjson, render_json
+    from letters.serializers import LetterProjectionSerializer
+
+    fields = args.fields.split(',') if args.fields else None
+    body = ("편지 본문 " * (args.content_chars // 6 + 1))[:args.content_chars]
+    print(f"renderer B: {'orjson' if orjson else 'json (orjson 미설치)'}")
+    print(f"{'letters':>8} {'path':<28} {'query':>10} {'serialize':>10} {'render':>10} {'total':>10} {'bytes':>12}")
+    for user_id, size in enumerate(args.sizes, start=1):
+        start = date.today() - timedelta(days=size // 2)
+        Letters.objects.bulk_create(
+            [Letters(user_id=user_id, title=f"편지 {i}", content=body, open_date=start + timedelta(days=i % 3650),
+                     mood='joy' if i % 2 else None, image_url=f"letters/{i}.jpg" if i % 3 == 0 else None)
+             for i in range(size)],
+            batch_size=5000,
+        )
+        queryset = project_queryset(Letters.objects.filter(user_id=user_id).with_current_category(), fields).order_by('open_date', 'id')
+        repeat = max(3, min(50, 200000 // size))
+
+        query_a, instances = timed(lambda: list(queryset.all()), repeat)
+        serialize_a, data_a = timed(lambda: LetterProjectionSerializer(instances, many=True, fields=fields).data, repeat)
+        render_a, body_a = timed(lambda: JSONRenderer().render(data_a), repeat)
+
+        query_b, rows = timed(lambda: list(letter_values(queryset, fields)), repeat)
+        serialize_b, data_b = timed(lambda: serialize_letter_rows(rows, fields), repeat)
+        render_b, body_b = timed(lambda: render_json(data_b), repeat)
+
+        for label, q, s, r, out in (('A: instances + DRF', query_a, serialize_a, render_a, body_a),
+                                    ('B: values() + orjson', query_b, serialize_b, render_b, body_b)):
+            print(f"{size:>8} {label:<28} {q:>8.2f}ms {s:>8.2f}ms {r:>8.2f}ms {q + s + r:>8.2f}ms {len(out):>12,}")
+
+
+if __name__ == '__main__':
+    main()
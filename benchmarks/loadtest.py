@@ -0,0 +1,516 @@
+"""
+letter-service 종단 간 부하 테스트.
+로컬 스텁 auth-service / 스토리지 서비스와 인메모리 RabbitMQ 대역(아웃박스 릴레이)을 띄우고,
+Django 앱을 별도 프로세스(runserver / gunicorn / uvicorn)로 실행한 뒤 요청을 동시에 보내
+엔드포인트별 처리량과 p50/p95/p99 지연을 보고합니다. 네트워크 없이 한 대의 리눅스 머신에서 실행됩니다.
+
+생성 워크로드 (작성/목록/상세/삭제 비율 지정):
+    python benchmarks/loadtest.py --duration 30 --concurrency 16 --mix write=20,list=45,detail=30,delete=5
+
+JSONL 요청 재생 (한 줄에 {"name", "method", "path", "user", "body"}; path의 {letter_id}는 그 사용자의 편지 id로 치환):
+    python benchmarks/loadtest.py --replay benchmarks/workloads/polling_mix.jsonl --loop --duration 30
+
+결과 저장 / 이전 결과와 비교 (기준보다 --threshold% 이상 느려지면 회귀로 표시):
+    python benchmarks/loadtest.py --output after.json --compare before.json --fail-on-regression
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from benchmarks.stubs import (  # noqa: E402
+    FakeBlockingConnection, StubAuthHandler, StubStorageHandler, start_stub_server,
+)
+from benchmarks.utils import percentile, setup_django  # noqa: E402
+
+DEFAULT_MIX = 'write=20,list=45,detail=30,delete=5'
+TINY_JPEG = bytes.fromhex('ffd8ffe000104a46494600010100000100010000ffd9')
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in WORKLOAD_ACTIONS:
+            raise argparse.ArgumentTypeError(f"알 수 없는 요청 종류: {name} (사용 가능: {', '.join(WORKLOAD_ACTIONS)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def free_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# ---------------------------------------------------------------------------
+# 서버 / 백그라운드 워커
+# ---------------------------------------------------------------------------
+
+def server_command(kind, port, workers, threads):
+    if kind == 'runserver':
+        return [sys.executable, 'manage.py', 'runserver', f"127.0.0.1:{port}", '--noreload']
+    if kind == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', 'letter_project.wsgi:application', '--bind', f"127.0.0.1:{port}",
+                '--workers', str(workers), '--threads', str(threads)]
+    if kind == 'uvicorn':
+        return [sys.executable, '-m', 'uvicorn', 'letter_project.asgi:application', '--host', '127.0.0.1',
+                '--port', str(port), '--workers', str(workers), '--no-access-log']
+    raise ValueError(kind)
+
+
+def wait_until_ready(base_url, process, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료됨 (exit {process.returncode})")
+        try:
+            if requests.get(f"{base_url}/health/", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("서버가 제시간에 준비되지 않음")
+
+
+class BackgroundWorkers:
+    """ 아웃박스 릴레이(인메모리 RabbitMQ 대역으로 발행)와 이미지 삭제 워커를 하네스 프로세스에서 실행 """
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.relayed = 0
+        self.blobs_deleted = 0
+
+    def start(self):
+        from letters import message_producers
+        message_producers._publisher = message_producers.RabbitMQPublisher(connection_factory=FakeBlockingConnection)
+        self._thread.start()
+
+    def _run(self):
+        from django.db import close_old_connections
+        from letters.blob_deletions import drain_blob_deletions
+        from letters.outbox import relay_outbox_batch
+
+        while not self._stop.is_set():
+            try:
+                self.relayed += relay_outbox_batch(batch_size=500, prune=True)
+                self.blobs_deleted += drain_blob_deletions(batch_size=100, concurrency=4)[1]
+            except Exception as e:  # DB 잠금 등은 다음 주기에 다시 시도
+                print(f"⚠️ 백그라운드 워커: {e}", file=sys.stderr)
+            finally:
+                close_old_connections()
+            self._stop.wait(self.interval)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# 워크로드
+# ---------------------------------------------------------------------------
+
+class UserPool:
+    """ 사용자별로 현재 존재하는 편지 id (상세/삭제 요청 대상) """
+
+    def __init__(self, user_ids):
+        self.user_ids = list(user_ids)
+        self._letters = {user_id: [] for user_id in self.user_ids}
+        self._lock = threading.Lock()
+
+    def add(self, user_id, letter_ids):
+        with self._lock:
+            self._letters.setdefault(user_id, []).extend(letter_ids)
+
+    def pick(self, user_id, rng, remove=False):
+        with self._lock:
+            letters = self._letters.get(user_id) or []
+            if not letters:
+                return None
+            index = rng.randrange(len(letters))
+            if remove:
+                letters[index], letters[-1] = letters[-1], letters[index]
+                return letters.pop()
+            return letters[index]
+
+
+def letter_payload(rng, i):
+    return {
+        'title': f"부하 테스트 편지 {i}",
+        'content': "오늘 있었던 일을 적어 둔다. " * rng.randint(5, 60),
+        'open_date': (date.today() + timedelta(days=rng.randint(-365, 365))).isoformat(),
+    }
+
+
+def action_write(ctx, user_id):
+    if ctx.rng.random() < ctx.image_ratio:
+        data = letter_payload(ctx.rng, ctx.counter())
+        files = {'image': ('letter.jpg', TINY_JPEG, 'image/jpeg')}
+        return 'write', 'POST', '/api/letters/write/', {'data': data, 'files': files}, None
+    return 'write', 'POST', '/api/letters/write/', {'json': letter_payload(ctx.rng, ctx.counter())}, None
+
+
+def action_list(ctx, user_id):
+    return 'list', 'GET', '/api/letters/?limit=50', {}, None
+
+
+def action_list_summary(ctx, user_id):
+    return 'list_summary', 'GET', '/api/letters/?limit=50&view=summary', {}, None
+
+
+def action_detail(ctx, user_id):
+    letter_id = ctx.pool.pick(user_id, ctx.rng)
+    if letter_id is None:
+        return action_write(ctx, user_id)
+    return 'detail', 'GET', f"/api/letters/{letter_id}/", {}, None
+
+
+def action_delete(ctx, user_id):
+    letter_id = ctx.pool.pick(user_id, ctx.rng, remove=True)
+    if letter_id is None:
+        return action_write(ctx, user_id)
+    return 'delete', 'DELETE', f"/api/letters/delete/{letter_id}/", {}, letter_id
+
+
+WORKLOAD_ACTIONS = {
+    'write': action_write,
+    'list': action_list,
+    'list_summary': action_list_summary,
+    'detail': action_detail,
+    'delete': action_delete,
+}
+
+
+class GeneratedWorkload:
+    def __init__(self, mix):
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+
+    def next(self, ctx):
+        user_id = ctx.rng.choice(ctx.pool.user_ids)
+        name = ctx.rng.choices(self.names, self.weights)[0]
+        return user_id, WORKLOAD_ACTIONS[name](ctx, user_id)
+
+
+class ReplayWorkload:
+    """ JSONL 요청 목록을 순서대로 (여러 스레드가 나눠) 재생 """
+
+    def __init__(self, path, loop):
+        with open(path, 'r', encoding='utf-8') as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        if not self.entries:
+            raise SystemExit(f"{path}: 재생할 요청이 없습니다.")
+        self._iter = itertools.cycle(self.entries) if loop else iter(self.entries)
+        self._lock = threading.Lock()
+
+    def user_ids(self):
+        return sorted({int(entry.get('user', 1)) for entry in self.entries})
+
+    def next(self, ctx):
+        with self._lock:
+            entry = next(self._iter, None)
+        if entry is None:
+            return None, None
+        user_id = int(entry.get('user', 1))
+        method = entry.get('method', 'GET').upper()
+        path = entry['path']
+        removed = None
+        if '{letter_id}' in path:
+            letter_id = ctx.pool.pick(user_id, ctx.rng, remove=(method == 'DELETE'))
+            if letter_id is None:
+                return user_id, action_write(ctx, user_id)
+            path = path.replace('{letter_id}', str(letter_id))
+            removed = letter_id if method == 'DELETE' else None
+        kwargs = {'json': entry['body']} if 'body' in entry else {}
+        return user_id, (entry.get('name') or f"{method} {path.split('?')[0]}", method, path, kwargs, removed)
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+class Context:
+    def __init__(self, pool, seed, image_ratio, counter):
+        self.pool = pool
+        self.rng = random.Random(seed)
+        self.image_ratio = image_ratio
+        self.counter = counter
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}   # 이름 -> [초]
+        self.statuses = {}  # 이름 -> {상태 코드: 횟수}
+
+    def record(self, name, elapsed, status):
+        with self._lock:
+            self.samples.setdefault(name, []).append(elapsed)
+            counts = self.statuses.setdefault(name, {})
+            counts[status] = counts.get(status, 0) + 1
+
+
+def seed_letters(base_url, pool, per_user, rng):
+    session = requests.Session()
+    for user_id in pool.user_ids:
+        remaining = per_user
+        while remaining > 0:
+            batch = [letter_payload(rng, i) for i in range(min(remaining, 500))]
+            response = session.post(f"{base_url}/api/letters/write/bulk/", json=batch,
+                                    headers={'Authorization': f"Bearer user-{user_id}"}, timeout=60)
+            response.raise_for_status()
+            pool.add(user_id, [item['letter']['id'] for item in response.json()['results']])
+            remaining -= len(batch)
+
+
+def run_load(base_url, workload, pool, args, recorder):
+    deadline = time.monotonic() + args.warmup + args.duration
+    measure_from = time.monotonic() + args.warmup
+    budget = itertools.count()
+    counter = itertools.count()
+    counter_lock = threading.Lock()
+
+    def next_number():
+        with counter_lock:
+            return next(counter)
+
+    # runserver(wsgiref)는 keep-alive 연결에서 응답을 나눠 쓰면서 Nagle/지연 ACK로 요청마다 ~40ms가 더해짐
+    keepalive = args.keepalive == 'on' or (args.keepalive == 'auto' and not (args.server == 'runserver' and args.base_url is None))
+
+    def worker(index):
+        ctx = Context(pool, args.seed + index, args.image_ratio, next_number)
+        session = requests.Session()
+        etags = {}
+        while time.monotonic() < deadline:
+            if args.requests and next(budget) >= args.requests:
+                return
+            user_id, request = workload.next(ctx)
+            if request is None:
+                return
+            name, method, path, kwargs, removed = request
+            headers = {'Authorization': f"Bearer user-{user_id}"}
+            if args.conditional and method == 'GET' and (user_id, path) in etags:
+                headers['If-None-Match'] = etags[(user_id, path)]
+            t0 = time.perf_counter()
+            try:
+                send = session.request if keepalive else requests.request  # keep-alive를 끄면 요청마다 새 연결
+                response = send(method, base_url + path, headers=headers, timeout=args.timeout, **kwargs)
+                status = response.status_code
+            except requests.RequestException:
+                response, status = None, 'error'
+            elapsed = time.perf_counter() - t0
+            if time.monotonic() >= measure_from:
+                recorder.record(name, elapsed, status)
+            if response is None:
+                continue
+            if method == 'GET' and response.headers.get('ETag'):
+                etags[(user_id, path)] = response.headers['ETag']
+            if name == 'write' and status == 201:
+                pool.add(user_id, [response.json()['id']])
+            elif removed is not None and status not in (200, 404):
+                pool.add(user_id, [removed])  # 삭제 실패 -> 다시 대상 목록에
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return max(1e-9, time.monotonic() - max(started + args.warmup, started))
+
+
+def summarize_run(recorder, elapsed):
+    endpoints = {}
+    all_samples = []
+    for name in sorted(recorder.samples):
+        samples = recorder.samples[name]
+        all_samples += samples
+        statuses = recorder.statuses[name]
+        errors = sum(count for status, count in statuses.items() if status == 'error' or int(status) >= 500)
+        endpoints[name] = _stats(samples, elapsed)
+        endpoints[name].update(errors=errors, statuses={str(k): v for k, v in sorted(statuses.items(), key=str)})
+    total = _stats(all_samples, elapsed)
+    total['errors'] = sum(e['errors'] for e in endpoints.values())
+    return endpoints, total
+
+
+def _stats(samples, elapsed):
+    return {
+        'count': len(samples),
+        'rps': len(samples) / elapsed,
+        'mean_ms': (sum(samples) / len(samples) * 1000) if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def print_report(endpoints, total):
+    print(f"{'endpoint':<20} {'count':>8} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}  statuses")
+    for name, s in list(endpoints.items()) + [('TOTAL', total)]:
+        statuses = ' '.join(f"{k}:{v}" for k, v in s.get('statuses', {}).items())
+        print(f"{name:<20} {s['count']:>8} {s['rps']:>9.1f} {s['p50_ms']:>7.2f}ms {s['p95_ms']:>7.2f}ms "
+              f"{s['p99_ms']:>7.2f}ms {s['errors']:>7}  {statuses}")
+
+
+def compare(result, baseline, threshold):
+    """ 기준 결과와 비교해 표를 출력하고, 회귀가 있으면 True를 반환합니다. """
+    print(f"\n비교 기준: {baseline['meta'].get('label') or baseline['meta'].get('git_rev')} "
+          f"({baseline['meta'].get('started_at')}), 회귀 기준 {threshold:.0f}%")
+    print(f"{'endpoint':<20} {'metric':<7} {'before':>10} {'after':>10} {'change':>9}")
+    regressed = False
+    rows = list(result['endpoints'].items()) + [('TOTAL', result['total'])]
+    for name, after in rows:
+        before = baseline['total'] if name == 'TOTAL' else baseline['endpoints'].get(name)
+        if not before:
+            continue
+        for metric, higher_is_worse in (('p50_ms', True), ('p95_ms', True), ('p99_ms', True), ('rps', False)):
+            old, new = before[metric], after[metric]
+            change = ((new - old) / old * 100) if old else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            regressed |= worse
+            print(f"{name:<20} {metric:<7} {old:>10.2f} {new:>10.2f} {change:>+8.1f}%{'  ⚠️ 회귀' if worse else ''}")
+    return regressed
+
+
+def git_rev():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['runserver', 'gunicorn', 'uvicorn'], default='runserver')
+    parser.add_argument('--server-workers', type=int, default=2)
+    parser.add_argument('--server-threads', type=int, default=4)
+    parser.add_argument('--server-log', default=None, help='서버 출력을 저장할 파일 (기본: 버림)')
+    parser.add_argument('--base-url', default=None, help='이미 떠 있는 서버에 보냄 (서버/스텁을 띄우지 않음)')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--seed-letters', type=int, default=50, help='시작 전에 사용자마다 만들어 둘 편지 수')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20.0, help='측정 시간(초)')
+    parser.add_argument('--warmup', type=float, default=2.0, help='통계에서 제외할 시작 구간(초)')
+    parser.add_argument('--requests', type=int, default=0, help='전체 요청 수 상한 (0이면 시간으로만 제한)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument('--replay', default=None, help='재생할 JSONL 요청 파일')
+    parser.add_argument('--loop', action='store_true', help='재생 파일을 시간이 끝날 때까지 반복')
+    parser.add_argument('--conditional', action='store_true', help='받은 ETag로 If-None-Match를 보내며 폴링')
+    parser.add_argument('--image-ratio', type=float, default=0.0, help='이미지를 함께 올리는 작성 요청 비율')
+    parser.add_argument('--auth-latency', type=float, default=0.002, help='스텁 auth-service 응답 지연(초)')
+    parser.add_argument('--storage-latency', type=float, default=0.005, help='스텁 스토리지 응답 지연(초)')
+    parser.add_argument('--no-background', action='store_true', help='아웃박스 릴레이 / 이미지 삭제 워커를 돌리지 않음')
+    parser.add_argument('--keepalive', choices=['auto', 'on', 'off'], default='auto',
+                        help='HTTP keep-alive 사용 여부 (auto: runserver일 때만 끔)')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--label', default=None, help='결과 파일에 남길 실행 이름')
+    parser.add_argument('--output', default=None, help='결과를 저장할 JSON 파일')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON 파일')
+    parser.add_argument('--threshold', type=float, default=10.0, help='회귀로 볼 변화율(%%)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='회귀가 있으면 종료 코드 1')
+    args = parser.parse_args()
+
+    workload = ReplayWorkload(args.replay, args.loop) if args.replay else GeneratedWorkload(args.mix)
+    user_ids = workload.user_ids() if args.replay else range(1, args.users + 1)
+    pool = UserPool(user_ids)
+
+    workdir = tempfile.mkdtemp(prefix='letter-loadtest-')
+    server = stubs = background = None
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            stubs = [start_stub_server(StubAuthHandler, latency=args.auth_latency),
+                     start_stub_server(StubStorageHandler, latency=args.storage_latency)]
+            os.environ.update({
+                'DJANGO_SETTINGS_MODULE': 'benchmarks.settings',
+                'BENCH_SQLITE_PATH': os.environ.get('BENCH_SQLITE_PATH', os.path.join(workdir, 'letters.sqlite3')),
+                'AUTH_SERVICE_URL': f"{stubs[0][1]}/api/auth",
+                'LETTER_STORAGE_SERVICE_BASE_URL': stubs[1][1],
+                'PYTHONUNBUFFERED': '1',
+            })
+            setup_django()  # 마이그레이션 (서버와 같은 DB 파일)
+            port = free_port()
+            log = open(args.server_log, 'w') if args.server_log else subprocess.DEVNULL
+            server = subprocess.Popen(server_command(args.server, port, args.server_workers, args.server_threads),
+                                      cwd=BASE_DIR, env=os.environ.copy(), stdout=log, stderr=subprocess.STDOUT)
+            base_url = f"http://127.0.0.1:{port}"
+            wait_until_ready(base_url, server)
+            if not args.no_background:
+                background = BackgroundWorkers()
+                background.start()
+
+        if args.seed_letters:
+            seed_letters(base_url, pool, args.seed_letters, random.Random(args.seed))
+
+        recorder = Recorder()
+        # 백그라운드 워커(같은 프로세스)의 print 로그가 결과 출력과 섞이지 않도록
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            elapsed = run_load(base_url, workload, pool, args, recorder)
+        endpoints, total = summarize_run(recorder, elapsed)
+        print_report(endpoints, total)
+        if background is not None:
+            print(f"\n백그라운드: 감정 분석 요청 {background.relayed}건 발행, 이미지 {background.blobs_deleted}개 삭제")
+
+        result = {
+            'meta': {
+                'label': args.label,
+                'started_at': datetime.now(timezone.utc).isoformat(),
+                'git_rev': git_rev(),
+                'python': platform.python_version(),
+                'server': args.server if args.base_url is None else args.base_url,
+                'workload': args.replay or args.mix,
+                'concurrency': args.concurrency,
+                'duration_s': elapsed,
+                'users': len(pool.user_ids),
+                'conditional': args.conditional,
+            },
+            'endpoints': endpoints,
+            'total': total,
+        }
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            print(f"결과 저장: {args.output}")
+        if args.compare:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                regressed = compare(result, json.load(f), args.threshold)
+            if regressed and args.fail_on_regression:
+                sys.exit(1)
+    finally:
+        if background is not None:
+            background.stop()
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        for stub, _ in stubs or []:
+            stub.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
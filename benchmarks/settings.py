@@ -0,0 +1,31 @@
+"""
+벤치마크 전용 Django 설정.
+외부 서비스 없이 한 대의 머신에서 실행할 수 있도록 SQLite와 로컬 스텁 서버 주소를 사용합니다.
+BENCH_USE_POSTGRES=true 이면 기존 DB_* 환경 변수의 PostgreSQL을 그대로 사용합니다.
+"""
+import os
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-only-secret-key')
+os.environ.setdefault('AUTH_SERVICE_URL', 'http://127.0.0.1:18001/api/auth')
+os.environ.setdefault('LETTER_STORAGE_SERVICE_BASE_URL', 'http://127.0.0.1:18002')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')  # 벤치마크 출력에 요청 로그가 섞이지 않도록
+os.environ.setdefault('LETTER_SERVER_TIMING_ENABLED', 'True')  # bench_instrumentation이 헤더를 출력 (loopback 요청만 붙음)
+
+from letter_project.settings import *  # noqa: E402,F401,F403
+
+if os.getenv('BENCH_USE_POSTGRES', 'False').lower() != 'true':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('BENCH_SQLITE_PATH', ':memory:'),
+            # 부하 테스트에서는 서버와 백그라운드 워커가 같은 파일에 동시에 쓰므로 WAL + 쓰기 트랜잭션 즉시 잠금
+            'OPTIONS': {'timeout': 30, 'init_command': 'PRAGMA journal_mode=WAL;', 'transaction_mode': 'IMMEDIATE'},
+        }
+    }
+    # BENCH_REPLICA=true 이면 같은 SQLite 파일을 가리키는 'replica' 별칭을 추가해 라우팅을 로컬에서 확인
+    # (BENCH_SQLITE_PATH로 파일 DB를 지정해야 두 별칭이 같은 데이터를 봄)
+    if os.getenv('BENCH_REPLICA', 'False').lower() == 'true':
+        DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+DEBUG = False
+STATICFILES_DIRS = []
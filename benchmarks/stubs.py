@@ -0,0 +1,183 @@
+"""
+벤치마크용 로컬 스텁 서버 (auth-service 대역).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    latency = 0.0  # 응답 전 인위적 지연(초)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # 요청마다 stderr에 찍히지 않도록
+        pass
+
+
+class StubAuthHandler(_JsonHandler):
+    """
+    POST /api/auth/internal/verify/ 를 흉내냅니다.
+    토큰이 'user-<id>' 형식이면 해당 user_id를, 그 외에는 401을 반환합니다.
+    """
+    calls = 0
+
+    def do_POST(self):
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        token = str(self._read_json().get('token', ''))
+        if token.startswith('user-') and token[5:].isdigit():
+            self._send_json(200, {'user_id': int(token[5:])})
+        else:
+            self._send_json(401, {'detail': 'Token is invalid or expired'})
+
+
+def _utc_now_iso():
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def start_stub_server(handler_cls, port=0, latency=0.0):
+    """스텁 서버를 백그라운드 스레드로 띄우고 (server, base_url)을 반환합니다."""
+    handler = type(handler_cls.__name__, (handler_cls,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class FakeBlockingConnection:
+    """
+    pika.BlockingConnection을 흉내내는 인메모리 AMQP 대역.
+    브로커 왕복(round trip)이 필요한 동작마다 rtt만큼 지연시켜 네트워크 비용을 모사합니다.
+    """
+    rtt = 0.0005
+    handshake_round_trips = 4  # TCP + protocol header + Connection.Start/Tune/Open 근사치
+    published = []
+
+    def __init__(self, params=None):
+        time.sleep(self.rtt * self.handshake_round_trips)
+        self.is_open = True
+        self._channel = None
+
+    def channel(self):
+        time.sleep(self.rtt)
+        self._channel = FakeChannel(self)
+        return self._channel
+
+    def process_data_events(self, time_limit=0):
+        pass
+
+    def close(self):
+        time.sleep(self.rtt)
+        self.is_open = False
+
+
+class FakeChannel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.is_open = True
+
+    def exchange_declare(self, **kwargs):
+        time.sleep(self.connection.rtt)
+
+    def tx_select(self):
+        time.sleep(self.connection.rtt)
+
+    def tx_commit(self):
+        time.sleep(self.connection.rtt)
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        # basic.publish는 비동기(응답 없음)이므로 왕복 지연 없이 기록만 함
+        self.connection.published.append((exchange, routing_key, body))
+
+
+class StubStorageHandler(_JsonHandler):
+    """
+    letter-storage-service 대역.
+      POST   /api/images/          -> {"blob_name": ...}
+      POST   /api/images/upload-url/ -> {"blob_name", "upload_url", "method"} (직접 업로드 대상)
+      PUT    /upload/<blob>          -> 200 (사전 서명된 업로드 URL 흉내)
+      GET    /api/images/<blob>/   -> {"signed_url": ...} (X-Goog-Date/X-Goog-Expires 포함)
+      DELETE /api/images/<blob>/   -> 204
+      GET    /api/images/          -> {"blobs": [{"name", "updated"}], "next_page_token": null}
+    """
+    calls = 0
+    signed_url_expires = 900
+    blobs = {}  # blob 이름 -> 업로드 시각(ISO 8601)
+
+    def _blob_name(self):
+        path = self.path.split('?', 1)[0]
+        return path[len('/api/images/'):].strip('/')
+
+    def do_POST(self):
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.path.startswith('/api/images/upload-url/'):
+            request = self._read_json()
+            blob_name = f"letters/{request.get('letter_id')}/{time.time_ns()}.jpg"
+            host, port = self.server.server_address
+            self._send_json(200, {
+                'blob_name': blob_name,
+                'upload_url': f"http://{host}:{port}/upload/{blob_name}",
+                'method': 'PUT',
+                'expires_in': 900,
+            })
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        blob_name = f"letters/{time.time_ns()}.jpg"
+        self.blobs[blob_name] = _utc_now_iso()
+        self._send_json(201, {'blob_name': blob_name})
+
+    def do_PUT(self):
+        type(self).calls += 1
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.blobs[self.path[len('/upload/'):]] = _utc_now_iso()
+        self._send_json(200, {})
+
+    def do_GET(self):
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        blob_name = self._blob_name()
+        if not blob_name:
+            self._send_json(200, {
+                'blobs': [{'name': name, 'updated': updated} for name, updated in list(self.blobs.items())],
+                'next_page_token': None,
+            })
+            return
+        signed_at = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        self._send_json(200, {
+            'signed_url': (f"https://storage.example.com/{blob_name}?X-Goog-Date={signed_at}"
+                           f"&X-Goog-Expires={self.signed_url_expires}&X-Goog-Signature=stub")
+        })
+
+    def do_DELETE(self):
+        type(self).calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.blobs.pop(self._blob_name(), None) is None:
+            self._send_json(404, {'detail': 'not found'})
+            return
+        self.send_response(204)
+        self.end_headers()
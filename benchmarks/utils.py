@@ -0,0 +1,46 @@
+"""
+벤치마크 스크립트 공용 유틸.
+"""
+import os
+import statistics
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(migrate=True):
+    """benchmarks.settings로 Django를 초기화하고, 필요하면 마이그레이션을 적용합니다."""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    django.setup()
+    if migrate:
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """초 단위 샘플 목록을 ms 단위 요약(dict)으로 변환합니다."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def print_summary(label, samples):
+    s = summarize(samples)
+    print(f"{label:<32} n={s['count']:<7} mean={s['mean_ms']:8.3f}ms "
+          f"p50={s['p50_ms']:8.3f}ms p95={s['p95_ms']:8.3f}ms p99={s['p99_ms']:8.3f}ms")
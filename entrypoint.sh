@@ -1,8 +1,17 @@
 #!/bin/sh
 
+# 인자가 주어지면 (예: python manage.py relay_emotion_outbox) 웹 서버 대신 해당 명령 실행
+if [ "$#" -gt 0 ]; then
+  exec "$@"
+fi
+
 echo "⏳ 데이터베이스 마이그레이션 적용 중..."
 python manage.py migrate --noinput
 
 echo "🚀 Django 애플리케이션 서버 시작 중..."
 # exec python manage.py runserver 0.0.0.0:8000 # 개발 서버
+if [ "$SERVER_MODE" = "asgi" ]; then
+  # 비동기 API(api/async/letters/)를 위한 ASGI 워커
+  exec gunicorn letter_project.asgi:application -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8006
+fi
 exec gunicorn letter_project.wsgi:application --bind 0.0.0.0:8006 # 프로덕션 서버
\ No newline at end of file
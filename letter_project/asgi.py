@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'letter_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from letters.async_http import with_lifespan  # noqa: E402 (Django 설정 후 import)
+
+# uvicorn 워커 종료(lifespan.shutdown) 시 공유 httpx.AsyncClient를 닫음
+application = with_lifespan(django_application)
@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'letters.middleware.RequestMetricsMiddleware', # 가장 앞: 전체 처리 시간 측정 + Server-Timing 헤더
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -108,19 +109,172 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # 요청마다 새로 접속하지 않고 워커 스레드별 연결을 재사용 (재사용 전 끊긴 연결인지 확인)
+        # ASGI 모드에서는 요청마다 스레드가 달라질 수 있으므로 DB_CONN_MAX_AGE=0 + PgBouncer 같은 외부 풀러를 권장
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
     }
 }
 
+# 읽기 전용 복제본 (설정 시 편지 목록/상세 조회를 replica로 보냄)
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST,
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'}, # 테스트에서는 default DB를 그대로 사용
+    }
+DATABASE_ROUTERS = ['letters.db_router.ReplicaRouter']
+LETTER_REPLICA_STICKY_SECONDS = int(os.getenv('LETTER_REPLICA_STICKY_SECONDS', '5')) # 사용자가 편지를 변경한 뒤 이 시간 동안은 primary에서 읽음
+
 RABBITMQ_HOST = os.getenv('RABBITMQ_HOST', 'localhost')
 RABBITMQ_PORT = int(os.getenv('RABBITMQ_PORT', '5672')) # 포트는 정수형으로 변환
 RABBITMQ_VHOST = os.getenv('RABBITMQ_VHOST', '/')
 RABBITMQ_USER = os.getenv('RABBITMQ_USER', 'guest')
 RABBITMQ_PASSWORD = os.getenv('RABBITMQ_PASSWORD', 'guest')
+RABBITMQ_HEARTBEAT = int(os.getenv('RABBITMQ_HEARTBEAT', '600')) # 워커가 유지하는 연결의 heartbeat 간격(초)
+RABBITMQ_BLOCKED_CONNECTION_TIMEOUT = int(os.getenv('RABBITMQ_BLOCKED_CONNECTION_TIMEOUT', '30'))
+RABBITMQ_PUBLISH_CONFIRMS = os.getenv('RABBITMQ_PUBLISH_CONFIRMS', 'False').lower() == 'true' # 묶음 단위 브로커 수신 확인
+EMOTION_OUTBOX_CLAIM_TIMEOUT = int(os.getenv('EMOTION_OUTBOX_CLAIM_TIMEOUT', '60')) # 아웃박스 릴레이가 발행 중으로 표시한 행을 다른 릴레이가 건너뛰는 시간(초)
+EMOTION_RESULT_QUEUE = os.getenv('EMOTION_RESULT_QUEUE', 'letter.emotion.result') # 감정 분석 결과를 받을 큐
+EMOTION_RESULT_ROUTING_KEY = os.getenv('EMOTION_RESULT_ROUTING_KEY', 'result') # emotion.direct에서 결과 메시지의 라우팅 키
 
 # USER_SERVICE_URL = os.getenv('USER_SERVICE_URL', "http://localhost:8002")
 LETTER_STORAGE_SERVICE_BASE_URL =  os.getenv('LETTER_STORAGE_SERVICE_BASE_URL')
+STORAGE_SERVICE_TIMEOUT = float(os.getenv('STORAGE_SERVICE_TIMEOUT', '10')) # 스토리지 서비스 요청 타임아웃(초, 동기 호출)
+BLOB_DELETION_CLAIM_TIMEOUT = int(os.getenv('BLOB_DELETION_CLAIM_TIMEOUT', '300')) # 이미지 삭제 워커가 처리 중으로 가져간 행을 다른 워커가 건너뛰는 시간(초)
+
+# 비동기(ASGI) 뷰가 공유하는 httpx.AsyncClient 커넥션 풀 설정
+ASYNC_HTTP_TIMEOUT = float(os.getenv('ASYNC_HTTP_TIMEOUT', '5'))
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '100'))
+ASYNC_HTTP_MAX_KEEPALIVE = int(os.getenv('ASYNC_HTTP_MAX_KEEPALIVE', '20'))
+
+# 서명된 URL 캐시 (blob 이름 -> signed URL), 캐시 TTL은 URL 자체 만료 시각보다 짧게 계산됨
+SIGNED_URL_CACHE_ENABLED = os.getenv('SIGNED_URL_CACHE_ENABLED', 'True').lower() == 'true'
+SIGNED_URL_CACHE_MAX_ENTRIES = int(os.getenv('SIGNED_URL_CACHE_MAX_ENTRIES', '10000'))
+SIGNED_URL_CACHE_MAX_BYTES = int(os.getenv('SIGNED_URL_CACHE_MAX_BYTES', str(16 * 1024 * 1024))) # 워커당 캐시 메모리 상한
+SIGNED_URL_DEFAULT_EXPIRY = int(os.getenv('SIGNED_URL_DEFAULT_EXPIRY', '900')) # URL에 만료 정보가 없을 때 가정하는 유효 시간(초)
+SIGNED_URL_CACHE_TTL_RATIO = float(os.getenv('SIGNED_URL_CACHE_TTL_RATIO', '0.5')) # 남은 유효 시간 중 캐시에 보관할 비율
+SIGNED_URL_MIN_REMAINING = int(os.getenv('SIGNED_URL_MIN_REMAINING', '60')) # 캐시에서 내보내는 URL의 최소 잔여 유효 시간(초)
 AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL')
 AUTH_TOKEN_VERIFY_ENDPOINT = os.getenv('AUTH_TOKEN_VERIFY_ENDPOINT')
+AUTH_SERVICE_TIMEOUT = float(os.getenv('AUTH_SERVICE_TIMEOUT', '3')) # auth-service 요청 타임아웃(초)
+
+# 토큰 검증 결과 캐시 (토큰 -> user_id)
+AUTH_TOKEN_CACHE_ENABLED = os.getenv('AUTH_TOKEN_CACHE_ENABLED', 'True').lower() == 'true'
+AUTH_TOKEN_CACHE_TTL = int(os.getenv('AUTH_TOKEN_CACHE_TTL', '60')) # 검증 성공 캐시 유지 시간(초), 토큰 exp가 더 짧으면 exp 우선
+AUTH_TOKEN_CACHE_MAX_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_MAX_SIZE', '10000')) # 워커당 최대 캐시 항목 수 (초과 시 LRU 퇴출)
+AUTH_TOKEN_CACHE_NEGATIVE_TTL = int(os.getenv('AUTH_TOKEN_CACHE_NEGATIVE_TTL', '5')) # 거부된 토큰 캐시 유지 시간(초)
+
+# 토큰 검증 방식: remote(auth-service 호출) | local(JWT 직접 검증) | local_fallback(로컬 검증 불가 토큰만 auth-service로)
+AUTH_VERIFY_MODE = os.getenv('AUTH_VERIFY_MODE', 'remote')
+AUTH_JWT_ALGORITHMS = [alg.strip() for alg in os.getenv('AUTH_JWT_ALGORITHMS', 'HS256').split(',') if alg.strip()]
+AUTH_JWT_SECRET = os.getenv('AUTH_JWT_SECRET') # HS* 알고리즘용 공유 비밀키 (auth-service의 SIGNING_KEY)
+AUTH_JWT_PUBLIC_KEY_FILE = os.getenv('AUTH_JWT_PUBLIC_KEY_FILE') # RS*/ES* 알고리즘용 PEM 공개키 파일 경로
+AUTH_JWT_JWKS_FILE = os.getenv('AUTH_JWT_JWKS_FILE') # kid별 공개키가 담긴 JWKS 파일 경로
+AUTH_JWT_AUDIENCE = os.getenv('AUTH_JWT_AUDIENCE') # 설정 시 aud 클레임 검증
+AUTH_JWT_ISSUER = os.getenv('AUTH_JWT_ISSUER') # 설정 시 iss 클레임 검증
+AUTH_JWT_USER_ID_CLAIM = os.getenv('AUTH_JWT_USER_ID_CLAIM', 'user_id')
+AUTH_JWT_LEEWAY = int(os.getenv('AUTH_JWT_LEEWAY', '0')) # exp 검증 시 허용 오차(초)
+
+# 편지 목록 페이지 크기 (cursor 기반 페이지네이션)
+LETTER_LIST_PAGE_SIZE = int(os.getenv('LETTER_LIST_PAGE_SIZE', '50'))
+LETTER_LIST_MAX_PAGE_SIZE = int(os.getenv('LETTER_LIST_MAX_PAGE_SIZE', '200'))
+LETTER_LIST_FAST_PATH = os.getenv('LETTER_LIST_FAST_PATH', 'True').lower() == 'true' # values() 기반 목록 직렬화 (False면 DRF serializer)
+LETTER_PREVIEW_LENGTH = int(os.getenv('LETTER_PREVIEW_LENGTH', '100')) # 목록 preview 필드의 본문 앞부분 글자 수
+
+# 내부 전용 엔드포인트(캐시 통계 등) 접근 허용: 이 대역에서 온 요청이거나 X-Internal-Token 헤더가 같을 때
+LETTER_INTERNAL_NETWORKS = [network.strip() for network in os.getenv('LETTER_INTERNAL_NETWORKS', '127.0.0.0/8,::1/128').split(',') if network.strip()]
+LETTER_INTERNAL_API_TOKEN = os.getenv('LETTER_INTERNAL_API_TOKEN') # 비어 있으면 토큰으로는 허용하지 않음
+
+# 요청 / 의존성 지연 측정 (/metrics, Server-Timing 헤더)
+LETTER_METRICS_ENABLED = os.getenv('LETTER_METRICS_ENABLED', 'True').lower() == 'true'
+LETTER_SERVER_TIMING_ENABLED = os.getenv('LETTER_SERVER_TIMING_ENABLED', 'False').lower() == 'true' # 켜도 내부 요청(LETTER_INTERNAL_NETWORKS / 내부 토큰)에만 붙음
+
+# 업로드 이미지 정규화 / 썸네일 (Pillow, 프로세스 풀에서 처리)
+LETTER_IMAGE_PROCESSING_ENABLED = os.getenv('LETTER_IMAGE_PROCESSING_ENABLED', 'True').lower() == 'true'
+LETTER_IMAGE_MAX_DIMENSION = int(os.getenv('LETTER_IMAGE_MAX_DIMENSION', '2048')) # 긴 변 최대 픽셀
+LETTER_IMAGE_FORMAT = os.getenv('LETTER_IMAGE_FORMAT', 'JPEG').upper() # JPEG | WEBP | PNG
+LETTER_IMAGE_QUALITY = int(os.getenv('LETTER_IMAGE_QUALITY', '82'))
+LETTER_THUMBNAIL_SIZE = int(os.getenv('LETTER_THUMBNAIL_SIZE', '320'))
+LETTER_THUMBNAIL_QUALITY = int(os.getenv('LETTER_THUMBNAIL_QUALITY', '70'))
+LETTER_IMAGE_MAX_PIXELS = int(os.getenv('LETTER_IMAGE_MAX_PIXELS', '50000000')) # 디코딩을 거부할 픽셀 수 (decompression bomb 방지)
+LETTER_IMAGE_WORKERS = int(os.getenv('LETTER_IMAGE_WORKERS', '2')) # 웹 워커 프로세스마다 띄우는 이미지 처리 프로세스 수
+LETTER_IMAGE_MAX_PENDING = int(os.getenv('LETTER_IMAGE_MAX_PENDING', str(max(LETTER_IMAGE_WORKERS, 1) * 4))) # 넘으면 503
+LETTER_IMAGE_TIMEOUT = float(os.getenv('LETTER_IMAGE_TIMEOUT', '15'))
+
+# 로그: 구조화(JSON) 레코드를 큐에 넣고 별도 스레드에서 stdout으로 기록 (요청 스레드에서 블로킹 쓰기 없음)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper() # letters.* 로거 기본 레벨
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json') # json | text (로컬 개발용)
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0')) # DEBUG 레코드 중 남길 비율 (0.0 ~ 1.0)
+# 로거별 레벨 / DEBUG 샘플링 비율 (예: 'letters.storage_client=DEBUG,letters.auth_client=WARNING')
+LOG_LEVELS = dict(item.strip().split('=', 1) for item in os.getenv('LOG_LEVELS', '').split(',') if '=' in item)
+LOG_SAMPLE_RATES = {name: float(rate) for name, rate in (
+    item.strip().split('=', 1) for item in os.getenv('LOG_SAMPLE_RATES', '').split(',') if '=' in item)}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'letters.log_handlers.JsonFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'filters': {
+        'sampling': {
+            '()': 'letters.log_handlers.SamplingFilter',
+            'rate': LOG_DEBUG_SAMPLE_RATE,
+            'rates': LOG_SAMPLE_RATES,
+        },
+    },
+    'handlers': {
+        'queue': {
+            'class': 'letters.log_handlers.NonBlockingQueueHandler',
+            'queue_size': int(os.getenv('LOG_QUEUE_SIZE', '10000')), # 가득 차면 레코드를 버림 (요청을 막지 않음)
+            'formatter': 'json' if LOG_FORMAT == 'json' else 'text',
+            'filters': ['sampling'],
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': 'WARNING'},
+    'loggers': {
+        'django': {'handlers': ['queue'], 'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO').upper(), 'propagate': False},
+        'letters': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        **{name.strip(): {'level': level.strip().upper()} for name, level in LOG_LEVELS.items()},
+    },
+}
+
+# 여러 편지 한 번에 작성 (write/bulk/) 요청당 최대 편지 수
+LETTER_BULK_MAX_BATCH = int(os.getenv('LETTER_BULK_MAX_BATCH', '500'))
+# 여러 편지 한 번에 삭제 (delete/bulk/) 요청당 최대 id 수
+LETTER_BULK_DELETE_MAX_IDS = int(os.getenv('LETTER_BULK_DELETE_MAX_IDS', '10000'))
+# 편지 상세 ETag 갱신 주기(초): 캐시된 응답의 서명된 URL이 만료되지 않도록 SIGNED_URL_MIN_REMAINING보다 짧게
+LETTER_DETAIL_ETAG_WINDOW = int(os.getenv('LETTER_DETAIL_ETAG_WINDOW', '30'))
+
+# 캐시: 기본은 프로세스 내 locmem, REDIS_URL이 있으면 워커들이 공유하는 Redis (redis 패키지 필요)
+REDIS_URL = os.getenv('REDIS_URL')
+LETTER_LIST_CACHE_MAX_ENTRIES = int(os.getenv('LETTER_LIST_CACHE_MAX_ENTRIES', '5000')) # locmem 사용 시 최대 항목 수
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'letter_list': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'letter-service',
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'letter-list',
+        'OPTIONS': {'MAX_ENTRIES': LETTER_LIST_CACHE_MAX_ENTRIES},
+    },
+}
+
+# 편지 목록 응답 캐시 (키에 사용자 편지 버전과 날짜 포함, 자정에 만료)
+LETTER_LIST_CACHE_ENABLED = os.getenv('LETTER_LIST_CACHE_ENABLED', 'True').lower() == 'true'
+LETTER_LIST_CACHE_TTL = int(os.getenv('LETTER_LIST_CACHE_TTL', '300')) # 항목 유지 시간(초), 자정을 넘기지 않음
+LETTER_LIST_CACHE_MAX_ENTRY_BYTES = int(os.getenv('LETTER_LIST_CACHE_MAX_ENTRY_BYTES', str(512 * 1024))) # 이보다 큰 응답은 캐시하지 않음
+LETTER_LIST_CACHE_LOCK_WAIT = float(os.getenv('LETTER_LIST_CACHE_LOCK_WAIT', '0.5')) # 동시 미스 시 다른 요청의 결과를 기다리는 최대 시간(초)
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
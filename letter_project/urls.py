@@ -17,12 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.views.generic import TemplateView
 from django.urls import include, path
-from letters.views import health_check
+from letters.views import health_check, metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     # path("", TemplateView.as_view(template_name="commons/index.html"), name="home"),
     path("api/letters/", include("letters.urls")),
+    path("api/async/letters/", include("letters.async_urls")), # ASGI 워커용 비동기 API
     path('health/', health_check),  
+    path('metrics', metrics), # Prometheus 스크레이프 (워커 프로세스별 값)
 
 ]
@@ -5,4 +5,8 @@ class LettersConfig(AppConfig):
     name = 'letters' # -> 마이크로서비스일때
 
     def ready(self):
-        from letters.models import Letters  # ✅ 강제로 models.py 로드
\ No newline at end of file
+        from letters.models import Letters  # ✅ 강제로 models.py 로드
+        from django.db.backends.signals import connection_created
+        from letters.metrics import install_db_instrumentation
+        # DB 연결이 만들어질 때마다 쿼리 시간 측정 훅 등록 (Server-Timing의 db 항목)
+        connection_created.connect(install_db_instrumentation, dispatch_uid='letters_db_metrics')
\ No newline at end of file
@@ -0,0 +1,53 @@
+# letters/async_http.py
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+
+# 이벤트 루프마다 하나의 AsyncClient를 공유 (커넥션 풀/keep-alive 재사용)
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """
+    현재 이벤트 루프에서 공유하는 httpx.AsyncClient를 반환합니다.
+    ASGI 워커에서는 루프가 하나이므로 워커 전체가 같은 커넥션 풀을 사용합니다.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(getattr(settings, 'ASYNC_HTTP_TIMEOUT', 5.0)),
+            limits=httpx.Limits(
+                max_connections=getattr(settings, 'ASYNC_HTTP_MAX_CONNECTIONS', 100),
+                max_keepalive_connections=getattr(settings, 'ASYNC_HTTP_MAX_KEEPALIVE', 20),
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def with_lifespan(app):
+    """
+    ASGI lifespan 이벤트를 처리하도록 app을 감쌉니다. (Django ASGIHandler는 lifespan을 처리하지 않음)
+    워커가 종료될 때 공유 AsyncClient의 커넥션을 닫습니다.
+    """
+    async def application(scope, receive, send):
+        if scope['type'] != 'lifespan':
+            return await app(scope, receive, send)
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await close_async_client()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    return application
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import async_views
+
+
+# ASGI 전용 비동기 편지 API (api/async/letters/...) - 경로와 응답 형식은 letters/urls.py와 동일
+app_name = "letters_async"
+urlpatterns = [
+    path('write/', async_views.write_letter_async, name="write_letter_async"),
+    path('', async_views.letter_list_async, name='letter_list_async'),
+    path('<int:letter_id>/', async_views.letter_async, name="letter_async"),
+    path('delete/<int:letter_id>/', async_views.delete_letter_async, name='delete_letter_async'),
+]
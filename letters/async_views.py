@@ -0,0 +1,225 @@
+# letters/async_views.py
+# ASGI(uvicorn 워커)에서 실행되는 비동기 편지 API.
+# auth-service / 스토리지 호출은 공유 httpx.AsyncClient로 처리해, 외부 서비스 응답을 기다리는 동안
+# 같은 워커가 다른 요청을 계속 처리할 수 있습니다. 응답 형식은 letters/views.py와 같습니다.
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+
+from .auth_client import averify_access_token
+from .blob_deletions import deleted_blob_names, enqueue_blob_deletions
+from .bulk_delete import delete_user_letters
+from .models import Letters
+from .outbox import enqueue_emotion_analysis_request
+from .pagination import InvalidCursor, paginate_by_open_date, parse_page_size
+from .db_router import read_from_replica
+from .fast_serialization import letter_values, serialize_letter_rows
+from .projections import InvalidProjection, parse_projection, project_queryset
+from .serializers import LetterCreateSerializer, LetterSerializer
+from .mood_analytics import remove_from_mood_summary
+from .image_processing import IMAGE_PROCESSING_ENABLED, ImageProcessingBusy, ImageProcessingError, aprocess_uploaded_image
+from .storage_client import aget_signed_url_from_storage, aupload_image_to_storage
+from .versioning import (
+    DETAIL_ETAG_WINDOW, aget_letter_version, bump_letter_version, letter_validators,
+    not_modified_response, set_conditional_headers,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _asigned_url(blob_name):
+    return await aget_signed_url_from_storage(blob_name) if blob_name else None
+
+
+async def aget_user_from_token(request):
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise Exception("Access token missing in Authorization header")
+    return await averify_access_token(auth_header.split(" ")[1])
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+    return request.POST
+
+
+def _create_letter(serializer, user_id, analyze=True):
+    # 편지 저장과 감정 분석 요청(아웃박스)을 한 트랜잭션으로 기록
+    # 이미지가 있으면 업로드가 성공한 뒤 _attach_image에서 기록 (업로드 실패로 지워질 편지의 요청이 발행되지 않도록)
+    with transaction.atomic():
+        letter = serializer.save(user_id=user_id, category='future')
+        if analyze and letter.content:
+            enqueue_emotion_analysis_request(letter)
+        bump_letter_version(user_id)
+    return letter
+
+
+def _attach_image(letter, blob_name, thumbnail_blob_name=None):
+    # save()를 다시 거치지 않고 image_url / thumbnail_url만 갱신
+    with transaction.atomic():
+        Letters.objects.filter(id=letter.id).update(image_url=blob_name, thumbnail_url=thumbnail_blob_name)
+        if letter.content:
+            enqueue_emotion_analysis_request(letter)
+        bump_letter_version(letter.user_id)
+    letter.image_url = blob_name
+    letter.thumbnail_url = thumbnail_blob_name
+
+
+def _delete_letter(user_id, letter_id):
+    # DELETE ... RETURNING으로 받은 삭제 시점의 blob 이름 / 감정을 사용, 삭제된 행이 없으면 False
+    with transaction.atomic():
+        deleted = delete_user_letters(user_id, ids=[letter_id])
+        if deleted:
+            enqueue_blob_deletions(deleted_blob_names(deleted))
+            remove_from_mood_summary(deleted)
+            bump_letter_version(user_id)
+    return bool(deleted)
+
+
+def _discard_letter(letter):
+    with transaction.atomic():
+        remove_from_mood_summary(delete_user_letters(letter.user_id, ids=[letter.id]))
+        bump_letter_version(letter.user_id)
+
+
+@csrf_exempt
+@require_POST
+async def write_letter_async(request):
+    try:
+        user_id = await aget_user_from_token(request)
+    except Exception as e:
+        return JsonResponse({"detail": str(e)}, status=401)
+
+    data = _request_data(request)
+    if data is None:
+        return JsonResponse({"detail": "JSON 형식이 올바르지 않습니다."}, status=400)
+    serializer = LetterCreateSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    # 이미지는 편지를 저장하기 전에 정규화 (프로세스 풀 결과를 기다리는 동안 이벤트 루프는 다른 요청 처리)
+    image_file = request.FILES.get('image')
+    processed_image = None
+    if image_file and IMAGE_PROCESSING_ENABLED:
+        try:
+            processed_image = await aprocess_uploaded_image(image_file)
+        except ImageProcessingError as e:
+            return JsonResponse({'image': [str(e)]}, status=400)
+        except ImageProcessingBusy as e:
+            response = JsonResponse({'error': str(e)}, status=503)
+            response['Retry-After'] = '1'
+            return response
+
+    try:
+        letter = await sync_to_async(_create_letter)(serializer, user_id, analyze=not image_file)
+        logger.info('💾 편지 작성(async): 편지 저장 완료! (ID: %s, User: %s)', letter.id, letter.user_id)
+
+        if image_file:
+            if processed_image:
+                # 본문 이미지와 썸네일을 동시에 업로드
+                gcs_blob_name, thumbnail_blob_name = await asyncio.gather(
+                    aupload_image_to_storage(processed_image.image_file(), letter.id),
+                    aupload_image_to_storage(processed_image.thumbnail_file(), letter.id),
+                )
+            else:
+                gcs_blob_name, thumbnail_blob_name = await aupload_image_to_storage(image_file, letter.id), None
+            if not gcs_blob_name:
+                letter_id = letter.id
+                await sync_to_async(_discard_letter)(letter)
+                if thumbnail_blob_name:  # 썸네일만 올라간 경우 남지 않도록 삭제 예약
+                    await sync_to_async(enqueue_blob_deletions)([thumbnail_blob_name])
+                logger.warning('🗑️ 이미지 업로드 실패로 편지 삭제됨 (ID: %s)', letter_id)
+                return JsonResponse({"error": "이미지 업로드에 실패하여 편지가 저장되지 않았습니다."}, status=500)
+            await sync_to_async(_attach_image)(letter, gcs_blob_name, thumbnail_blob_name)
+
+        return JsonResponse(LetterSerializer(letter).data, status=201)
+    except Exception as e:
+        logger.exception('❌ 편지 작성(async): 편지 저장 또는 후속 처리 중 오류 발생! - %s', e)
+        return JsonResponse({'error': '편지 저장 중 서버 내부 오류가 발생했습니다.', 'detail': str(e)}, status=500)
+
+
+@require_GET
+async def letter_list_async(request):
+    try:
+        user_id = await aget_user_from_token(request)
+    except Exception as e:
+        return JsonResponse({"detail": str(e)}, status=401)
+
+    version, updated_at = await aget_letter_version(user_id)
+    etag, last_modified = letter_validators(user_id, version, updated_at, scope=request.get_full_path())
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        limit = parse_page_size(request.GET.get('limit'))
+        fields = parse_projection(request.GET)
+        queryset = project_queryset(Letters.objects.filter(user_id=user_id).with_current_category(), fields)
+        with read_from_replica(last_write_at=updated_at):
+            rows, next_cursor = await sync_to_async(paginate_by_open_date)(
+                letter_values(queryset, fields),
+                cursor=request.GET.get('cursor'),
+                limit=limit,
+            )
+    except (InvalidCursor, InvalidProjection) as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    results = serialize_letter_rows(rows, fields)
+    response = JsonResponse({"results": results, "next_cursor": next_cursor})
+    return set_conditional_headers(response, etag, last_modified)
+
+
+@require_GET
+async def letter_async(request, letter_id):
+    try:
+        user_id = await aget_user_from_token(request)
+    except Exception as e:
+        return JsonResponse({"detail": str(e)}, status=401)
+
+    version, updated_at = await aget_letter_version(user_id)
+    etag, last_modified = letter_validators(
+        user_id, version, updated_at, scope=request.get_full_path(), window=DETAIL_ETAG_WINDOW
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    with read_from_replica(last_write_at=updated_at):
+        letter = await Letters.objects.with_current_category().filter(id=letter_id, user_id=user_id).afirst()
+    if letter is None:
+        return JsonResponse({"detail": "No Letters matches the given query."}, status=404)
+
+    response_data = LetterSerializer(letter).data
+    # 본문 이미지와 썸네일의 서명된 URL을 동시에 요청
+    response_data['image_url'], response_data['thumbnail_url'] = await asyncio.gather(
+        _asigned_url(letter.image_url), _asigned_url(letter.thumbnail_url),
+    )
+    return set_conditional_headers(JsonResponse(response_data), etag, last_modified)
+
+
+@csrf_exempt
+@require_http_methods(["DELETE"])
+async def delete_letter_async(request, letter_id):
+    try:
+        user_id = await aget_user_from_token(request)
+    except Exception as e:
+        return JsonResponse({"detail": str(e)}, status=401)
+
+    try:
+        # 편지 삭제와 이미지 삭제 예약을 한 트랜잭션으로 기록 (스토리지 삭제는 drain_blob_deletions 워커가 처리)
+        if not await sync_to_async(_delete_letter)(user_id, letter_id):
+            return JsonResponse({'status': 'error', 'message': '해당 편지를 찾을 수 없거나 삭제 권한이 없습니다.'}, status=404)
+        return JsonResponse({'status': 'success', 'message': '편지가 성공적으로 삭제되었습니다.'}, status=200)
+    except Exception as e:
+        logger.exception('❌ 편지 삭제(async): 편지 ID %s 삭제 중 예상치 못한 오류 발생! %s', letter_id, e)
+        return JsonResponse({'status': 'error', 'message': '편지 삭제 중 오류가 발생했습니다.'}, status=500)
@@ -1,30 +1,250 @@
 # letters_service/letters/auth_client.py
+import base64
+import hashlib
+import json
+import logging
+import time
+
+import httpx
+import jwt
 import requests
 from django.conf import settings
 
+from .async_http import get_async_client
+from .metrics import atimed_call, timed_call
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
 AUTH_SERVICE_URL = getattr(settings, 'AUTH_SERVICE_URL', 'http://auth-service:8001/api/auth')
 TOKEN_VERIFY_ENDPOINT = getattr(settings, 'AUTH_TOKEN_VERIFY_ENDPOINT', '/internal/verify/')
+AUTH_SERVICE_TIMEOUT = getattr(settings, 'AUTH_SERVICE_TIMEOUT', 3.0)
 
+# 토큰 -> user_id 캐시 설정
+TOKEN_CACHE_ENABLED = getattr(settings, 'AUTH_TOKEN_CACHE_ENABLED', True)
+TOKEN_CACHE_TTL = getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+TOKEN_CACHE_MAX_SIZE = getattr(settings, 'AUTH_TOKEN_CACHE_MAX_SIZE', 10000)
+TOKEN_CACHE_NEGATIVE_TTL = getattr(settings, 'AUTH_TOKEN_CACHE_NEGATIVE_TTL', 5)
+TOKEN_EXPIRY_LEEWAY = 5  # 토큰 만료 직전까지 캐시하지 않도록 두는 여유(초)
 
-def verify_access_token(token):
+# 검증 방식: 'remote'(auth-service 호출), 'local'(JWT 자체 검증), 'local_fallback'(로컬 검증 불가 시 remote)
+AUTH_VERIFY_MODE = getattr(settings, 'AUTH_VERIFY_MODE', 'remote')
+JWT_ALGORITHMS = getattr(settings, 'AUTH_JWT_ALGORITHMS', ['HS256'])
+JWT_SECRET = getattr(settings, 'AUTH_JWT_SECRET', None)
+JWT_PUBLIC_KEY_FILE = getattr(settings, 'AUTH_JWT_PUBLIC_KEY_FILE', None)
+JWT_JWKS_FILE = getattr(settings, 'AUTH_JWT_JWKS_FILE', None)
+JWT_AUDIENCE = getattr(settings, 'AUTH_JWT_AUDIENCE', None)
+JWT_ISSUER = getattr(settings, 'AUTH_JWT_ISSUER', None)
+JWT_USER_ID_CLAIM = getattr(settings, 'AUTH_JWT_USER_ID_CLAIM', 'user_id')
+JWT_LEEWAY = getattr(settings, 'AUTH_JWT_LEEWAY', 0)
+
+token_cache = TTLCache(max_entries=TOKEN_CACHE_MAX_SIZE, default_ttl=TOKEN_CACHE_TTL)
+
+# 워커 내에서 커넥션(keep-alive)을 재사용하기 위한 세션
+_session = requests.Session()
+
+
+def _cache_key(token):
+    # 원본 토큰을 메모리에 그대로 보관하지 않도록 해시를 키로 사용
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _token_expiry(token):
+    """
+    JWT 형식의 토큰이면 서명 검증 없이 payload의 exp(만료 시각, epoch 초)를 꺼냅니다.
+    exp를 알 수 없으면 None을 반환합니다. (캐시 TTL 계산에만 사용)
+    """
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
     try:
-        print("🛠 letter-service가 auth-service에 보낼 토큰:", token)  # 디버깅 로그
+        payload_segment = parts[1] + '=' * (-len(parts[1]) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(payload_segment))
+        exp = payload.get('exp')
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _positive_ttl(token):
+    ttl = TOKEN_CACHE_TTL
+    exp = _token_expiry(token)
+    if exp is not None:
+        ttl = min(ttl, exp - time.time() - TOKEN_EXPIRY_LEEWAY)
+    return ttl
+
+
+def _parse_verify_response(response):
+    # requests.Response / httpx.Response 공통 처리
+    if response.status_code == 200:
+        user_id = response.json()['user_id']
+        logger.debug('✅ auth-service로부터 받은 user_id: %s', user_id)
+        return user_id, None
+    try:
+        return_detail = response.json().get('detail', response.text)
+    except Exception:
+        return_detail = response.text
+    return None, f"Token verification failed: {return_detail}"
+
+
+def _verify_with_auth_service(token):
+    """
+    auth-service에 토큰 검증을 요청합니다.
+    (user_id, None) 또는 검증 거부 시 (None, 거부 사유)를 반환하고,
+    연결 실패는 예외로 올립니다.
+    """
+    try:
+        logger.debug('🛠 letter-service가 auth-service에 토큰 검증 요청')  # 디버깅 로그
 
         # Authorization 헤더 대신 JSON body로 토큰 전달
-        response = requests.post(
+        response = timed_call(
+            'auth', 'verify', _session.post,
             f"{AUTH_SERVICE_URL}/internal/verify/",
-            json={"token": token}
+            json={"token": token},
+            timeout=AUTH_SERVICE_TIMEOUT,
+        )
+        return _parse_verify_response(response)
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Auth service connection failed: {str(e)}")
+
+
+async def _averify_with_auth_service(token):
+    """_verify_with_auth_service의 비동기 버전 (공유 AsyncClient 사용)"""
+    try:
+        logger.debug('🛠 letter-service가 auth-service에 토큰 검증 요청 (async)')  # 디버깅 로그
+        response = await atimed_call(
+            'auth', 'verify', get_async_client().post,
+            f"{AUTH_SERVICE_URL}/internal/verify/",
+            json={"token": token},
+            timeout=AUTH_SERVICE_TIMEOUT,
+        )
+        return _parse_verify_response(response)
+    except httpx.HTTPError as e:
+        raise Exception(f"Auth service connection failed: {str(e)}")
+
+
+class CannotVerifyLocally(Exception):
+    """로컬 키로 판단할 수 없는 토큰 (auth-service 검증이 필요함)"""
+
+
+_local_keys = None
+
+
+def _load_local_keys():
+    """설정된 공유 비밀키 / 공개키 / JWKS 파일을 한 번만 읽어 둡니다."""
+    global _local_keys
+    if _local_keys is None:
+        keys = {'secret': JWT_SECRET, 'public_key': None, 'jwks': {}}
+        if JWT_PUBLIC_KEY_FILE:
+            with open(JWT_PUBLIC_KEY_FILE, 'r') as f:
+                keys['public_key'] = f.read()
+        if JWT_JWKS_FILE:
+            with open(JWT_JWKS_FILE, 'r') as f:
+                jwk_set = jwt.PyJWKSet.from_dict(json.load(f))
+            keys['jwks'] = {jwk.key_id: jwk.key for jwk in jwk_set.keys}
+        _local_keys = keys
+    return _local_keys
+
+
+def _local_verification_key(header):
+    alg = header.get('alg')
+    if alg not in JWT_ALGORITHMS:
+        raise CannotVerifyLocally(f"unsupported algorithm: {alg}")
+    keys = _load_local_keys()
+    kid = header.get('kid')
+    if alg.startswith('HS'):
+        if keys['secret']:
+            return keys['secret']
+    elif kid and kid in keys['jwks']:
+        return keys['jwks'][kid]
+    elif not kid and keys['public_key']:
+        return keys['public_key']
+    elif not kid and len(keys['jwks']) == 1:
+        return next(iter(keys['jwks'].values()))
+    raise CannotVerifyLocally(f"no local key for alg={alg}, kid={kid}")
+
+
+def verify_access_token_locally(token):
+    """
+    auth-service를 호출하지 않고 JWT의 서명, 만료(exp), audience를 직접 검증해 user_id를 반환합니다.
+    로컬 키로 판단할 수 없는 토큰이면 CannotVerifyLocally를, 검증 실패 시 Exception을 올립니다.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError as e:
+        raise CannotVerifyLocally(f"not a JWT: {e}")
+    key = _local_verification_key(header)
+
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[header['alg']],
+            audience=JWT_AUDIENCE,
+            issuer=JWT_ISSUER,
+            leeway=JWT_LEEWAY,
+            options={'require': ['exp'], 'verify_aud': bool(JWT_AUDIENCE)},
         )
+    except jwt.InvalidTokenError as e:
+        raise Exception(f"Token verification failed: {e}")
+
+    # simplejwt 토큰이면 access 토큰만 허용
+    if claims.get('token_type', 'access') != 'access':
+        raise Exception("Token verification failed: not an access token")
+    user_id = claims.get(JWT_USER_ID_CLAIM)
+    if user_id is None:
+        raise CannotVerifyLocally(f"claim '{JWT_USER_ID_CLAIM}' missing")
+    return user_id
 
-        if response.status_code == 200:
-            user_id = response.json()['user_id']
-            print("✅ auth-service로부터 받은 user_id:", user_id)
+
+_NEEDS_REMOTE = object()
+
+
+def _verify_without_remote(token):
+    """
+    로컬 JWT 검증이나 캐시만으로 결론이 나면 user_id를 반환하고(거부면 예외),
+    auth-service 호출이 필요하면 _NEEDS_REMOTE를 반환합니다.
+    """
+    if AUTH_VERIFY_MODE in ('local', 'local_fallback'):
+        try:
+            return verify_access_token_locally(token)
+        except CannotVerifyLocally as e:
+            if AUTH_VERIFY_MODE == 'local':
+                raise Exception(f"Token verification failed: {e}")
+            # 로컬에서 판단할 수 없는 토큰만 auth-service로 넘김
+
+    if TOKEN_CACHE_ENABLED:
+        cached = token_cache.get(_cache_key(token))
+        if cached is not None:
+            user_id, error = cached
+            if error:
+                raise Exception(error)  # 최근에 거부된 토큰 (negative cache)
             return user_id
+    return _NEEDS_REMOTE
+
+
+def _remember_remote_result(token, user_id, error):
+    if TOKEN_CACHE_ENABLED:
+        if error:
+            # 거부된 토큰은 짧게 캐시 (연결 실패는 캐시하지 않음)
+            token_cache.set(_cache_key(token), (None, error), ttl=TOKEN_CACHE_NEGATIVE_TTL)
         else:
-            try:
-                return_detail = response.json().get('detail', response.text)
-            except Exception:
-                return_detail = response.text
-            raise Exception(f"Token verification failed: {return_detail}")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Auth service connection failed: {str(e)}")
+            token_cache.set(_cache_key(token), (user_id, None), ttl=_positive_ttl(token))
+    if error:
+        raise Exception(error)
+    return user_id
+
+
+def verify_access_token(token):
+    user_id = _verify_without_remote(token)
+    if user_id is not _NEEDS_REMOTE:
+        return user_id
+    return _remember_remote_result(token, *_verify_with_auth_service(token))
+
+
+async def averify_access_token(token):
+    """verify_access_token의 비동기 버전: auth-service 호출 중에도 이벤트 루프를 막지 않습니다."""
+    user_id = _verify_without_remote(token)
+    if user_id is not _NEEDS_REMOTE:
+        return user_id
+    return _remember_remote_result(token, *await _averify_with_auth_service(token))
@@ -0,0 +1,126 @@
+# letters/blob_deletions.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+from .models import Letters, PendingBlobDeletion
+from .storage_client import delete_image_from_storage, list_images_in_storage
+
+RETRY_BASE_DELAY = 30  # 첫 재시도까지 대기(초), 실패할 때마다 두 배
+RETRY_MAX_DELAY = 6 * 60 * 60
+CLAIM_TIMEOUT = getattr(settings, 'BLOB_DELETION_CLAIM_TIMEOUT', 300) # 처리 중으로 가져간 행을 다른 워커가 건너뛰는 시간(초)
+
+
+def enqueue_blob_deletions(blob_names):
+    """
+    스토리지 이미지 삭제를 대기 테이블에 기록합니다.
+    편지 삭제와 같은 트랜잭션 안에서 호출해야 삭제가 취소되면 함께 취소됩니다.
+    """
+    rows = [PendingBlobDeletion(blob_name=name) for name in blob_names if name]
+    PendingBlobDeletion.objects.bulk_create(rows)
+    return len(rows)
+
+
+def deleted_blob_names(rows):
+    """ delete_user_letters가 반환한(DELETE ... RETURNING) 행들이 참조하던 blob 이름 목록 """
+    return [name for row in rows for name in (row['image_url'], row['thumbnail_url'], row['pending_image_blob']) if name]
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * (2 ** (attempts - 1)), RETRY_MAX_DELAY))
+
+
+def _claim_batch(batch_size):
+    # 재시도 시각이 된 행을 잠가(SKIP LOCKED) 다음 시도 시각을 CLAIM_TIMEOUT 뒤로 미루고 바로 커밋
+    # -> 스토리지 삭제 요청을 보내는 동안 행 잠금을 잡고 있지 않고, 워커가 죽으면 CLAIM_TIMEOUT 뒤에 다시 처리됨
+    current = now()
+    with transaction.atomic():
+        rows = list(
+            PendingBlobDeletion.objects
+            .select_for_update(skip_locked=True)
+            .filter(next_attempt_at__lte=current)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        PendingBlobDeletion.objects.filter(id__in=[row.id for row in rows]).update(
+            next_attempt_at=current + timedelta(seconds=CLAIM_TIMEOUT)
+        )
+    return rows
+
+
+def drain_blob_deletions(batch_size=100, concurrency=8):
+    """
+    재시도 시각이 된 삭제 대기 행을 최대 batch_size개 가져와 스토리지에서 동시에 삭제합니다.
+    성공(또는 이미 없음)한 행은 지우고, 실패한 행은 지수 백오프로 다음 시도 시각을 미룹니다.
+    (처리한 행 수, 성공 수)를 반환합니다.
+    """
+    rows = _claim_batch(batch_size)
+    if not rows:
+        return 0, 0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(rows)))) as executor:
+        results = list(executor.map(lambda row: delete_image_from_storage(row.blob_name, missing_ok=True), rows))
+
+    done = [row.id for row, ok in zip(rows, results) if ok]
+    failed = [row for row, ok in zip(rows, results) if not ok]
+    current = now()
+    for row in failed:
+        row.attempts += 1
+        row.next_attempt_at = current + _retry_delay(row.attempts)
+        row.last_error = "storage delete failed"
+    with transaction.atomic():
+        PendingBlobDeletion.objects.filter(id__in=done).delete()
+        PendingBlobDeletion.objects.bulk_update(failed, ['attempts', 'next_attempt_at', 'last_error'])
+    return len(rows), len(done)
+
+
+def _referenced_blob_names():
+    # 편지와 삭제 대기열이 참조하는 blob 이름을 테이블당 한 번씩 훑어 모음
+    # (blob 이름 컬럼에는 인덱스가 없어서 페이지마다 __in 조회를 하면 페이지마다 전체 스캔이 됨)
+    referenced = set()
+    rows = (
+        Letters.objects
+        .filter(Q(image_url__isnull=False) | Q(thumbnail_url__isnull=False) | Q(pending_image_blob__isnull=False))
+        .values_list('image_url', 'thumbnail_url', 'pending_image_blob')
+    )
+    for names in rows.iterator(chunk_size=2000):
+        referenced.update(name for name in names if name)
+    referenced.update(PendingBlobDeletion.objects.values_list('blob_name', flat=True).iterator(chunk_size=2000))
+    return referenced
+
+
+def reconcile_orphan_blobs(grace=timedelta(hours=24), prefix=None, page_size=1000):
+    """
+    스토리지의 이미지 중 어떤 편지도 참조하지 않는 blob을 찾아 삭제 대기열에 넣습니다.
+    업로드 직후 아직 편지에 연결되지 않은 blob을 지우지 않도록 grace보다 오래된 것만 대상으로 합니다.
+    (검사한 blob 수, 대기열에 넣은 수)를 반환합니다.
+    """
+    cutoff = now() - grace
+    scanned = queued = 0
+    page = []
+    referenced = None
+
+    def flush(names):
+        nonlocal referenced
+        if referenced is None:  # 대상 blob이 하나라도 있을 때만 참조 목록을 만듦
+            referenced = _referenced_blob_names()
+        orphans = [name for name in names if name not in referenced]
+        referenced.update(orphans)
+        return enqueue_blob_deletions(orphans)
+
+    for blob in list_images_in_storage(prefix=prefix, page_size=page_size):
+        scanned += 1
+        updated = parse_datetime(blob['updated']) if blob.get('updated') else None
+        if updated is None or updated > cutoff:
+            continue
+        page.append(blob['name'])
+        if len(page) >= page_size:
+            queued += flush(page)
+            page = []
+    if page:
+        queued += flush(page)
+    return scanned, queued
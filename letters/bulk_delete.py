@@ -0,0 +1,44 @@
+# letters/bulk_delete.py
+from django.db import connection
+
+from .models import Letters
+
+ID_CHUNK_SIZE = 1000  # IN (...) 절 하나에 넣을 최대 id 수 (DB 파라미터 수 제한 대비)
+# 이미지 blob 이름(삭제 예약)과 감정 집계에서 뺄 값 (삭제 시점의 DB 값)
+RETURNING_COLUMNS = ('id', 'user_id', 'image_url', 'thumbnail_url', 'pending_image_blob',
+                     'mood', 'detailed_mood', 'open_date', 'created_at')
+
+
+def _delete_returning(where, params):
+    qn = connection.ops.quote_name
+    sql = (
+        f"DELETE FROM {qn(Letters._meta.db_table)} WHERE {' AND '.join(where)} "
+        f"RETURNING {', '.join(qn(column) for column in RETURNING_COLUMNS)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(RETURNING_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def delete_user_letters(user_id, ids=None, open_date_before=None):
+    """
+    user_id의 편지 중 조건(ids, open_date_before)에 맞는 것을 모델 인스턴스를 읽지 않고
+    DELETE ... RETURNING 문으로 삭제하고, 삭제된 행의 id, 이미지 blob 이름, 감정 / 날짜를 dict 목록으로 반환합니다.
+    ids가 많으면 ID_CHUNK_SIZE개씩 나누어 실행하므로 호출하는 쪽에서 트랜잭션으로 감싸야 합니다.
+    """
+    qn = connection.ops.quote_name
+    where = [f"{qn('user_id')} = %s"]
+    params = [user_id]
+    if open_date_before is not None:
+        where.append(f"{qn('open_date')} < %s")
+        params.append(open_date_before)
+
+    if ids is None:
+        return _delete_returning(where, params)
+
+    deleted = []
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        chunk = ids[start:start + ID_CHUNK_SIZE]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        deleted += _delete_returning(where + [f"{qn('id')} IN ({placeholders})"], params + list(chunk))
+    return deleted
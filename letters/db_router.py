@@ -0,0 +1,51 @@
+# letters/db_router.py
+# 읽기 전용 복제본(replica) 라우팅: read_from_replica() 블록 안의 조회만 replica로 보내고,
+# 쓰기와 그 밖의 모든 조회는 primary(default)로 보냅니다.
+# 사용자가 최근에 편지를 변경했다면(UserLetterVersion.updated_at) 복제 지연 동안은 primary에서 읽습니다.
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.timezone import now
+
+REPLICA_DB_ALIAS = getattr(settings, 'LETTER_REPLICA_DB_ALIAS', 'replica')
+REPLICA_STICKY_SECONDS = getattr(settings, 'LETTER_REPLICA_STICKY_SECONDS', 5)
+
+_use_replica = ContextVar('letters_use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica(last_write_at=None):
+    """
+    블록 안의 조회를 replica로 보냅니다. last_write_at(사용자의 마지막 변경 시각)이
+    REPLICA_STICKY_SECONDS 이내이면 방금 쓴 내용이 보이도록 primary에서 읽습니다.
+    (contextvar라 스레드/비동기 작업(sync_to_async)별로 분리됨)
+    """
+    sticky = last_write_at is not None and now() - last_write_at < timedelta(seconds=REPLICA_STICKY_SECONDS)
+    token = _use_replica.set(not sticky and replica_configured())
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return REPLICA_DB_ALIAS
+        return None  # Django 기본 규칙 (인스턴스 힌트, 없으면 default)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS  # replica에서 읽은 인스턴스라도 쓰기는 항상 primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replica는 primary의 복제본이므로 같은 DB로 취급
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS  # 스키마는 primary에만 적용 (replica는 복제로 따라옴)
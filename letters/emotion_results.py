@@ -0,0 +1,63 @@
+# letters/emotion_results.py
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+from .models import Letters, MOOD_CHOICES, DETAILED_MOOD_CHOICES
+from .mood_analytics import record_mood_changes
+from .versioning import bump_letter_versions
+
+VALID_MOODS = {value for value, _ in MOOD_CHOICES}
+VALID_DETAILED_MOODS = {value for value, _ in DETAILED_MOOD_CHOICES}
+RESULT_FIELDS = ['mood', 'detailed_mood', 'analyzed_at']
+
+
+def parse_emotion_result(message):
+    """
+    감정 분석 결과 메시지(dict)를 검증해 (letter_id, mood, detailed_mood, analyzed_at)로 변환합니다.
+    형식이 잘못된 메시지면 ValueError를 올립니다.
+    """
+    try:
+        letter_id = int(message['letter_id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"letter_id가 없거나 잘못되었습니다: {message!r}")
+
+    mood = message.get('mood')
+    if mood not in VALID_MOODS:
+        raise ValueError(f"알 수 없는 mood: {mood!r} (letter {letter_id})")
+    detailed_mood = message.get('detailed_mood') or None
+    if detailed_mood is not None and detailed_mood not in VALID_DETAILED_MOODS:
+        raise ValueError(f"알 수 없는 detailed_mood: {detailed_mood!r} (letter {letter_id})")
+
+    analyzed_at = message.get('analyzed_at')
+    analyzed_at = parse_datetime(analyzed_at) if isinstance(analyzed_at, str) else None
+    return letter_id, mood, detailed_mood, analyzed_at or now()
+
+
+def apply_emotion_results(results, batch_size=500):
+    """
+    파싱된 결과 목록을 편지에 반영합니다. 편지마다 save()를 부르지 않고 bulk_update 한 번으로
+    mood, detailed_mood, analyzed_at만 갱신하므로 save()의 카테고리 재계산도 일어나지 않습니다.
+    감정 집계(MoodSummary)도 같은 트랜잭션에서 이전 감정은 빼고 새 감정은 더합니다.
+    같은 편지에 대한 결과가 여러 개면 마지막 결과를 사용하며, 반영한 편지 수를 반환합니다.
+    """
+    latest = {}
+    for letter_id, mood, detailed_mood, analyzed_at in results:
+        latest[letter_id] = (mood, detailed_mood, analyzed_at)
+    if not latest:
+        return 0
+
+    with transaction.atomic():
+        # 이전 감정을 집계에서 빼야 하므로 동시에 같은 편지를 바꾸는 반영 / 삭제와 겹치지 않도록 행을 잠금 (id 순서)
+        letters = list(
+            Letters.objects.select_for_update().filter(id__in=latest.keys()).order_by('id')
+            .only('id', 'user_id', 'open_date', 'created_at', *RESULT_FIELDS)
+        )
+        before = [{'user_id': letter.user_id, 'open_date': letter.open_date, 'created_at': letter.created_at,
+                   'mood': letter.mood, 'detailed_mood': letter.detailed_mood} for letter in letters]
+        for letter in letters:
+            letter.mood, letter.detailed_mood, letter.analyzed_at = latest[letter.id]
+        Letters.objects.bulk_update(letters, RESULT_FIELDS, batch_size=batch_size)
+        record_mood_changes(before, letters)
+        bump_letter_versions(letter.user_id for letter in letters)
+    return len(letters)
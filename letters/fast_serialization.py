@@ -0,0 +1,66 @@
+# letters/fast_serialization.py
+# 편지 목록용 빠른 읽기 경로: 모델 인스턴스와 DRF 필드별 직렬화를 거치지 않고
+# values()로 읽은 행을 바로 LetterSerializer / LetterProjectionSerializer와 같은 모양의 dict로 바꿉니다.
+# (출력이 같은지는 letters/tests.py의 parity 테스트로 확인)
+from django.utils.timezone import get_current_timezone, is_aware, make_aware
+
+from .projections import SELECTABLE_FIELDS
+from .serializers import LIST_FIELDS
+
+# 출력 필드 -> values()로 읽을 컬럼 (category는 with_current_category()의 annotation, preview도 annotation)
+_SOURCE = {'category': 'current_category'}
+
+
+def _datetime(value, timezone):
+    # DRF DateTimeField(ISO 8601)와 같은 형식: 현재 타임존으로 바꾸고 +00:00은 Z로 표기
+    if not value:
+        return None
+    value = value.astimezone(timezone) if is_aware(value) else make_aware(value, timezone)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _date(value, timezone):
+    return value.isoformat() if value else None
+
+
+def _text(value, timezone):
+    return None if value is None else str(value)
+
+
+_CONVERTERS = {
+    'created_at': _datetime,
+    'open_date': _date,
+    'image_url': _text,
+}
+
+
+def output_fields(fields=None):
+    """ 직렬화 결과의 키 순서 (serializer와 같이 Meta.fields 순서를 따름) """
+    selected = LIST_FIELDS if fields is None else fields
+    return [name for name in SELECTABLE_FIELDS if name in selected]
+
+
+def letter_values(queryset, fields=None):
+    """
+    with_current_category()(와 preview가 필요하면 project_queryset())를 적용한 queryset을
+    필요한 컬럼만 읽는 values() queryset으로 바꿉니다. cursor 계산용 id, open_date는 항상 포함합니다.
+    """
+    columns = ['id', 'open_date']
+    for name in output_fields(fields):
+        column = _SOURCE.get(name, name)
+        if column not in columns:
+            columns.append(column)
+    return queryset.values(*columns)
+
+
+def serialize_letter_rows(rows, fields=None):
+    """ letter_values()로 읽은 행 목록을 serializer와 같은 모양의 dict 목록으로 변환합니다. """
+    timezone = get_current_timezone()  # 값마다 조회하면 느리므로 한 번만
+    plan = [(name, _SOURCE.get(name, name), _CONVERTERS.get(name)) for name in output_fields(fields)]
+    return [
+        {name: (convert(row[column], timezone) if convert else row[column]) for name, column, convert in plan}
+        for row in rows
+    ]
@@ -0,0 +1,201 @@
+# letters/image_processing.py
+# 업로드 이미지 정규화: 디코딩 -> 최대 크기 제한 -> EXIF 방향 적용 -> 메타데이터(EXIF/GPS, XMP, 코멘트) 제거 -> 재인코딩,
+# 그리고 목록에서 쓸 작은 썸네일 생성.
+# CPU를 많이 쓰는 작업이라 요청 스레드(GIL)에서 하지 않고 크기가 제한된 프로세스 풀에서 실행합니다.
+# 풀이 가득 차면 요청을 쌓아 두지 않고 바로 ImageProcessingBusy(503)로 돌려보냅니다.
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PROCESSING_ENABLED = getattr(settings, 'LETTER_IMAGE_PROCESSING_ENABLED', True) # False면 업로드 원본을 그대로 저장 (썸네일 없음)
+IMAGE_MAX_DIMENSION = getattr(settings, 'LETTER_IMAGE_MAX_DIMENSION', 2048) # 긴 변 최대 픽셀
+IMAGE_FORMAT = getattr(settings, 'LETTER_IMAGE_FORMAT', 'JPEG') # JPEG | WEBP | PNG
+IMAGE_QUALITY = getattr(settings, 'LETTER_IMAGE_QUALITY', 82)
+THUMBNAIL_SIZE = getattr(settings, 'LETTER_THUMBNAIL_SIZE', 320) # 썸네일 긴 변 픽셀
+THUMBNAIL_QUALITY = getattr(settings, 'LETTER_THUMBNAIL_QUALITY', 70)
+IMAGE_MAX_PIXELS = getattr(settings, 'LETTER_IMAGE_MAX_PIXELS', 50_000_000) # 이보다 큰 이미지는 디코딩하지 않음 (decompression bomb)
+IMAGE_WORKERS = getattr(settings, 'LETTER_IMAGE_WORKERS', 2) # 0이면 요청 스레드에서 직접 처리 (개발 / 테스트용)
+IMAGE_MAX_PENDING = getattr(settings, 'LETTER_IMAGE_MAX_PENDING', max(IMAGE_WORKERS, 1) * 4) # 풀에 동시에 넣을 수 있는 작업 수
+IMAGE_QUEUE_WAIT = getattr(settings, 'LETTER_IMAGE_QUEUE_WAIT', 0.5) # 풀 자리가 날 때까지 기다리는 최대 시간(초)
+IMAGE_TIMEOUT = getattr(settings, 'LETTER_IMAGE_TIMEOUT', 15) # 작업 하나의 최대 처리 시간(초)
+IMAGE_MAX_TASKS_PER_CHILD = getattr(settings, 'LETTER_IMAGE_MAX_TASKS_PER_CHILD', 500) # 메모리 단편화를 막기 위해 주기적으로 워커 교체
+
+_CONTENT_TYPES = {'JPEG': ('image/jpeg', 'jpg'), 'WEBP': ('image/webp', 'webp'), 'PNG': ('image/png', 'png')}
+
+
+class ImageProcessingError(Exception):
+    """ 이미지로 읽을 수 없거나 너무 큰 업로드 (400) """
+
+
+class ImageProcessingBusy(Exception):
+    """ 처리 대기열이 가득 찼거나 시간 안에 끝나지 않음 (503) """
+
+
+def _encode(image, image_format, quality, icc_profile):
+    # exif / xmp를 넘기지 않으므로 메타데이터는 남지 않음 (색 재현을 위한 ICC 프로필만 유지)
+    if image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        else:
+            image = image.convert('RGB')
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if image_format == 'JPEG':
+        options.update(quality=quality, progressive=True)  # progressive는 허프만 테이블도 최적화 (optimize 불필요)
+    elif image_format == 'WEBP':
+        options.update(quality=quality, method=4)
+    else:
+        options.update(optimize=True)
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def normalize_image(data, max_dimension=IMAGE_MAX_DIMENSION, image_format=IMAGE_FORMAT, quality=IMAGE_QUALITY,
+                    thumbnail_size=THUMBNAIL_SIZE, thumbnail_quality=THUMBNAIL_QUALITY, max_pixels=IMAGE_MAX_PIXELS):
+    """
+    이미지 바이트를 정규화하고 (본문 이미지 바이트, 썸네일 바이트, (가로, 세로))를 반환합니다.
+    프로세스 풀 워커에서 실행되므로 인자 / 반환값은 모두 pickle 가능한 값입니다.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:  # 여기까지는 헤더만 읽음
+            if source.width * source.height > max_pixels:
+                raise ImageProcessingError(f"이미지가 너무 큽니다: {source.width}x{source.height}")
+            # CMYK는 RGB로 바꾸므로 원본의 CMYK 프로필은 쓰지 않음
+            icc_profile = source.info.get('icc_profile') if source.mode != 'CMYK' else None
+            # 정사각형 상자로 줄이면 회전(EXIF 방향) 전후 모두 긴 변이 max_dimension 이하
+            # (JPEG은 thumbnail()이 draft 모드로 축소 디코딩하므로 원본 전체를 풀지 않음)
+            source.thumbnail((max_dimension, max_dimension), Image.Resampling.BICUBIC)
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except Image.DecompressionBombError:
+        raise ImageProcessingError("이미지가 너무 큽니다.") from None
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        raise ImageProcessingError("이미지를 읽을 수 없습니다. (JPEG, PNG, GIF, WEBP 지원)") from None
+
+    normalized = _encode(image, image_format, quality, icc_profile)
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
+    return normalized, _encode(thumbnail, image_format, thumbnail_quality, icc_profile), image.size
+
+
+class ProcessedImage:
+    """ 정규화된 본문 이미지와 썸네일 (storage_client 업로드 함수에 그대로 넘길 수 있는 파일 객체 제공) """
+
+    def __init__(self, original_name, original_size, image, thumbnail, dimensions, image_format=IMAGE_FORMAT):
+        self.content_type, extension = _CONTENT_TYPES[image_format]
+        stem = os.path.splitext(os.path.basename(original_name or 'image'))[0] or 'image'
+        self.name = f"{stem}.{extension}"
+        self.thumbnail_name = f"{stem}_thumb.{extension}"
+        self.original_size = original_size
+        self.image = image
+        self.thumbnail = thumbnail
+        self.dimensions = dimensions
+
+    def image_file(self):
+        return SimpleUploadedFile(self.name, self.image, self.content_type)
+
+    def thumbnail_file(self):
+        return SimpleUploadedFile(self.thumbnail_name, self.thumbnail, self.content_type)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(IMAGE_MAX_PENDING)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # 요청 스레드가 여럿인 프로세스에서 fork하지 않도록 spawn (워커는 한 번 뜨면 재사용)
+                _executor = ProcessPoolExecutor(
+                    max_workers=IMAGE_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    max_tasks_per_child=IMAGE_MAX_TASKS_PER_CHILD,
+                )
+    return _executor
+
+
+def _reset_executor(broken):
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(data):
+    """ 풀에 자리가 나면 작업을 넣고 Future를 반환합니다. IMAGE_QUEUE_WAIT 안에 자리가 없으면 ImageProcessingBusy. """
+    if not _slots.acquire(timeout=IMAGE_QUEUE_WAIT):
+        raise ImageProcessingBusy("이미지 처리 대기열이 가득 찼습니다.")
+    executor = _get_executor()
+    try:
+        future = executor.submit(normalize_image, data)
+    except BrokenProcessPool:
+        _slots.release()
+        _reset_executor(executor)
+        raise ImageProcessingBusy("이미지 처리 워커를 다시 시작하는 중입니다.") from None
+    future.add_done_callback(lambda _: _slots.release())
+    return future, executor
+
+
+def _result(uploaded_file, data, outcome):
+    image, thumbnail, dimensions = outcome
+    processed = ProcessedImage(getattr(uploaded_file, 'name', None), len(data), image, thumbnail, dimensions)
+    logger.debug('🖼️ 이미지 정규화: %s bytes -> %s bytes (썸네일 %s bytes, %sx%s)',
+                 len(data), len(image), len(thumbnail), *dimensions)
+    return processed
+
+
+def process_uploaded_image(uploaded_file):
+    """
+    업로드된 파일을 프로세스 풀에서 정규화하고 ProcessedImage를 반환합니다.
+    요청 스레드는 결과를 기다리기만 하며(GIL 해제), 잘못된 이미지는 ImageProcessingError,
+    과부하 / 시간 초과는 ImageProcessingBusy를 올립니다.
+    """
+    data = uploaded_file.read()
+    if IMAGE_WORKERS <= 0:
+        return _result(uploaded_file, data, normalize_image(data))
+    future, executor = _submit(data)
+    try:
+        return _result(uploaded_file, data, future.result(timeout=IMAGE_TIMEOUT))
+    except FutureTimeoutError:
+        future.cancel()
+        raise ImageProcessingBusy("이미지 처리 시간이 초과되었습니다.") from None
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        raise ImageProcessingBusy("이미지 처리 워커가 비정상 종료되었습니다.") from None
+
+
+async def aprocess_uploaded_image(uploaded_file):
+    """ process_uploaded_image의 비동기 버전: 결과를 기다리는 동안 이벤트 루프를 막지 않습니다. """
+    data = uploaded_file.read()
+    if IMAGE_WORKERS <= 0:
+        return _result(uploaded_file, data, normalize_image(data))
+    # 자리 확보(최대 IMAGE_QUEUE_WAIT초)도 이벤트 루프 밖에서
+    future, executor = await asyncio.to_thread(_submit, data)
+    try:
+        outcome = await asyncio.wait_for(asyncio.wrap_future(future), timeout=IMAGE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ImageProcessingBusy("이미지 처리 시간이 초과되었습니다.") from None
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        raise ImageProcessingBusy("이미지 처리 워커가 비정상 종료되었습니다.") from None
+    return _result(uploaded_file, data, outcome)
@@ -0,0 +1,36 @@
+# letters/internal_access.py
+# 운영용 내부 엔드포인트(캐시 통계, /metrics 등) 접근 제한.
+# 사용자 토큰이 아니라 호출한 곳으로 판단합니다: 내부 네트워크(REMOTE_ADDR)에서 왔거나
+# X-Internal-Token 헤더가 설정된 내부 토큰과 같을 때만 허용합니다.
+import hmac
+from functools import wraps
+from ipaddress import ip_address, ip_network
+
+from django.conf import settings
+from django.http import JsonResponse
+
+# 기본은 같은 호스트(loopback)만 허용. 프록시 / 쿠버네티스 환경에서는 스크레이퍼가 있는 대역을 설정
+INTERNAL_NETWORKS = [ip_network(network) for network in getattr(settings, 'LETTER_INTERNAL_NETWORKS', ['127.0.0.0/8', '::1/128'])]
+INTERNAL_API_TOKEN = getattr(settings, 'LETTER_INTERNAL_API_TOKEN', None)
+INTERNAL_TOKEN_HEADER = 'X-Internal-Token'
+
+
+def is_internal_request(request):
+    token = request.headers.get(INTERNAL_TOKEN_HEADER)
+    if INTERNAL_API_TOKEN and token and hmac.compare_digest(token.encode('utf-8'), INTERNAL_API_TOKEN.encode('utf-8')):
+        return True
+    try:
+        address = ip_address(request.META.get('REMOTE_ADDR') or '')
+    except ValueError:
+        return False
+    return any(address in network for network in INTERNAL_NETWORKS)
+
+
+def internal_only(view):
+    """ 내부에서 온 요청이 아니면 403을 반환하는 뷰 데코레이터 """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_internal_request(request):
+            return JsonResponse({"detail": "내부 요청만 허용됩니다."}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapper
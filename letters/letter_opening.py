@@ -0,0 +1,105 @@
+# letters/letter_opening.py
+# 개봉일이 된 편지 처리 (open_todays_letters 명령)
+# (open_date, id) 인덱스로 대상 편지 id를 스트리밍하면서, 묶음마다 한 트랜잭션에서
+# 저장된 category와 발행 표시(opened_event_at)를 UPDATE ... RETURNING으로 바꾸고 "letter opened" 이벤트를 RabbitMQ로 발행합니다.
+# - 대상은 category가 아니라 opened_event_at IS NULL로 고릅니다. 오늘 날짜로 작성된 편지는 저장 시점에 이미 category가
+#   'today'이고, recategorize_letters도 category를 바꾸므로 category 차이로 고르면 이벤트가 빠집니다.
+# - 재실행 가능: 이미 발행 표시된 편지는 다시 처리하지 않음 (발행 실패 시 해당 묶음은 롤백되어 다음 실행에서 처리)
+#   하루 중 다시 실행하면 그 사이 오늘 날짜로 작성된 편지도 처리합니다.
+# - 여러 워커: id 구간(샤드)을 나눠 맡고, 구간이 겹쳐도 UPDATE 조건 때문에 한 워커만 같은 편지를 처리
+# 발행 후 커밋이 실패하면 같은 이벤트가 다시 발행될 수 있으므로(at-least-once) 구독자는 letter_id로 중복을 거릅니다.
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils.timezone import now
+
+from .message_producers import build_letter_opened_message, publish_letter_opened_events
+from .models import Letters, category_for_date
+
+ID_CHUNK_SIZE = 1000  # UPDATE 한 번의 IN (...)에 넣을 최대 id 수 (DB 파라미터 수 제한 대비)
+
+
+def shard_bounds(open_date, shard=0, shards=1, min_id=None, max_id=None):
+    """
+    open_date 편지의 id 범위를 shards개로 나눈 shard번째 구간 (시작, 끝)을 반환합니다. (끝은 미포함, None은 열린 끝)
+    첫 구간은 아래로, 마지막 구간은 위로 열려 있어 범위를 계산한 뒤 생긴 편지도 빠지지 않습니다.
+    워커마다 시작 시점이 다르면 경계가 어긋날 수 있으므로 min_id / max_id를 같은 값으로 고정할 수 있습니다.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard는 0 이상 {shards} 미만이어야 합니다: {shard}")
+    if min_id is None or max_id is None:
+        bounds = Letters.objects.filter(open_date=open_date).aggregate(min_id=Min('id'), max_id=Max('id'))
+        min_id = bounds['min_id'] if min_id is None else min_id
+        max_id = bounds['max_id'] if max_id is None else max_id
+    if min_id is None:
+        return None, None
+    span = (max_id - min_id) // shards + 1
+    start = min_id + shard * span if shard > 0 else None
+    end = min_id + (shard + 1) * span if shard < shards - 1 else None
+    return start, end
+
+
+def _open_batch(ids, open_date, category):
+    """ ids 중 아직 이벤트가 발행되지 않은 편지만 바꾸고 (id, user_id) 목록을 반환합니다. """
+    qn = connection.ops.quote_name
+    opened_at = now()
+    opened = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            chunk = ids[start:start + ID_CHUNK_SIZE]
+            cursor.execute(
+                f"UPDATE {qn(Letters._meta.db_table)} SET {qn('category')} = %s, {qn('opened_event_at')} = %s "
+                f"WHERE {qn('id')} IN ({', '.join(['%s'] * len(chunk))}) "
+                f"AND {qn('open_date')} = %s AND {qn('opened_event_at')} IS NULL "
+                f"RETURNING {qn('id')}, {qn('user_id')}",
+                [category, opened_at, *chunk, open_date],
+            )
+            opened += cursor.fetchall()
+    return opened
+
+
+def _process_batch(ids, open_date, category, publish):
+    # 발행 표시와 이벤트 발행을 한 트랜잭션으로: 발행이 실패하면 표시도 롤백되어 재실행 때 다시 처리
+    with transaction.atomic():
+        opened = _open_batch(ids, open_date, category)
+        if opened:
+            publish([build_letter_opened_message(letter_id, user_id, open_date) for letter_id, user_id in opened])
+    return len(opened)
+
+
+def open_letters(open_date=None, shard=0, shards=1, min_id=None, max_id=None, chunk_size=2000, batch_size=1000,
+                 publish=publish_letter_opened_events, progress=None):
+    """
+    open_date(기본 오늘) 편지 중 이 샤드의 id 구간에 있고 아직 처리되지 않은 편지를 처리합니다.
+    id는 iterator(chunk_size)로 chunk_size개씩만 읽어오므로 대상이 많아도 메모리 사용량이 일정합니다.
+    progress(scanned, opened)를 주면 묶음마다 호출합니다. {'scanned', 'opened', 'start', 'end'}를 반환합니다.
+    개봉일이 아직 오지 않은 날짜는 처리할 수 없습니다. (미리 발행 표시되면 그날 이벤트가 나가지 않음)
+    """
+    today = now().date()
+    open_date = open_date or today
+    if open_date > today:
+        raise ValueError(f"개봉일이 아직 오지 않았습니다: {open_date}")
+    category = category_for_date(open_date, today)
+    start, end = shard_bounds(open_date, shard, shards, min_id, max_id)
+
+    queryset = Letters.objects.filter(open_date=open_date, opened_event_at__isnull=True)
+    if start is not None:
+        queryset = queryset.filter(id__gte=start)
+    if end is not None:
+        queryset = queryset.filter(id__lt=end)
+
+    scanned = opened = 0
+    batch = []
+    for letter_id in queryset.order_by('id').values_list('id', flat=True).iterator(chunk_size=chunk_size):
+        batch.append(letter_id)
+        if len(batch) >= batch_size:
+            opened += _process_batch(batch, open_date, category, publish)
+            scanned += len(batch)
+            batch = []
+            if progress:
+                progress(scanned, opened)
+    if batch:
+        opened += _process_batch(batch, open_date, category, publish)
+        scanned += len(batch)
+        if progress:
+            progress(scanned, opened)
+    return {'scanned': scanned, 'opened': opened, 'start': start, 'end': end}
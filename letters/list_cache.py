@@ -0,0 +1,102 @@
+# letters/list_cache.py
+# 편지 목록 응답 캐시 (Django 캐시 프레임워크 사용, 기본 locmem / REDIS_URL 설정 시 Redis).
+# 키에 사용자 편지 버전(versioning.py)과 오늘 날짜가 들어가므로, 편지 작성/삭제/감정 분석 결과 반영이
+# 같은 트랜잭션에서 버전을 올리는 순간 이전 항목은 더 이상 조회되지 않고(write-through 무효화),
+# 날짜가 바뀌면 카테고리가 달라지므로 자정에 만료됩니다.
+import hashlib
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.timezone import now
+
+LIST_CACHE_ENABLED = getattr(settings, 'LETTER_LIST_CACHE_ENABLED', True)
+LIST_CACHE_ALIAS = getattr(settings, 'LETTER_LIST_CACHE_ALIAS', 'letter_list')
+LIST_CACHE_TTL = getattr(settings, 'LETTER_LIST_CACHE_TTL', 300)
+LIST_CACHE_MAX_ENTRY_BYTES = getattr(settings, 'LETTER_LIST_CACHE_MAX_ENTRY_BYTES', 512 * 1024)
+LIST_CACHE_LOCK_TTL = 10  # 응답을 만드는 요청이 죽어도 잠금이 풀리는 시간(초)
+LIST_CACHE_LOCK_WAIT = getattr(settings, 'LETTER_LIST_CACHE_LOCK_WAIT', 0.5)  # 다른 요청이 만드는 응답을 기다리는 최대 시간(초)
+LIST_CACHE_POLL_INTERVAL = 0.01
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(('hits', 'misses', 'coalesced', 'stores', 'too_large', 'lock_timeouts'), 0)
+
+    def incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = (counters['hits'] / lookups) if lookups else 0.0
+        return counters
+
+
+stats = _Stats()
+
+
+def _cache():
+    return caches[LIST_CACHE_ALIAS]
+
+
+def list_cache_key(user_id, version, today, scope):
+    digest = hashlib.sha256(scope.encode('utf-8')).hexdigest()[:32]
+    return f"letters:list:{user_id}:{version}:{today.isoformat()}:{digest}"
+
+
+def _timeout(current):
+    # 자정을 넘겨 보관하지 않음 (다음 날에는 카테고리가 달라짐)
+    midnight = datetime.combine(current.date() + timedelta(days=1), dt_time.min, tzinfo=current.tzinfo)
+    return max(1, min(LIST_CACHE_TTL, int((midnight - current).total_seconds())))
+
+
+def cached_letter_list(user_id, version, scope, build):
+    """
+    캐시된 목록 응답(bytes)을 반환하고, 없으면 build()로 만들어 저장합니다.
+    같은 키를 동시에 놓친 요청은 cache.add 잠금을 잡은 한 요청만 build()를 호출하고,
+    나머지는 LIST_CACHE_LOCK_WAIT 동안 결과를 기다린 뒤 그래도 없으면 직접 만듭니다(저장은 하지 않음).
+    """
+    if not LIST_CACHE_ENABLED:
+        return build()
+
+    current = now()
+    cache = _cache()
+    key = list_cache_key(user_id, version, current.date(), scope)
+    content = cache.get(key)
+    if content is not None:
+        stats.incr('hits')
+        return content
+    stats.incr('misses')
+
+    lock_key = f"{key}:lock"
+    if not cache.add(lock_key, 1, timeout=LIST_CACHE_LOCK_TTL):
+        deadline = time.monotonic() + LIST_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LIST_CACHE_POLL_INTERVAL)
+            content = cache.get(key)
+            if content is not None:
+                stats.incr('coalesced')
+                return content
+        stats.incr('lock_timeouts')
+        return build()
+
+    try:
+        content = build()
+        if len(content) > LIST_CACHE_MAX_ENTRY_BYTES:
+            stats.incr('too_large')
+        else:
+            cache.set(key, content, timeout=_timeout(current))
+            stats.incr('stores')
+        return content
+    finally:
+        cache.delete(lock_key)
+
+
+def cache_stats():
+    return {'backend': _cache().__class__.__name__, **stats.snapshot()}
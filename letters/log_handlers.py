@@ -0,0 +1,199 @@
+# letters/log_handlers.py
+# settings.LOGGING에서 사용하는 구조화(JSON) 로그 구성 요소.
+# - NonBlockingQueueHandler: 요청 스레드는 레코드를 큐에 넣기만 하고, 실제 stdout 쓰기는 리스너 스레드가 처리
+# - JsonFormatter: 한 줄에 JSON 레코드 하나 (토큰 / 서명된 URL은 마스킹)
+# - SamplingFilter: 대량으로 찍히는 DEBUG 레코드를 비율만큼만 통과
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+
+REDACTED = '[REDACTED]'
+
+# Bearer 토큰, JWT 형식 문자열, 서명된 URL의 쿼리 문자열(서명 / 자격 증명 포함)
+_REDACT_PATTERNS = (
+    (re.compile(r'(?i)\b(bearer\s+)[A-Za-z0-9\-._~+/]+=*'), r'\1' + REDACTED),
+    (re.compile(r'\beyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*'), REDACTED),
+    (re.compile(r'(https?://[^\s?"\']+)\?[^\s"\']*(?:signature|credential|token|sig=)[^\s"\']*', re.IGNORECASE),
+     r'\1?' + REDACTED),
+)
+# extra로 넘긴 값 중 키 이름만으로 마스킹하는 항목
+_SENSITIVE_KEYS = {'token', 'access_token', 'refresh_token', 'authorization', 'password', 'signed_url', 'upload_url'}
+
+# 버린 레코드 수를 /metrics로 내보내기 위해 살아 있는 NonBlockingQueueHandler를 추적
+_queue_handlers = weakref.WeakSet()
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘어온 구조화 필드로 출력)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def redact(text):
+    """ 문자열에서 토큰 / 서명된 URL 쿼리를 마스킹합니다. """
+    for pattern, replacement in _REDACT_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _redact_value(key, value):
+    if key.lower() in _SENSITIVE_KEYS:
+        return REDACTED
+    if isinstance(value, str):
+        return redact(value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """ {"ts", "level", "logger", "msg", ...extra, "exc"} 형식의 한 줄 JSON """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': redact(record.getMessage()),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = _redact_value(key, value)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = redact(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    max_level 이하(기본 DEBUG) 레코드를 rate 비율만큼만 통과시킵니다. 그보다 높은 레벨은 항상 통과.
+    rates로 로거 이름(접두어)별 비율을 따로 줄 수 있습니다. 예: {'letters.views': 0.01}
+    """
+
+    def __init__(self, rate=1.0, max_level='DEBUG', rates=None, name=''):
+        super().__init__(name)
+        self.rate = float(rate)
+        self.max_level = logging._checkLevel(max_level)
+        self.rates = sorted(((prefix, float(r)) for prefix, r in (rates or {}).items()),
+                            key=lambda item: len(item[0]), reverse=True)
+
+    def _rate_for(self, logger_name):
+        for prefix, rate in self.rates:
+            if logger_name == prefix or logger_name.startswith(prefix + '.'):
+                return rate
+        return self.rate
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 크기 제한이 있는 큐에 넣고 바로 반환합니다. 포매팅과 stdout 쓰기는 QueueListener 스레드가 담당합니다.
+    큐가 가득 차면 요청을 막지 않고 레코드를 버린 뒤 개수(dropped)를 세고, 큐에 다시 자리가 나면
+    drop_report_interval초에 한 번씩 그동안 버린 개수를 WARNING 레코드로 남깁니다. (/metrics에도 노출)
+    (gunicorn 등 fork 후에도 동작하도록 프로세스가 바뀌면 리스너를 다시 시작)
+    """
+    drop_report_interval = 10.0
+
+    def __init__(self, stream='ext://sys.stdout', queue_size=10000, formatter=None):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.queue_size = queue_size
+        if isinstance(stream, str):
+            stream = sys.stderr if stream == 'ext://sys.stderr' else sys.stdout
+        self.target = logging.StreamHandler(stream)
+        self.target.setFormatter(formatter or JsonFormatter())
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._last_drop_report = 0.0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+        _queue_handlers.add(self)
+
+    def setFormatter(self, fmt):
+        # dictConfig의 'formatter'는 실제로 쓰는 대상 핸들러에 적용
+        self.target.setFormatter(fmt)
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                if self._pid is not None:
+                    # fork 이전 프로세스의 큐(잠금 상태 포함)는 물려받지 않음
+                    self.queue = queue.Queue(maxsize=self.queue_size)
+                self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=False)
+                self._listener.start()
+                self._pid = os.getpid()
+                if not self._atexit_registered:
+                    atexit.register(self._stop_listener)
+                    self._atexit_registered = True
+
+    def prepare(self, record):
+        # 메시지 인자만 합쳐 두고 JSON 포매팅은 리스너 스레드에서 (예외 traceback은 여기서 문자열로)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.target.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped > self._reported_dropped:
+            self._report_dropped()
+
+    def _report_dropped(self):
+        current = time.monotonic()
+        if current - self._last_drop_report < self.drop_report_interval:
+            return
+        dropped = self.dropped
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f'⚠️ 로그 큐가 가득 차서 레코드 {dropped - self._reported_dropped}개를 버렸습니다. (누적 {dropped}개)', None, None,
+        )
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            return
+        self._reported_dropped = dropped
+        self._last_drop_report = current
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def _stop_listener(self):
+        # 남은 레코드를 모두 쓴 뒤 리스너 종료 (atexit / close 어느 쪽에서 먼저 불려도 한 번만)
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None  # 이후 기록이 오면 리스너를 다시 시작
+
+    def close(self):
+        self._stop_listener()
+        super().close()
+
+
+def dropped_records():
+    """ 이 프로세스의 NonBlockingQueueHandler들이 버린 레코드 수 합계 """
+    return sum(handler.dropped for handler in list(_queue_handlers))
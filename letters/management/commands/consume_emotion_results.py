@@ -0,0 +1,63 @@
+# letters/management/commands/consume_emotion_results.py
+import json
+import time
+
+import pika
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from letters.emotion_results import apply_emotion_results, parse_emotion_result
+from letters.message_producers import EMOTION_EXCHANGE, get_connection_params
+
+
+class Command(BaseCommand):
+    help = "감정 분석 결과 메시지를 큐에서 읽어 묶음(크기/시간 기준) 단위로 편지 감정 필드를 일괄 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='한 번에 반영할 최대 메시지 수')
+        parser.add_argument('--max-wait', type=float, default=0.5, help='묶음을 채우기 위해 기다리는 최대 시간(초)')
+        parser.add_argument('--queue', default=getattr(settings, 'EMOTION_RESULT_QUEUE', 'letter.emotion.result'))
+        parser.add_argument('--routing-key', default=getattr(settings, 'EMOTION_RESULT_ROUTING_KEY', 'result'))
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_wait = options['max_wait']
+
+        connection = pika.BlockingConnection(get_connection_params())
+        channel = connection.channel()
+        channel.exchange_declare(exchange=EMOTION_EXCHANGE, exchange_type='direct', durable=False)
+        channel.queue_declare(queue=options['queue'], durable=True)
+        channel.queue_bind(queue=options['queue'], exchange=EMOTION_EXCHANGE, routing_key=options['routing_key'])
+        # 커밋 전까지 ack하지 않으므로 묶음 두 개 분량까지 미리 받아 둠
+        channel.basic_qos(prefetch_count=batch_size * 2)
+        self.stdout.write(f"📥 감정 분석 결과 컨슈머 시작 (queue={options['queue']}, batch_size={batch_size})")
+
+        batch, last_tag, deadline = [], None, None
+        try:
+            for method, properties, body in channel.consume(options['queue'], inactivity_timeout=max_wait):
+                if method is not None:
+                    last_tag = method.delivery_tag
+                    try:
+                        batch.append(parse_emotion_result(json.loads(body)))
+                    except ValueError as e:
+                        # 잘못된 메시지는 다시 처리해도 실패하므로 묶음과 함께 ack 하여 버림
+                        self.stderr.write(f"⚠️ 감정 분석 결과 컨슈머: 잘못된 메시지 무시 - {e}")
+                    if deadline is None:
+                        deadline = time.monotonic() + max_wait
+
+                if last_tag is None:
+                    continue
+                if len(batch) >= batch_size or time.monotonic() >= deadline:
+                    applied = apply_emotion_results(batch)
+                    # DB 커밋이 끝난 뒤에만 지금까지 받은 메시지를 한 번에 ack
+                    channel.basic_ack(delivery_tag=last_tag, multiple=True)
+                    self.stdout.write(f"✅ 감정 분석 결과 {len(batch)}건 중 {applied}건 반영")
+                    batch, last_tag, deadline = [], None, None
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # ack하지 않은 메시지는 연결 종료 시 브로커가 다시 전달
+            if connection.is_open:
+                channel.cancel()
+                connection.close()
+        self.stdout.write("🏁 감정 분석 결과 컨슈머 종료")
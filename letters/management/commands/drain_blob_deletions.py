@@ -0,0 +1,38 @@
+# letters/management/commands/drain_blob_deletions.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from letters.blob_deletions import drain_blob_deletions, reconcile_orphan_blobs
+
+
+class Command(BaseCommand):
+    help = "삭제 대기 중인 스토리지 이미지를 묶음 단위로 동시에 삭제합니다. (실패 시 백오프 후 재시도)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='한 번에 가져와 처리할 최대 행 수')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시에 보낼 스토리지 삭제 요청 수')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='처리할 행이 없을 때 대기 시간(초)')
+        parser.add_argument('--once', action='store_true', help='지금 처리 가능한 행을 모두 처리한 뒤 종료')
+        parser.add_argument('--reconcile', action='store_true',
+                            help='스토리지 전체를 훑어 어떤 편지도 참조하지 않는 blob을 삭제 대기열에 넣고 종료')
+        parser.add_argument('--grace-hours', type=float, default=24.0,
+                            help='reconcile 시 이 시간보다 최근에 올라온 blob은 건너뜀')
+        parser.add_argument('--prefix', default=None, help='reconcile 대상 blob 이름 접두어')
+
+    def handle(self, *args, **options):
+        if options['reconcile']:
+            scanned, queued = reconcile_orphan_blobs(grace=timedelta(hours=options['grace_hours']), prefix=options['prefix'])
+            self.stdout.write(f"🔎 고아 blob 점검 완료: {scanned}개 검사, {queued}개 삭제 대기열 추가")
+            return
+
+        self.stdout.write(f"🗑️ 이미지 삭제 워커 시작 (batch_size={options['batch_size']}, concurrency={options['concurrency']})")
+        while True:
+            processed, deleted = drain_blob_deletions(batch_size=options['batch_size'], concurrency=options['concurrency'])
+            if processed:
+                self.stdout.write(f"✅ 이미지 삭제: {processed}건 중 {deleted}건 성공, {processed - deleted}건 재시도 예정")
+            if processed < options['batch_size']:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
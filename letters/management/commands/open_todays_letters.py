@@ -0,0 +1,50 @@
+# letters/management/commands/open_todays_letters.py
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters.letter_opening import open_letters
+
+
+class Command(BaseCommand):
+    help = ("개봉일이 오늘인 편지의 category를 바꾸고 'letter opened' 이벤트를 RabbitMQ 'letter.events'로 발행합니다. "
+            "매일 자정 이후 스케줄러로 실행하며, 중단돼도 다시 실행하면 남은 편지만 처리합니다. "
+            "하루 중 다시 실행하면 그 사이 오늘 날짜로 작성된 편지의 이벤트도 발행합니다. "
+            "여러 워커로 나눌 때는 같은 --shards 값과 서로 다른 --shard 값으로 실행합니다.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='처리할 개봉일 (YYYY-MM-DD, 기본: 오늘, 미래 날짜 불가)')
+        parser.add_argument('--shard', type=int, default=0, help='이 워커가 맡을 id 구간 번호 (0부터)')
+        parser.add_argument('--shards', type=int, default=1, help='전체 id 구간 수 (워커 수)')
+        parser.add_argument('--min-id', type=int, help='구간 계산에 쓸 최소 id (모든 워커가 같은 경계를 쓰도록 고정)')
+        parser.add_argument('--max-id', type=int, help='구간 계산에 쓸 최대 id')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='iterator가 한 번에 읽어올 id 수')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 트랜잭션에서 처리하고 발행할 편지 수')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['shard'] < options['shards']:
+            raise CommandError(f"--shard는 0 이상 --shards({options['shards']}) 미만이어야 합니다.")
+        started = time.perf_counter()
+        last_report = [started]
+
+        def progress(scanned, opened):
+            if time.perf_counter() - last_report[0] >= 10:
+                last_report[0] = time.perf_counter()
+                self.stdout.write(f"⏳ 편지 개봉 처리 중: {opened}건 처리 ({scanned}건 확인)")
+
+        try:
+            result = open_letters(
+                open_date=options['date'], shard=options['shard'], shards=options['shards'],
+                min_id=options['min_id'], max_id=options['max_id'],
+                chunk_size=options['chunk_size'], batch_size=options['batch_size'], progress=progress,
+            )
+        except Exception as e:
+            # 처리한 묶음은 커밋됐으므로 다시 실행하면 남은 편지부터 이어서 처리
+            raise CommandError(f"편지 개봉 처리 실패 (다시 실행하면 이어서 처리): {e}")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"✅ 편지 개봉 처리 완료: {result['opened']}건 처리, 이벤트 발행 "
+            f"(shard {options['shard']}/{options['shards']}, id {result['start']}~{result['end']}, {elapsed:.2f}초)"
+        )
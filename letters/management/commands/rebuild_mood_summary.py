@@ -0,0 +1,25 @@
+# letters/management/commands/rebuild_mood_summary.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from letters.mood_analytics import rebuild_mood_summary
+
+
+class Command(BaseCommand):
+    help = ("편지 테이블에서 감정 집계(MoodSummary)를 다시 만듭니다. "
+            "집계 테이블을 처음 배포할 때의 백필이나 불일치 복구에 사용합니다. "
+            "(평소에는 감정 분석 결과 반영 / 편지 삭제 때 증감으로 갱신)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-id', type=int, action='append', dest='user_ids',
+                            help='이 사용자만 다시 집계 (여러 번 지정 가능)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='한 번에 저장할 집계 행 수')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created = rebuild_mood_summary(user_ids=options['user_ids'], batch_size=options['batch_size'])
+        target = f"사용자 {', '.join(map(str, options['user_ids']))}" if options['user_ids'] else "전체 사용자"
+        self.stdout.write(
+            f"✅ 감정 집계 재구성 완료: {target}, 집계 행 {created}개 ({time.perf_counter() - started:.2f}초)"
+        )
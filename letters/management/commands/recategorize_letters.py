@@ -0,0 +1,43 @@
+# letters/management/commands/recategorize_letters.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.utils.timezone import now
+
+from letters.models import Letters, category_expression
+
+
+class Command(BaseCommand):
+    help = ("저장된 category 컬럼을 오늘 날짜 기준으로 다시 계산합니다. "
+            "id 구간별 UPDATE 문으로 처리하므로 행을 Python으로 읽어오지 않습니다. "
+            "(API 응답은 조회 시점에 계산하므로 컬럼을 직접 읽는 소비자를 위한 작업)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=50000, help='UPDATE 한 번이 다루는 id 구간 크기')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        today = now().date()
+        bounds = Letters.objects.aggregate(min_id=Min('id'), max_id=Max('id'))
+        if bounds['min_id'] is None:
+            self.stdout.write("ℹ️ 재분류할 편지가 없습니다.")
+            return
+
+        started = time.perf_counter()
+        updated = 0
+        expression = category_expression(today)
+        # 구간마다 별도 트랜잭션(autocommit)으로 실행해 잠금 시간을 짧게 유지
+        for start in range(bounds['min_id'], bounds['max_id'] + 1, chunk_size):
+            updated += (
+                Letters.objects
+                .filter(id__gte=start, id__lt=start + chunk_size)
+                .exclude(category=expression)
+                .update(category=expression)
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"✅ 편지 카테고리 재분류 완료: {updated}건 변경 "
+            f"(id {bounds['min_id']}~{bounds['max_id']}, {elapsed:.2f}초, 기준일 {today})"
+        )
@@ -0,0 +1,56 @@
+# letters/management/commands/relay_emotion_outbox.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+
+from letters.outbox import prune_sent, relay_outbox_batch
+
+
+class Command(BaseCommand):
+    help = "감정 분석 요청 아웃박스를 묶음 단위로 읽어 RabbitMQ 'emotion.direct'로 발행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 가져와 발행할 최대 행 수')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='아웃박스가 비었을 때 대기 시간(초)')
+        parser.add_argument('--max-backoff', type=float, default=30.0, help='발행 실패 시 최대 대기 시간(초)')
+        parser.add_argument('--once', action='store_true', help='쌓인 행을 모두 발행한 뒤 종료')
+        parser.add_argument('--prune', action='store_true', help='발행한 행을 표시하는 대신 바로 삭제')
+        parser.add_argument('--retention-hours', type=float, default=24.0,
+                            help='발행 완료로 표시된 행을 보관할 시간 (이후 주기적으로 삭제)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        backoff = options['poll_interval']
+        retention = timedelta(hours=options['retention_hours'])
+        last_pruned = 0.0
+        total = 0
+
+        self.stdout.write(f"📤 아웃박스 릴레이 시작 (batch_size={batch_size})")
+        while True:
+            try:
+                sent = relay_outbox_batch(batch_size=batch_size, prune=options['prune'])
+                backoff = options['poll_interval']
+            except Exception as e:
+                if options['once']:
+                    raise CommandError(f"아웃박스 발행 실패: {e}")
+                self.stderr.write(f"❌ 아웃박스 릴레이: 발행 실패, {backoff:.1f}초 후 재시도 - {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, options['max_backoff'])
+                continue
+
+            total += sent
+            if sent:
+                self.stdout.write(f"✅ 아웃박스 릴레이: {sent}건 발행 (누적 {total}건)")
+
+            if not options['prune'] and time.monotonic() - last_pruned > 60:
+                prune_sent(now() - retention)
+                last_pruned = time.monotonic()
+
+            if sent < batch_size:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+
+        self.stdout.write(f"🏁 아웃박스 릴레이 종료 (총 {total}건 발행)")
@@ -1,66 +1,186 @@
 # letters/message_producers.py
 
-import pika
 import json
+import logging
+import os
+import threading
+
+import pika
 from django.conf import settings # settings.py의 RabbitMQ 호스트 정보 등을 사용하기 위해
 
-def publish_emotion_analysis_request(letter_id: int, user_id: int, content: str) -> bool:
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
+
+EMOTION_EXCHANGE = 'emotion.direct'
+EMOTION_ANALYZE_ROUTING_KEY = 'analyze' # emotion_analysis 서비스의 컨슈머가 이 라우팅 키를 사용
+LETTER_EVENTS_EXCHANGE = 'letter.events'
+LETTER_OPENED_ROUTING_KEY = 'opened' # 개봉일이 된 편지 (알림 등 다른 서비스가 구독)
+
+# 연결이 끊겼을 때 재연결 후 재시도할 예외들
+_RECONNECT_ERRORS = (
+    pika.exceptions.AMQPConnectionError,
+    pika.exceptions.AMQPChannelError,
+    pika.exceptions.StreamLostError,
+)
+
+
+def get_connection_params():
+    # settings.py에 RABBITMQ_HOST가 정의되어 있다고 가정, 없으면 'localhost' 사용
+    credentials = pika.PlainCredentials(
+        getattr(settings, 'RABBITMQ_USER', 'guest'),
+        getattr(settings, 'RABBITMQ_PASSWORD', 'guest'),
+    )
+    return pika.ConnectionParameters(
+        host=getattr(settings, 'RABBITMQ_HOST', 'localhost'),
+        port=getattr(settings, 'RABBITMQ_PORT', 5672), # 기본 포트 5672
+        virtual_host=getattr(settings, 'RABBITMQ_VHOST', '/'),
+        credentials=credentials,
+        heartbeat=getattr(settings, 'RABBITMQ_HEARTBEAT', 600),
+        blocked_connection_timeout=getattr(settings, 'RABBITMQ_BLOCKED_CONNECTION_TIMEOUT', 30),
+    )
+
+
+class RabbitMQPublisher:
     """
-    편지 내용을 받아 감정 분석 요청을 RabbitMQ로 발행
+    워커 프로세스당 하나의 연결과 채널을 계속 유지하는 스레드 안전한 퍼블리셔.
+    익스체인지는 연결마다 한 번만 선언하고, 연결이 끊기면 다시 연결해 한 번 재시도합니다.
+
+    confirm=True이면 채널을 트랜잭션 모드(tx_select)로 열어, 묶음(batch)마다
+    한 번의 tx_commit 왕복으로 브로커가 메시지를 받았음을 확인합니다.
+    (BlockingChannel의 publisher confirm은 메시지마다 왕복을 기다리기 때문)
     """
-    try:
-        # settings.py에 RABBITMQ_HOST가 정의되어 있다고 가정, 없으면 'localhost' 사용
-        rabbitmq_host = getattr(settings, 'RABBITMQ_HOST', 'localhost')
-        rabbitmq_port = getattr(settings, 'RABBITMQ_PORT', 5672) # 기본 포트 5672
-        rabbitmq_vhost = getattr(settings, 'RABBITMQ_VHOST', '/')
-        rabbitmq_user = getattr(settings, 'RABBITMQ_USER', 'guest')
-        rabbitmq_password = getattr(settings, 'RABBITMQ_PASSWORD', 'guest')
-        
-        credentials = pika.PlainCredentials(rabbitmq_user, rabbitmq_password)
-        connection_params = pika.ConnectionParameters(
-            host=rabbitmq_host,
-            port=rabbitmq_port,
-            virtual_host=rabbitmq_vhost,
-            credentials=credentials
-        )
-        
-        print(f"📨 프로듀서: RabbitMQ 접속 시도 중... {rabbitmq_host}:{rabbitmq_port}") # 디버깅용
-        connection = pika.BlockingConnection(connection_params)
-        channel = connection.channel()
-        print("✨ 프로듀서: RabbitMQ 접속 및 채널 생성 완료.") # 디버깅용
 
-        # 익스체인지 선언
+    def __init__(self, connection_params=None, confirm=False, connection_factory=pika.BlockingConnection):
+        self._connection_params = connection_params
+        self._connection_factory = connection_factory
+        self.confirm = confirm
+        self._lock = threading.Lock()
+        self._connection = None
+        self._channel = None
+        self._declared_exchanges = set()
+        self._pid = os.getpid()
+
+    def _reset(self):
+        connection, self._connection, self._channel = self._connection, None, None
+        self._declared_exchanges = set()
+        if connection is not None and self._pid == os.getpid():
+            try:
+                if connection.is_open:
+                    connection.close()
+            except Exception:
+                pass
+        self._pid = os.getpid()
+
+    def _ensure_channel(self):
+        # fork된 자식 프로세스는 부모의 소켓을 공유하면 안 되므로 새로 연결
+        if self._pid != os.getpid():
+            self._connection = None
+            self._reset()
+        if self._connection is not None and self._connection.is_open and self._channel is not None and self._channel.is_open:
+            # 유휴 중 쌓인 heartbeat 등을 처리 (끊긴 연결이면 여기서 예외 발생)
+            self._connection.process_data_events(time_limit=0)
+            return self._channel
+
+        self._reset()
+        params = self._connection_params or get_connection_params()
+        logger.debug('📨 프로듀서: RabbitMQ 접속 시도 중... %s:%s', params.host, params.port) # 디버깅용
+        self._connection = self._connection_factory(params)
+        self._channel = self._connection.channel()
+        if self.confirm:
+            self._channel.tx_select()
+        logger.debug('✨ 프로듀서: RabbitMQ 접속 및 채널 생성 완료.') # 디버깅용
+        return self._channel
+
+    def _declare_exchange(self, channel, exchange):
+        if exchange in self._declared_exchanges:
+            return
         # durable=True는 RabbitMQ 서버가 재시작되어도 익스체인지가 유지되도록 합니다.
-        channel.exchange_declare(exchange='emotion.direct', exchange_type='direct', durable=False)
-        print("🔄 프로듀서: Exchange 'emotion.direct' (durable=False) 선언 완료.") # 디버깅용
-
-        message_body = {
-            "letter_id": letter_id,
-            "user_id": user_id,
-            "content": content
-            # 필요하다면 추가 정보 (예: user_id, 생성 시간 등)
-        }
-        
-        # 메시지 발행
-        channel.basic_publish(
-            exchange='emotion.direct',
-            routing_key='analyze', # emotion_analysis 서비스의 컨슈머가 이 라우팅 키를 사용
-            body=json.dumps(message_body),
-            properties=pika.BasicProperties(
-               # delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE, # 메시지 지속성 (큐도 durable이어야 효과)
-                content_type='application/json', # 메시지 내용이 JSON임을 명시
-            )
+        channel.exchange_declare(exchange=exchange, exchange_type='direct', durable=False)
+        self._declared_exchanges.add(exchange)
+
+    def _publish_all(self, exchange, routing_key, bodies):
+        channel = self._ensure_channel()
+        self._declare_exchange(channel, exchange)
+        properties = pika.BasicProperties(
+            # delivery_mode=pika.spec.PERSISTENT_DELIVERY_MODE, # 메시지 지속성 (큐도 durable이어야 효과)
+            content_type='application/json', # 메시지 내용이 JSON임을 명시
         )
-        
-        print(f"✅ 프로듀서: Letter ID {letter_id} 감정 분석 요청 발행 성공.")
-        connection.close()
-        return True
-
-    except pika.exceptions.AMQPConnectionError as e:
-        # RabbitMQ 연결 실패 시 오류 처리 (실제 운영에서는 로깅 및 알림/재시도 전략 필요)
-        print(f"❌ 프로듀서 ERROR: RabbitMQ 접속 실패 ({rabbitmq_host}) - {e}")
-        return False
-    except Exception as e:
-        # 기타 예외 처리
-        print(f"❌ 프로듀서 ERROR: Letter ID {letter_id} 메시지 발행 실패 - {e}")
-        return False
\ No newline at end of file
+        for body in bodies:
+            channel.basic_publish(exchange=exchange, routing_key=routing_key, body=body, properties=properties)
+        if self.confirm:
+            channel.tx_commit()
+
+    def publish_batch(self, exchange, routing_key, messages):
+        """
+        dict 메시지 목록을 JSON으로 직렬화해 한 번에 발행합니다.
+        연결 오류 시 한 번 재연결 후 재시도하며, 최종 실패하면 예외를 올립니다.
+        """
+        bodies = [json.dumps(message) for message in messages]
+        if not bodies:
+            return 0
+        with self._lock, timed('rabbitmq', 'publish'):
+            try:
+                self._publish_all(exchange, routing_key, bodies)
+            except _RECONNECT_ERRORS as e:
+                logger.warning('🔄 프로듀서: RabbitMQ 연결 끊김, 재연결 후 재시도 - %s', e)
+                self._reset()
+                try:
+                    self._publish_all(exchange, routing_key, bodies)
+                except Exception:
+                    self._reset()
+                    raise
+        return len(bodies)
+
+    def publish(self, exchange, routing_key, message):
+        return self.publish_batch(exchange, routing_key, [message]) == 1
+
+    def close(self):
+        with self._lock:
+            self._reset()
+
+
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher():
+    """현재 워커 프로세스의 공유 퍼블리셔를 반환합니다."""
+    global _publisher
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                _publisher = RabbitMQPublisher(confirm=getattr(settings, 'RABBITMQ_PUBLISH_CONFIRMS', False))
+    return _publisher
+
+
+def build_emotion_analysis_message(letter_id: int, user_id: int, content: str) -> dict:
+    return {
+        "letter_id": letter_id,
+        "user_id": user_id,
+        "content": content
+        # 필요하다면 추가 정보 (예: user_id, 생성 시간 등)
+    }
+
+
+def publish_emotion_analysis_requests(messages) -> int:
+    """
+    감정 분석 요청 메시지 묶음을 한 번에 발행하고 발행한 개수를 반환합니다. 실패 시 예외를 올립니다.
+    """
+    return get_publisher().publish_batch(EMOTION_EXCHANGE, EMOTION_ANALYZE_ROUTING_KEY, messages)
+
+
+def build_letter_opened_message(letter_id: int, user_id: int, open_date) -> dict:
+    return {
+        "event": "letter.opened",
+        "letter_id": letter_id,
+        "user_id": user_id,
+        "open_date": open_date.isoformat(),
+    }
+
+
+def publish_letter_opened_events(messages) -> int:
+    """
+    편지 개봉 이벤트 묶음을 한 번에 발행하고 발행한 개수를 반환합니다. 실패 시 예외를 올립니다.
+    """
+    return get_publisher().publish_batch(LETTER_EVENTS_EXCHANGE, LETTER_OPENED_ROUTING_KEY, messages)
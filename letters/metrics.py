@@ -0,0 +1,201 @@
+# letters/metrics.py
+# 요청 / 외부 의존성(auth-service, 스토리지, RabbitMQ, DB) 지연 측정.
+# - 요청마다 의존성별 소요 시간을 모아 Server-Timing 헤더로 내보내고 (RequestMetricsMiddleware)
+# - 워커 프로세스별 히스토그램 / 오류 카운터를 Prometheus 텍스트 형식(/metrics)으로 노출합니다.
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .log_handlers import dropped_records
+
+METRICS_ENABLED = getattr(settings, 'LETTER_METRICS_ENABLED', True)
+
+# 초 단위 히스토그램 구간 (Prometheus 기본값에 1ms 이하 구간 추가)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_format_labels(self.labelnames, labels)} {value}" for labels, value in items]
+        return lines
+
+
+class CallbackCounter:
+    """ 다른 곳에서 이미 세고 있는 값을 노출 시점에 func()로 읽는 카운터 """
+
+    def __init__(self, name, documentation, func):
+        self.name = name
+        self.documentation = documentation
+        self.func = func
+
+    def expose(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter", f"{self.name} {self.func()}"]
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [구간별 개수..., +Inf 개수, 합계]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += seconds
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'letter_http_request_duration_seconds', 'HTTP 요청 처리 시간', ('endpoint', 'method', 'status'))
+REQUEST_ERRORS = Counter(
+    'letter_http_request_errors_total', '5xx로 끝난 HTTP 요청 수', ('endpoint', 'method'))
+DEPENDENCY_DURATION = Histogram(
+    'letter_dependency_duration_seconds', '외부 의존성 호출 시간', ('dependency', 'operation'))
+DEPENDENCY_ERRORS = Counter(
+    'letter_dependency_errors_total', '예외 또는 5xx로 끝난 외부 의존성 호출 수', ('dependency', 'operation'))
+LOG_RECORDS_DROPPED = CallbackCounter(
+    'letter_log_records_dropped_total', '로그 큐가 가득 차서 버린 레코드 수', dropped_records)
+
+REGISTRY = [REQUEST_DURATION, REQUEST_ERRORS, DEPENDENCY_DURATION, DEPENDENCY_ERRORS, LOG_RECORDS_DROPPED]
+
+# 현재 요청의 의존성별 [누적 시간(초), 호출 수] (요청 밖에서는 None)
+_request_phases = ContextVar('letters_request_phases', default=None)
+
+
+def _record(dependency, operation, seconds, failed):
+    DEPENDENCY_DURATION.observe((dependency, operation), seconds)
+    if failed:
+        DEPENDENCY_ERRORS.inc((dependency, operation))
+    phases = _request_phases.get()
+    if phases is not None:
+        phase = phases.get(dependency)
+        if phase is None:
+            phases[dependency] = [seconds, 1]
+        else:
+            phase[0] += seconds
+            phase[1] += 1
+
+
+class timed:
+    """
+    with timed('storage', 'upload'): ... 블록의 소요 시간을 의존성 히스토그램과 현재 요청의 Server-Timing에 기록합니다.
+    블록에서 예외가 나거나 .failed = True로 표시하면 오류 카운터를 올립니다.
+    """
+    __slots__ = ('dependency', 'operation', 'failed', '_started')
+
+    def __init__(self, dependency, operation):
+        self.dependency = dependency
+        self.operation = operation
+        self.failed = False
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if METRICS_ENABLED:
+            _record(self.dependency, self.operation, time.perf_counter() - self._started, self.failed or exc_type is not None)
+        return False
+
+
+def timed_call(dependency, operation, func, *args, **kwargs):
+    """ func(*args, **kwargs)를 측정하며 호출하고 결과를 반환합니다. 응답의 status_code가 5xx이면 오류로 셉니다. """
+    with timed(dependency, operation) as t:
+        response = func(*args, **kwargs)
+        t.failed = getattr(response, 'status_code', 200) >= 500
+    return response
+
+
+async def atimed_call(dependency, operation, func, *args, **kwargs):
+    """ timed_call의 비동기 버전 (func는 코루틴 함수) """
+    with timed(dependency, operation) as t:
+        response = await func(*args, **kwargs)
+        t.failed = getattr(response, 'status_code', 200) >= 500
+    return response
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """ connection.execute_wrappers에 등록되는 ORM 쿼리 측정 훅 """
+    with timed('db', context['connection'].alias):
+        return execute(sql, params, many, context)
+
+
+def install_db_instrumentation(sender=None, connection=None, **kwargs):
+    """ connection_created 시그널 핸들러: 연결(스레드/별칭)마다 한 번만 쿼리 측정 훅을 등록 """
+    if METRICS_ENABLED and db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def start_request():
+    return _request_phases.set({}), time.perf_counter()
+
+
+def finish_request(state, endpoint, method, status):
+    """ 요청 측정을 마치고 Server-Timing 헤더 값을 반환합니다. """
+    token, started = state
+    total = time.perf_counter() - started
+    phases = _request_phases.get() or {}
+    _request_phases.reset(token)
+    REQUEST_DURATION.observe((endpoint, method, f"{status // 100}xx"), total)
+    if status >= 500:
+        REQUEST_ERRORS.inc((endpoint, method))
+    parts = [f'{name};dur={seconds * 1000:.2f};desc="{count} call{"s" if count != 1 else ""}"'
+             for name, (seconds, count) in phases.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ', '.join(parts)
+
+
+def expose_metrics():
+    """ Prometheus 텍스트 형식 (워커 프로세스별 값) """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.expose()
+    return '\n'.join(lines) + '\n'
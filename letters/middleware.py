@@ -0,0 +1,56 @@
+# letters/middleware.py
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .internal_access import is_internal_request
+from .metrics import METRICS_ENABLED, finish_request, start_request
+
+# 의존성별 소요 시간은 내부 구조를 드러내므로 기본은 끄고, 켜더라도 내부 요청에만 붙임
+SERVER_TIMING_ENABLED = getattr(settings, 'LETTER_SERVER_TIMING_ENABLED', False)
+
+
+def _endpoint(request):
+    # 라벨 수가 늘지 않도록 실제 경로 대신 URL 패턴(route)을 사용
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return '/' + match.route
+
+
+class RequestMetricsMiddleware:
+    """
+    요청 처리 시간을 엔드포인트별로 기록하고, 요청 중 호출한 의존성(auth / db / storage / rabbitmq)의
+    소요 시간을 Server-Timing 헤더로 붙입니다(LETTER_SERVER_TIMING_ENABLED일 때 내부 요청에만).
+    WSGI / ASGI 워커 모두에서 동작합니다.
+    MIDDLEWARE의 가장 앞에 두어야 total 값이 전체 처리 시간을 나타냅니다.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not METRICS_ENABLED:
+            return self.get_response(request)
+        state = start_request()
+        response = self.get_response(request)
+        return self._finish(state, request, response)
+
+    async def __acall__(self, request):
+        if not METRICS_ENABLED:
+            return await self.get_response(request)
+        state = start_request()
+        response = await self.get_response(request)
+        return self._finish(state, request, response)
+
+    def _finish(self, state, request, response):
+        server_timing = finish_request(state, _endpoint(request), request.method, response.status_code)
+        if SERVER_TIMING_ENABLED and is_internal_request(request):
+            response['Server-Timing'] = server_timing
+        return response
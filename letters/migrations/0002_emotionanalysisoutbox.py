@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmotionAnalysisOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('letter_id', models.IntegerField()),
+                ('user_id', models.IntegerField()),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['id'], name='letters_outbox_pending_idx')],
+            },
+        ),
+    ]
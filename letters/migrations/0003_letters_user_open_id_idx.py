@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0002_emotionanalysisoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='letters',
+            index=models.Index(fields=['user_id', 'open_date', 'id'], name='letters_user_open_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0003_letters_user_open_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letters',
+            name='pending_image_blob',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0004_letters_pending_image_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingBlobDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('blob_name', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_attempt_at'], name='letters_blobdel_next_idx')],
+            },
+        ),
+    ]
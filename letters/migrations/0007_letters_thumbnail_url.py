@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0006_userletterversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letters',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:43
+
+import django.contrib.postgres.search
+from django.db import migrations, transaction
+
+# letters.models.SEARCH_CONFIG와 같은 설정
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}content, '')), 'B')"
+)
+
+
+def create_search_trigger(apps, schema_editor):
+    """ search_vector를 유지하는 트리거, 기존 행 채우기, GIN 인덱스 (PostgreSQL에서만) """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"""
+        CREATE OR REPLACE FUNCTION letters_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    schema_editor.execute("""
+        CREATE TRIGGER letters_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, content ON letters_letters
+        FOR EACH ROW EXECUTE FUNCTION letters_search_vector_update()
+    """)
+    schema_editor.execute(f"UPDATE letters_letters SET search_vector = {SEARCH_VECTOR_SQL.format(row='')}")
+
+    # btree_gin이 있으면 user_id까지 하나의 GIN 인덱스로 (사용자 조건과 검색어 조건을 인덱스 하나에서 함께 처리)
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+            schema_editor.execute(
+                "CREATE INDEX letters_user_search_gin_idx ON letters_letters USING gin (user_id, search_vector)"
+            )
+    except Exception:
+        # 확장을 만들 권한이 없으면 search_vector만의 GIN 인덱스 (user_id는 인덱스 결과에서 거름)
+        schema_editor.execute(
+            "CREATE INDEX letters_search_gin_idx ON letters_letters USING gin (search_vector)"
+        )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS letters_user_search_gin_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS letters_search_gin_idx")
+    schema_editor.execute("DROP TRIGGER IF EXISTS letters_search_vector_trigger ON letters_letters")
+    schema_editor.execute("DROP FUNCTION IF EXISTS letters_search_vector_update()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0007_letters_thumbnail_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letters',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
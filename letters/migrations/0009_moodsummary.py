@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0008_letters_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MoodSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField()),
+                ('basis', models.CharField(max_length=20)),
+                ('period', models.CharField(max_length=10)),
+                ('bucket', models.DateField()),
+                ('kind', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=30)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user_id', 'basis', 'period', 'bucket', 'kind', 'value'), name='letters_moodsummary_key')],
+            },
+        ),
+    ]
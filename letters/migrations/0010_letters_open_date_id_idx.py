@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0009_moodsummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='letters',
+            index=models.Index(fields=['open_date', 'id'], name='letters_open_date_id_idx'),
+        ),
+    ]
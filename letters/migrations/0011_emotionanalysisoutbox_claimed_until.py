@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0010_letters_open_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emotionanalysisoutbox',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:27
+
+from django.db import migrations, models
+from django.utils.timezone import now
+
+
+def mark_past_letters_opened(apps, schema_editor):
+    """ 개봉일이 이미 지난 편지는 이벤트가 발행된 것으로 표시 (배포 후 다시 발행하지 않도록) """
+    Letters = apps.get_model('letters', 'Letters')
+    current = now()
+    Letters.objects.filter(open_date__lt=current.date()).update(opened_event_at=current)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0011_emotionanalysisoutbox_claimed_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='letters',
+            name='opened_event_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_past_letters_opened, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, CharField, Q, Value, When
 from django.utils.timezone import now
 from django.core.exceptions import ImproperlyConfigured
 
@@ -43,6 +45,43 @@ DETAILED_MOOD_CHOICES = [
 ]
 
 
+def category_for_date(open_date, today):
+    """ 개봉 일자와 오늘 날짜로 카테고리(past/today/future)를 계산 """
+    if open_date < today:
+        return 'past'  # 개봉일이 지났다면 과거
+    if open_date == today:
+        return 'today'  # 개봉일이 오늘이라면 오늘
+    return 'future'  # 개봉일이 아직 안 됐다면 미래
+
+
+def category_expression(today=None):
+    """ category_for_date와 같은 규칙을 DB에서 계산하는 SQL 식 (CASE WHEN) """
+    today = today or now().date()
+    return Case(
+        When(open_date__lt=today, then=Value('past')),
+        When(open_date=today, then=Value('today')),
+        default=Value('future'),
+        output_field=CharField(max_length=20),
+    )
+
+
+# 전문 검색 tsvector 설정: 'simple'은 형태소 분석 없이 공백 / 문장부호 기준으로 나눔 (한국어 사전 설정이 없으므로)
+# 마이그레이션 0008의 트리거와 같은 값이어야 합니다.
+SEARCH_CONFIG = 'simple'
+
+
+class LettersQuerySet(models.QuerySet):
+    def with_current_category(self, today=None):
+        """ 저장된 category 대신 조회 시점 기준 카테고리를 current_category로 함께 조회 """
+        return self.annotate(current_category=category_expression(today))
+
+
+class LettersManager(models.Manager.from_queryset(LettersQuerySet)):
+    def get_queryset(self):
+        # search_vector는 검색 조건에서만 쓰므로 일반 조회에서는 읽지 않음 (저장 시에는 트리거가 다시 계산)
+        return super().get_queryset().defer('search_vector')
+
+
 # Create your models here.
 class Letters(models.Model):
     user_id = models.IntegerField() #(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="letters")  # auth에서 커스텀해놓은 user 모델 사용
@@ -50,6 +89,8 @@ class Letters(models.Model):
     title = models.CharField(max_length=200)  # 편지 제목
     content = models.TextField()  # 편지 내용
     image_url = models.URLField(null=True, blank=True) # 이미지 url 저장(gcs 연동)
+    thumbnail_url = models.URLField(null=True, blank=True) # 목록용 썸네일 blob 이름 (서버에서 생성)
+    pending_image_blob = models.CharField(max_length=255, null=True, blank=True) # 직접 업로드용으로 발급했지만 아직 확정되지 않은 blob 이름
     created_at = models.DateTimeField(auto_now_add=True)  # 작성 시간
     open_date = models.DateField()  # 편지를 열 수 있는 날짜 (선택)
     category = models.CharField(max_length=20,
@@ -58,23 +99,108 @@ class Letters(models.Model):
     mood = models.CharField(max_length=30, choices=MOOD_CHOICES, null=True, blank=True)
     detailed_mood = models.CharField(max_length=30, choices=DETAILED_MOOD_CHOICES, blank=True, null=True)
     analyzed_at = models.DateTimeField(null=True, blank=True)
+    opened_event_at = models.DateTimeField(null=True, blank=True) # 'letter opened' 이벤트를 발행한 시각 (open_todays_letters)
+    search_vector = SearchVectorField(null=True, editable=False) # 제목(A) + 본문(B) 전문 검색용, PostgreSQL 트리거가 관리
     # mood = models.CharField(max_length=10, choices=MOOD_CHOICES, default='happy')
 
+    objects = LettersManager()
+
     def save(self, *args, **kwargs):
         """ 개봉 일자에 따라 자동으로 카테고리 설정 """
-        today = now().date()
-
-        if self.open_date < today:
-            self.category = 'past'  # 개봉일이 지났다면 과거
-        elif self.open_date == today:
-            self.category = 'today'  # 개봉일이 오늘이라면 오늘
-        else:
-            self.category = 'future'  # 개봉일이 아직 안 됐다면 미래
-
+        self.category = category_for_date(self.open_date, now().date())
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} - {self.category}"
     
     class Meta:
-        app_label = 'letters'
\ No newline at end of file
+        app_label = 'letters'
+        indexes = [
+            # 사용자별 편지 목록의 keyset 페이지네이션 (open_date, id) 순서용
+            models.Index(fields=['user_id', 'open_date', 'id'], name='letters_user_open_id_idx'),
+            # 개봉일이 된 편지를 id 구간(샤드)별로 찾는 배치 작업용 (open_todays_letters)
+            models.Index(fields=['open_date', 'id'], name='letters_open_date_id_idx'),
+        ]
+        # 검색용 (user_id, search_vector) GIN 인덱스는 PostgreSQL 전용이라 마이그레이션 0008에서 직접 생성
+
+
+class EmotionAnalysisOutbox(models.Model):
+    """ 감정 분석 요청 아웃박스: 편지와 같은 트랜잭션에 기록되고, 릴레이가 RabbitMQ로 발행 """
+    letter_id = models.IntegerField()
+    user_id = models.IntegerField()
+    payload = models.JSONField() # RabbitMQ로 발행할 메시지 본문
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True) # 발행 완료 시각 (미발행이면 NULL)
+    claimed_until = models.DateTimeField(null=True, blank=True) # 릴레이가 발행 중인 행 (이 시각까지 다른 릴레이는 건너뜀)
+
+    def __str__(self):
+        return f"outbox #{self.id} (letter {self.letter_id}) - {'sent' if self.sent_at else 'pending'}"
+
+    class Meta:
+        app_label = 'letters'
+        indexes = [
+            # 릴레이가 미발행 행만 빠르게 찾도록 하는 부분 인덱스
+            models.Index(fields=['id'], condition=Q(sent_at__isnull=True), name='letters_outbox_pending_idx'),
+        ]
+
+
+
+class PendingBlobDeletion(models.Model):
+    """ 삭제 대기 중인 스토리지 이미지: 편지 삭제와 같은 트랜잭션에 기록되고, 워커가 재시도하며 삭제 """
+    blob_name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    attempts = models.PositiveIntegerField(default=0) # 실패한 삭제 시도 횟수
+    next_attempt_at = models.DateTimeField(default=now) # 이 시각 이후에 다시 시도 (백오프)
+    last_error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"{self.blob_name} (attempts: {self.attempts})"
+
+    class Meta:
+        app_label = 'letters'
+        indexes = [
+            models.Index(fields=['next_attempt_at'], name='letters_blobdel_next_idx'),
+        ]
+
+
+class UserLetterVersion(models.Model):
+    """ 사용자별 편지 변경 버전: 편지가 바뀔 때마다 올라가며 목록/상세 API의 ETag 계산에 사용 """
+    user_id = models.IntegerField(unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=now) # 마지막 변경 시각 (Last-Modified)
+
+    def __str__(self):
+        return f"user {self.user_id} - v{self.version}"
+
+    class Meta:
+        app_label = 'letters'
+
+
+MOOD_SUMMARY_BASES = ('open_date', 'created_at')
+MOOD_SUMMARY_PERIODS = ('week', 'month')
+MOOD_SUMMARY_KINDS = ('mood', 'detailed_mood')
+
+
+class MoodSummary(models.Model):
+    """
+    사용자별 감정 집계: (기준 날짜, 주/월 구간)마다 mood별 / detailed_mood별 편지 수.
+    감정 분석 결과 반영 / 편지 삭제 때 증감으로 갱신되며, rebuild_mood_summary 명령으로 다시 만들 수 있습니다.
+    """
+    user_id = models.IntegerField()
+    basis = models.CharField(max_length=20) # 구간을 나눈 날짜 컬럼 (open_date | created_at)
+    period = models.CharField(max_length=10) # week(월요일 시작) | month
+    bucket = models.DateField() # 구간 시작일
+    kind = models.CharField(max_length=20) # mood | detailed_mood (조합별로 저장하면 구간당 행 수가 크게 늘어나므로 따로 셈)
+    value = models.CharField(max_length=30) # 감정 값
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"user {self.user_id} {self.basis}/{self.period} {self.bucket} {self.kind}={self.value}: {self.count}"
+
+    class Meta:
+        app_label = 'letters'
+        constraints = [
+            # 증감 upsert(ON CONFLICT)의 대상이자, 사용자별 구간 조회용 인덱스
+            models.UniqueConstraint(fields=['user_id', 'basis', 'period', 'bucket', 'kind', 'value'],
+                                    name='letters_moodsummary_key'),
+        ]
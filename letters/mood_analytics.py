@@ -0,0 +1,186 @@
+# letters/mood_analytics.py
+# 사용자별 감정 추이 집계 (MoodSummary)
+# 조회 때마다 편지 전체를 GROUP BY 하지 않도록, 감정 분석 결과 반영 / 편지 삭제와 같은 트랜잭션에서
+# 해당 편지가 속한 구간(open_date·created_at 기준 × 주·월)의 개수만 증감합니다.
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from itertools import product
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import MOOD_SUMMARY_BASES, MOOD_SUMMARY_KINDS, MOOD_SUMMARY_PERIODS, Letters, MoodSummary
+
+UPSERT_BATCH_SIZE = 500
+KEY_COLUMNS = ('user_id', 'basis', 'period', 'bucket', 'kind', 'value')
+
+
+class InvalidAnalyticsQuery(ValueError):
+    pass
+
+
+def bucket_start(value, period):
+    """ 날짜가 속한 구간의 시작일 (week: 월요일, month: 1일) """
+    if period == 'week':
+        return value - timedelta(days=value.weekday())
+    return value.replace(day=1)
+
+
+def _value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def _basis_date(row, basis):
+    value = _value(row, basis)
+    if basis == 'created_at':
+        # DELETE ... RETURNING 결과는 DB 값 그대로이므로 (SQLite는 문자열) 모델 필드로 변환
+        if not isinstance(value, datetime):
+            value = Letters._meta.get_field('created_at').to_python(value)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        # Trunc(..., tzinfo 없음)와 같은 기준: 현재 타임존의 날짜
+        return timezone.localtime(value).date()
+    if not isinstance(value, date):
+        value = Letters._meta.get_field('open_date').to_python(value)
+    return value
+
+
+def add_mood_deltas(deltas, rows, sign):
+    """
+    rows(편지 인스턴스 또는 dict)의 감정을 deltas(Counter)에 sign(+1 / -1)만큼 더합니다.
+    아직 분석되지 않은(mood 없음) 편지는 집계 대상이 아닙니다.
+    """
+    for row in rows:
+        mood = _value(row, 'mood')
+        if not mood:
+            continue
+        values = {'mood': mood, 'detailed_mood': _value(row, 'detailed_mood')}
+        user_id = _value(row, 'user_id')
+        for basis in MOOD_SUMMARY_BASES:
+            day = _basis_date(row, basis)
+            for period in MOOD_SUMMARY_PERIODS:
+                bucket = bucket_start(day, period)
+                for kind in MOOD_SUMMARY_KINDS:
+                    if values[kind]:
+                        deltas[(user_id, basis, period, bucket, kind, values[kind])] += sign
+    return deltas
+
+
+def apply_mood_deltas(deltas):
+    """
+    증감을 MoodSummary에 upsert(INSERT ... ON CONFLICT DO UPDATE count = count + 증감)로 반영합니다.
+    편지 변경과 같은 트랜잭션 안에서 호출해야 하며, 0이 된 구간 행은 지웁니다.
+    """
+    changes = sorted((key, delta) for key, delta in deltas.items() if delta)  # 잠금 순서 고정 (교착 방지)
+    if not changes:
+        return 0
+    qn = connection.ops.quote_name
+    table = qn(MoodSummary._meta.db_table)
+    columns = ', '.join(qn(column) for column in KEY_COLUMNS)
+    with connection.cursor() as cursor:
+        for start in range(0, len(changes), UPSERT_BATCH_SIZE):
+            batch = changes[start:start + UPSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}, {qn('count')}) VALUES {placeholders} "
+                f"ON CONFLICT ({columns}) DO UPDATE SET {qn('count')} = {table}.{qn('count')} + EXCLUDED.{qn('count')}",
+                [value for key, delta in batch for value in (*key, delta)],
+            )
+    if any(delta < 0 for _, delta in changes):
+        MoodSummary.objects.filter(user_id__in={key[0] for key, _ in changes}, count__lte=0).delete()
+    return len(changes)
+
+
+def record_mood_changes(before, after):
+    """ 같은 편지들의 변경 전 / 후 감정(인스턴스 또는 dict 목록)으로 집계를 갱신합니다. """
+    return apply_mood_deltas(add_mood_deltas(add_mood_deltas(Counter(), before, -1), after, +1))
+
+
+def remove_from_mood_summary(deleted_rows):
+    """ 삭제된 편지(DELETE ... RETURNING 행)의 감정을 집계에서 뺍니다. """
+    return apply_mood_deltas(add_mood_deltas(Counter(), deleted_rows, -1))
+
+
+def parse_analytics_query(query_params):
+    """ period / by / from / to 쿼리 파라미터를 검증해 (period, basis, 시작일, 종료일)로 변환합니다. """
+    period = query_params.get('period') or 'month'
+    if period not in MOOD_SUMMARY_PERIODS:
+        raise InvalidAnalyticsQuery(f"알 수 없는 period: {period} (사용 가능: {', '.join(MOOD_SUMMARY_PERIODS)})")
+    basis = query_params.get('by') or 'open_date'
+    if basis not in MOOD_SUMMARY_BASES:
+        raise InvalidAnalyticsQuery(f"알 수 없는 by: {basis} (사용 가능: {', '.join(MOOD_SUMMARY_BASES)})")
+    bounds = []
+    for name in ('from', 'to'):
+        raw = query_params.get(name)
+        try:
+            bounds.append(date.fromisoformat(raw) if raw else None)
+        except ValueError:
+            raise InvalidAnalyticsQuery(f"{name}는 YYYY-MM-DD 형식이어야 합니다.")
+    return period, basis, *bounds
+
+
+def mood_trends(user_id, period='month', basis='open_date', start=None, end=None):
+    """
+    MoodSummary에서 사용자의 구간별 감정 개수를 읽어 구간 순서대로 반환합니다.
+    [{'bucket', 'total', 'moods': {mood: 수}, 'detailed_moods': {detailed_mood: 수}}, ...]
+    """
+    queryset = MoodSummary.objects.filter(user_id=user_id, basis=basis, period=period, count__gt=0)
+    if start:
+        queryset = queryset.filter(bucket__gte=bucket_start(start, period))
+    if end:
+        queryset = queryset.filter(bucket__lte=end)
+
+    buckets = defaultdict(lambda: {'total': 0, 'moods': Counter(), 'detailed_moods': Counter()})
+    for bucket, kind, value, count in queryset.order_by('bucket').values_list('bucket', 'kind', 'value', 'count'):
+        entry = buckets[bucket]
+        if kind == 'mood':
+            entry['total'] += count  # 분석된 편지는 mood가 하나씩 있으므로 mood 합계가 편지 수
+            entry['moods'][value] += count
+        else:
+            entry['detailed_moods'][value] += count
+    return [
+        {'bucket': bucket.isoformat(), 'total': entry['total'],
+         'moods': dict(entry['moods'].most_common()), 'detailed_moods': dict(entry['detailed_moods'].most_common())}
+        for bucket, entry in buckets.items()
+    ]
+
+
+def rebuild_mood_summary(user_ids=None, batch_size=5000):
+    """
+    편지 테이블에서 집계를 다시 만듭니다. (배포 후 백필 / 불일치 복구용, user_ids를 주면 해당 사용자만)
+    PostgreSQL에서는 다시 만드는 동안 증감 반영을 막아(EXCLUSIVE 잠금, 조회는 허용) 그 사이의 결과도 빠지지 않습니다.
+    만든 집계 행 수를 반환합니다.
+    """
+    created = 0
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {connection.ops.quote_name(MoodSummary._meta.db_table)} IN EXCLUSIVE MODE")
+        summaries = MoodSummary.objects.all()
+        letters = Letters.objects.filter(mood__isnull=False)
+        if user_ids is not None:
+            summaries = summaries.filter(user_id__in=user_ids)
+            letters = letters.filter(user_id__in=user_ids)
+        summaries.delete()
+
+        for basis, period, kind in product(MOOD_SUMMARY_BASES, MOOD_SUMMARY_PERIODS, MOOD_SUMMARY_KINDS):
+            rows = (
+                letters
+                .filter(**{f'{kind}__isnull': False})
+                .annotate(bucket=Trunc(basis, period, output_field=DateField()))
+                .values('user_id', 'bucket', kind)
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(MoodSummary(user_id=row['user_id'], basis=basis, period=period, bucket=row['bucket'],
+                                         kind=kind, value=row[kind], count=row['total']))
+                if len(batch) >= batch_size:
+                    created += len(MoodSummary.objects.bulk_create(batch))
+                    batch = []
+            if batch:
+                created += len(MoodSummary.objects.bulk_create(batch))
+    return created
@@ -0,0 +1,89 @@
+# letters/outbox.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from .message_producers import build_emotion_analysis_message, publish_emotion_analysis_requests
+from .models import EmotionAnalysisOutbox
+
+CLAIM_TIMEOUT = getattr(settings, 'EMOTION_OUTBOX_CLAIM_TIMEOUT', 60)  # 발행 중으로 표시한 행을 다른 릴레이가 건너뛰는 시간(초)
+
+
+def _outbox_row(letter):
+    return EmotionAnalysisOutbox(
+        letter_id=letter.id,
+        user_id=letter.user_id,
+        payload=build_emotion_analysis_message(letter.id, letter.user_id, letter.content),
+    )
+
+
+def enqueue_emotion_analysis_request(letter):
+    """
+    편지에 대한 감정 분석 요청을 아웃박스에 기록합니다.
+    호출하는 쪽의 트랜잭션 안에서 실행되어야 편지 저장과 함께 커밋/롤백됩니다.
+    """
+    row = _outbox_row(letter)
+    row.save()
+    return row
+
+
+def enqueue_emotion_analysis_requests(letters):
+    """여러 편지의 감정 분석 요청을 INSERT 한 번으로 기록합니다. (내용이 없는 편지는 건너뜀)"""
+    rows = [_outbox_row(letter) for letter in letters if letter.content]
+    EmotionAnalysisOutbox.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _claim_batch(batch_size):
+    # 미발행 행을 잠가(SKIP LOCKED) 발행 중으로 표시하고 바로 커밋 -> 발행하는 동안 행 잠금을 잡고 있지 않음
+    current = now()
+    with transaction.atomic():
+        rows = list(
+            EmotionAnalysisOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=current))
+            .order_by('id')
+            .values_list('id', 'payload')[:batch_size]
+        )
+        if rows:
+            EmotionAnalysisOutbox.objects.filter(id__in=[row_id for row_id, _ in rows]).update(
+                claimed_until=current + timedelta(seconds=CLAIM_TIMEOUT)
+            )
+    return rows
+
+
+def relay_outbox_batch(batch_size=500, prune=False):
+    """
+    미발행 아웃박스 행을 최대 batch_size개 발행 중으로 표시(claimed_until)한 뒤 커밋하고, 잠금 없이 한 번에 발행합니다.
+    여러 릴레이 워커가 동시에 돌아도 표시된 행은 건너뛰므로 같은 행을 중복 발행하지 않습니다.
+    발행에 실패하면 표시를 풀어 다음 시도에 다시 처리하고, 발행 후 기록 전에 워커가 죽으면
+    CLAIM_TIMEOUT 뒤에 다른 릴레이가 다시 발행합니다. (at-least-once)
+    발행한 행 수를 반환합니다.
+    """
+    rows = _claim_batch(batch_size)
+    if not rows:
+        return 0
+
+    ids = [row_id for row_id, _ in rows]
+    try:
+        publish_emotion_analysis_requests([payload for _, payload in rows])
+    except Exception:
+        EmotionAnalysisOutbox.objects.filter(id__in=ids).update(claimed_until=None)
+        raise
+
+    sent = EmotionAnalysisOutbox.objects.filter(id__in=ids)
+    if prune:
+        sent.delete()
+    else:
+        sent.update(sent_at=now(), claimed_until=None)
+    return len(rows)
+
+
+def prune_sent(older_than):
+    """older_than(datetime) 이전에 발행된 행을 삭제하고 삭제 수를 반환합니다."""
+    deleted, _ = EmotionAnalysisOutbox.objects.filter(sent_at__lt=older_than).delete()
+    return deleted
@@ -0,0 +1,72 @@
+# letters/pagination.py
+import base64
+import json
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = getattr(settings, 'LETTER_LIST_PAGE_SIZE', 50)
+MAX_PAGE_SIZE = getattr(settings, 'LETTER_LIST_MAX_PAGE_SIZE', 200)
+MAX_CURSOR_ID = 2 ** 63 - 1  # PostgreSQL bigint 최댓값
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(open_date, letter_id):
+    """(open_date, id) 위치를 클라이언트가 해석할 필요 없는 불투명 문자열로 인코딩합니다."""
+    raw = json.dumps([open_date.isoformat(), letter_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        open_date, letter_id = json.loads(raw)
+        open_date = date.fromisoformat(open_date)
+    except (ValueError, TypeError, OverflowError):
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+    # 조작된 cursor의 실수 / bool / DB 정수 범위를 벗어난 id는 쿼리까지 가지 않도록 여기서 거부
+    if type(letter_id) is not int or not 0 < letter_id <= MAX_CURSOR_ID:
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+    return open_date, letter_id
+
+
+def parse_page_size(value):
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor("limit은 정수여야 합니다.")
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def paginate_by_open_date(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    (open_date, id) 순서의 keyset 페이지네이션.
+    OFFSET 없이 마지막 위치 이후만 읽으므로 (user_id, open_date, id) 인덱스를 타고
+    앞쪽 페이지와 뒤쪽 페이지의 조회 비용이 같습니다.
+    (해당 페이지 행 목록, 다음 cursor 또는 None)을 반환합니다.
+    """
+    queryset = queryset.order_by('open_date', 'id')
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        # open_date >= X 로 인덱스 범위를 먼저 좁히고, 같은 날짜에서는 id로 이어서 읽음
+        queryset = queryset.filter(open_date__gte=after_date).filter(
+            Q(open_date__gt=after_date) | Q(id__gt=after_id)
+        )
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(_value(last, 'open_date'), _value(last, 'id'))
+    return rows, next_cursor
+
+
+def _value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
@@ -0,0 +1,61 @@
+# letters/projections.py
+# 편지 목록의 필드 선택(sparse fieldset): ?fields=title,open_date 또는 ?view=summary
+# 선택한 필드에 필요한 컬럼만 SELECT 하고(.only), 본문(content)은 요청한 경우에만 읽습니다.
+from django.conf import settings
+from django.db.models.functions import Substr
+
+from .serializers import LIST_FIELDS
+
+PREVIEW_LENGTH = getattr(settings, 'LETTER_PREVIEW_LENGTH', 100)
+SELECTABLE_FIELDS = LIST_FIELDS + ['preview']
+
+# 이름으로 고를 수 있는 필드 묶음
+PROJECTIONS = {
+    'full': LIST_FIELDS,
+    'summary': ['id', 'title', 'open_date', 'category', 'mood'],
+    'preview': ['id', 'title', 'open_date', 'category', 'mood', 'preview'],
+}
+
+# 직렬화 필드 -> 필요한 모델 컬럼 (category는 open_date로 DB에서 계산, preview는 content 앞부분을 DB에서 잘라 옴)
+_COLUMNS = {'category': [], 'preview': []}
+_ALWAYS_LOADED = ['id', 'open_date']  # cursor 페이지네이션에 필요
+
+
+class InvalidProjection(ValueError):
+    pass
+
+
+def parse_projection(query_params):
+    """
+    fields / view 쿼리 파라미터를 필드 이름 목록으로 바꿉니다. 둘 다 없으면 None(전체 필드).
+    fields를 주면 view보다 우선합니다.
+    """
+    raw_fields = query_params.get('fields')
+    if raw_fields:
+        fields = list(dict.fromkeys(name.strip() for name in raw_fields.split(',') if name.strip()))
+        unknown = [name for name in fields if name not in SELECTABLE_FIELDS]
+        if unknown or not fields:
+            raise InvalidProjection(f"알 수 없는 필드: {', '.join(unknown)} (사용 가능: {', '.join(SELECTABLE_FIELDS)})")
+        return fields
+
+    view = query_params.get('view')
+    if view:
+        if view not in PROJECTIONS:
+            raise InvalidProjection(f"알 수 없는 view: {view} (사용 가능: {', '.join(PROJECTIONS)})")
+        return list(PROJECTIONS[view])
+    return None
+
+
+def project_queryset(queryset, fields):
+    """ 선택한 필드에 필요한 컬럼만 읽도록 queryset을 좁힙니다. """
+    if fields is None:
+        return queryset
+    columns = list(_ALWAYS_LOADED)
+    for name in fields:
+        for column in _COLUMNS.get(name, [name]):
+            if column not in columns:
+                columns.append(column)
+    queryset = queryset.only(*columns)
+    if 'preview' in fields:
+        queryset = queryset.annotate(preview=Substr('content', 1, PREVIEW_LENGTH))
+    return queryset
@@ -0,0 +1,31 @@
+# letters/renderers.py
+# orjson이 설치되어 있으면 DRF 기본 JSONRenderer보다 빠른 orjson으로 응답을 렌더링합니다.
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer와 같은 media type / 압축 출력(ensure_ascii=False)이지만 orjson으로 인코딩합니다.
+    orjson이 처리하지 못하는 값(Decimal, lazy 문자열 등)은 DRF 인코더로 넘깁니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self.encoder_class().default)
+
+
+def render_json(data):
+    """ 뷰에서 직접 JSON bytes가 필요할 때 (캐시 저장 등) """
+    return ORJSONRenderer().render(data)
+
+
+# 편지 조회 API에 등록하는 렌더러 (브라우저에서 볼 때는 기존처럼 Browsable API)
+LETTER_RENDERER_CLASSES = [ORJSONRenderer, BrowsableAPIRenderer]
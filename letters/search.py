@@ -0,0 +1,121 @@
+# letters/search.py
+# 사용자 편지의 제목 / 본문 전문 검색 (PostgreSQL 전용)
+# search_vector(tsvector) 컬럼은 DB 트리거가 제목(가중치 A)과 본문(가중치 B)으로 채우고,
+# (user_id, search_vector) GIN 인덱스로 해당 사용자의 일치하는 행만 찾습니다. (마이그레이션 0008)
+import base64
+import json
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+from django.utils.html import escape
+
+from .models import SEARCH_CONFIG, Letters, category_expression
+
+SEARCH_MAX_TERMS = getattr(settings, 'LETTER_SEARCH_MAX_TERMS', 8) # 검색어에서 사용하는 최대 단어 수
+SEARCH_MAX_OFFSET = getattr(settings, 'LETTER_SEARCH_MAX_OFFSET', 1000) # 이보다 뒤 페이지는 조회하지 않음
+SNIPPET_OPTIONS = getattr(settings, 'LETTER_SEARCH_SNIPPET_OPTIONS', {
+    'max_words': 20, 'min_words': 5, 'max_fragments': 2, 'fragment_delimiter': ' … ',
+})
+
+# ts_headline 결과의 강조 구간 표시 (HTML 이스케이프 후 <mark>로 바꿈)
+_START, _STOP = '\x02', '\x03'
+_TERM_RE = re.compile(r'\w+')
+
+
+class InvalidSearchQuery(ValueError):
+    pass
+
+
+def search_available(using='default'):
+    """ tsvector / GIN 인덱스가 있는 PostgreSQL에서만 검색을 제공 """
+    return connections[using].vendor == 'postgresql'
+
+
+def parse_search_terms(text):
+    """
+    검색어를 단어 목록으로 나눕니다. 연산자 / 특수문자는 버리므로 사용자 입력이 tsquery 문법 오류를 내지 않습니다.
+    """
+    terms = list(dict.fromkeys(term.lower() for term in _TERM_RE.findall(text or '')))[:SEARCH_MAX_TERMS]
+    if not terms:
+        raise InvalidSearchQuery("검색어(q)를 입력해 주세요.")
+    return terms
+
+
+def build_search_query(terms):
+    """
+    모든 단어를 포함하는(AND) 접두어 검색 tsquery.
+    'simple' 설정은 형태소 분석을 하지 않으므로 '친구'로 '친구에게', '친구들' 같은 조사 / 어미 붙은 단어도 찾도록 접두어(:*)로 검색합니다.
+    """
+    return SearchQuery(' & '.join(f"{term}:*" for term in terms), search_type='raw', config=SEARCH_CONFIG)
+
+
+def encode_search_cursor(offset):
+    raw = json.dumps([offset], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_search_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        (offset,) = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise InvalidSearchQuery("잘못된 cursor 값입니다.")
+    # encode_search_cursor는 정수만 만듦 (1e999 같은 값은 int()에서 OverflowError)
+    if type(offset) is not int or not 0 <= offset <= SEARCH_MAX_OFFSET:
+        raise InvalidSearchQuery("잘못된 cursor 값입니다.")
+    return offset
+
+
+def _highlight(text):
+    return escape(text or '').replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def search_queryset(user_id, query, today=None):
+    """ 사용자 편지 중 query와 일치하는 행을 관련도(ts_rank) 순으로 조회하는 values() queryset """
+    headline = {'config': SEARCH_CONFIG, 'start_sel': _START, 'stop_sel': _STOP}
+    return (
+        Letters.objects
+        .filter(user_id=user_id, search_vector=query)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            current_category=category_expression(today),
+            title_highlight=SearchHeadline('title', query, highlight_all=True, **headline),
+            snippet=SearchHeadline('content', query, **headline, **SNIPPET_OPTIONS),
+        )
+        .order_by('-rank', '-id')
+        .values('id', 'title', 'open_date', 'current_category', 'mood', 'thumbnail_url', 'rank',
+                'title_highlight', 'snippet')
+    )
+
+
+def search_letters(user_id, text, cursor=None, limit=20, today=None):
+    """
+    사용자 편지를 관련도 순으로 검색해 (결과 dict 목록, 다음 cursor 또는 None)을 반환합니다.
+    일치 여부는 GIN 인덱스로 판단하고, 정렬 / 하이라이트는 일치한 행에 대해서만 DB에서 계산합니다.
+    (ts_headline은 비용이 큰 함수라 PostgreSQL이 ORDER BY ... LIMIT 이후, 즉 해당 페이지 행에만 실행)
+    """
+    query = build_search_query(parse_search_terms(text))
+    offset = decode_search_cursor(cursor)
+    rows = list(search_queryset(user_id, query, today)[offset:offset + limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if offset + limit <= SEARCH_MAX_OFFSET:
+            next_cursor = encode_search_cursor(offset + limit)
+    results = [{
+        'id': row['id'],
+        'title': row['title'],
+        'open_date': row['open_date'].isoformat(),
+        'category': row['current_category'],
+        'mood': row['mood'],
+        'thumbnail_url': row['thumbnail_url'],
+        'rank': round(row['rank'], 6),
+        'title_highlight': _highlight(row['title_highlight']),
+        'snippet': _highlight(row['snippet']),
+    } for row in rows]
+    return results, next_cursor
@@ -1,16 +1,75 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import Letters
 
 class LetterSerializer(serializers.ModelSerializer):
+    # with_current_category()로 조회했다면 DB에서 계산한 오늘 기준 카테고리를, 아니면 저장된 값을 사용
+    category = serializers.SerializerMethodField()
+
     class Meta:
         model = Letters
-        fields = ['id', 'user_id', 'title', 'content', 'created_at', 'open_date', 'image_url', 'category', 'mood', 'detailed_mood']
+        fields = ['id', 'user_id', 'title', 'content', 'created_at', 'open_date', 'image_url', 'thumbnail_url', 'category', 'mood', 'detailed_mood']
         read_only_fields = ['id', 'user_id', 'created_at'] # user_id는 요청 시 직접 받지 않고 인증 통해 설정
 
+    def get_category(self, obj):
+        return getattr(obj, 'current_category', None) or obj.category
+
+# 목록 응답의 기본 필드: thumbnail_url은 서명된 URL로 바꿔야 쓸 수 있는데 목록에서는 아직 서명하지 않으므로
+# (목록 응답은 버전 키로 캐시되어 서명 만료와 맞지 않음) 상세 API에서만 내보냄
+LIST_FIELDS = [name for name in LetterSerializer.Meta.fields if name != 'thumbnail_url']
+
+
+class LetterProjectionSerializer(LetterSerializer):
+    """ fields로 지정한 필드만 직렬화하는 목록용 serializer (preview: DB에서 잘라 온 본문 앞부분) """
+    preview = serializers.CharField(read_only=True)
+
+    class Meta(LetterSerializer.Meta):
+        fields = LetterSerializer.Meta.fields + ['preview']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = fields if fields is not None else LIST_FIELDS
+        for name in set(self.fields) - set(keep):
+            self.fields.pop(name)
+
 class LetterCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Letters
         fields = ['title', 'content', 'open_date', 'image_url', 'category'] 
         extra_kwargs = {
             'image_url': {'required': False, 'allow_null': True}
-        }
\ No newline at end of file
+        }
+
+
+class BulkLetterCreateSerializer(serializers.ModelSerializer):
+    """ 일괄 작성 항목용 serializer: 이미지 blob 이름과 카테고리는 클라이언트에게서 받지 않음 (카테고리는 뷰에서 계산) """
+
+    class Meta:
+        model = Letters
+        fields = ['title', 'content', 'open_date']
+
+
+class DirectUploadLetterCreateSerializer(LetterCreateSerializer):
+    """ 이미지 파일 대신 업로드할 이미지의 형식만 받아 편지를 만드는 직접 업로드용 serializer """
+    image_content_type = serializers.ChoiceField(choices=['image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/heic'], write_only=True)
+    image_filename = serializers.CharField(max_length=255, required=False, write_only=True)
+
+    class Meta(LetterCreateSerializer.Meta):
+        fields = ['title', 'content', 'open_date', 'category', 'image_content_type', 'image_filename']
+
+
+class ImageFinalizeSerializer(serializers.Serializer):
+    blob_name = serializers.CharField(max_length=255)
+
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """ 여러 편지 삭제 조건: ids 목록 또는 open_date_before (둘 다 주면 모두 만족하는 편지만) """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+                                max_length=getattr(settings, 'LETTER_BULK_DELETE_MAX_IDS', 10000))
+    open_date_before = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if 'ids' not in attrs and 'open_date_before' not in attrs:
+            raise serializers.ValidationError("ids 또는 open_date_before 중 하나는 필요합니다.")
+        return attrs
@@ -1,9 +1,39 @@
 # letters/storage_service_client.py
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
 import requests
 from django.conf import settings
 
+from .async_http import get_async_client
+from .metrics import atimed_call, timed_call
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
 # 기본 스토리지 서비스 URL 가져오기
 STORAGE_API_BASE_URL = settings.LETTER_STORAGE_SERVICE_BASE_URL.rstrip('/')
+STORAGE_SERVICE_TIMEOUT = getattr(settings, 'STORAGE_SERVICE_TIMEOUT', 10.0)
+
+# 워커 내에서 커넥션(keep-alive)을 재사용하기 위한 세션
+_session = requests.Session()
+
+# 서명된 URL 캐시 설정 (blob 이름 -> signed URL)
+SIGNED_URL_CACHE_ENABLED = getattr(settings, 'SIGNED_URL_CACHE_ENABLED', True)
+SIGNED_URL_DEFAULT_EXPIRY = getattr(settings, 'SIGNED_URL_DEFAULT_EXPIRY', 900) # URL에서 만료 시각을 알 수 없을 때 가정하는 유효 시간(초)
+SIGNED_URL_CACHE_TTL_RATIO = getattr(settings, 'SIGNED_URL_CACHE_TTL_RATIO', 0.5) # 남은 유효 시간 중 캐시에 보관할 비율
+SIGNED_URL_MIN_REMAINING = getattr(settings, 'SIGNED_URL_MIN_REMAINING', 60) # 응답으로 내보내는 URL에 최소한 남아 있어야 할 유효 시간(초)
+
+signed_url_cache = TTLCache(
+    max_entries=getattr(settings, 'SIGNED_URL_CACHE_MAX_ENTRIES', 10000),
+    max_bytes=getattr(settings, 'SIGNED_URL_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+    sizeof=sys.getsizeof,
+)
 
 
 def upload_image_to_storage(file_to_upload, letter_id):
@@ -13,13 +43,13 @@ def upload_image_to_storage(file_to_upload, letter_id):
     """
     gcs_blob_name = None
     if not file_to_upload:
-        print("📤 스토리지 클라이언트: 업로드할 파일이 없습니다.")
+        logger.debug('📤 스토리지 클라이언트: 업로드할 파일이 없습니다.')
         return None
 
     upload_api_path = "/api/images/"  # 스토리지 서비스의 실제 업로드 API 경로
     full_upload_api_url = f"{STORAGE_API_BASE_URL}{upload_api_path}"
     
-    print(f"📞 스토리지 클라이언트: 이미지 업로드 API 호출 시도... URL: {full_upload_api_url}")
+    logger.debug('📞 스토리지 클라이언트: 이미지 업로드 API 호출 시도... URL: %s', full_upload_api_url)
     try:
         files_payload = {
             'file': (file_to_upload.name, file_to_upload, file_to_upload.content_type)
@@ -27,94 +57,179 @@ def upload_image_to_storage(file_to_upload, letter_id):
         data_payload = {
             'letter_id': letter_id
         }
-        response = requests.post(full_upload_api_url, files=files_payload, data=data_payload)
+        response = timed_call('storage', 'upload', _session.post, full_upload_api_url, files=files_payload, data=data_payload,
+                              timeout=STORAGE_SERVICE_TIMEOUT)
         response.raise_for_status()  # 오류 발생 시 HTTPError 예외 발생
         
         upload_response_data = response.json()
 
         if upload_response_data.get('blob_name'):
             gcs_blob_name = upload_response_data.get('blob_name')
-            print(f"✅ 스토리지 클라이언트: 이미지 업로드 성공! Blob Name: {gcs_blob_name}")
+            logger.debug('✅ 스토리지 클라이언트: 이미지 업로드 성공! Blob Name: %s', gcs_blob_name)
         else:
             error_message = upload_response_data.get('message', '알 수 없는 응답 형식')
-            print(f"❌ 스토리지 클라이언트: 이미지 업로드 API 응답 오류 - {error_message}")
+            logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API 응답 오류 - %s', error_message)
             
     except requests.exceptions.HTTPError as e:
-        print(f"❌ 스토리지 클라이언트: 이미지 업로드 API HTTP 오류! 상태 코드: {e.response.status_code}, 응답: {e.response.text}")
+        logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API HTTP 오류! 상태 코드: %s, 응답: %s', e.response.status_code, e.response.text)
     except requests.exceptions.RequestException as e:
-        print(f"❌ 스토리지 클라이언트: 이미지 업로드 API 요청 오류! {e}")
+        logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API 요청 오류! %s', e)
     except ValueError: # JSON 디코딩 오류
-        print(f"❌ 스토리지 클라이언트: 이미지 업로드 API 응답 JSON 디코딩 오류! 응답: {response.text if 'response' in locals() else '응답 객체 없음'}")
+        logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API 응답 JSON 디코딩 오류! 응답: %s', response.text if 'response' in locals() else '응답 객체 없음')
     except Exception as e:
-        print(f"❌ 스토리지 클라이언트: 이미지 업로드 중 예상치 못한 오류 발생! {e}")
+        logger.exception('❌ 스토리지 클라이언트: 이미지 업로드 중 예상치 못한 오류 발생! %s', e)
         
     return gcs_blob_name
 
 
+def request_upload_target(letter_id, content_type, filename=None):
+    """
+    클라이언트가 이미지를 스토리지에 직접 올릴 수 있도록 사전 서명된 업로드 대상을 발급받습니다.
+    성공 시 {'blob_name', 'upload_url', 'method', 'headers', 'expires_in'} dict, 실패 시 None을 반환합니다.
+    """
+    upload_url_api_path = "/api/images/upload-url/"  # 스토리지 서비스의 업로드 URL 발급 API 경로
+    full_upload_url_api_url = f"{STORAGE_API_BASE_URL}{upload_url_api_path}"
+
+    logger.debug('📞 스토리지 클라이언트: 업로드 URL 발급 API 호출 시도... URL: %s', full_upload_url_api_url)
+    try:
+        response = timed_call('storage', 'upload_url', _session.post, full_upload_url_api_url, timeout=STORAGE_SERVICE_TIMEOUT, json={
+            'letter_id': letter_id,
+            'content_type': content_type,
+            'filename': filename,
+        })
+        response.raise_for_status()
+        target = response.json()
+
+        if target.get('blob_name') and target.get('upload_url'):
+            logger.debug('✅ 스토리지 클라이언트: 업로드 URL 발급 성공! Blob Name: %s', target['blob_name'])
+            return {
+                'blob_name': target['blob_name'],
+                'upload_url': target['upload_url'],
+                'method': target.get('method', 'PUT'),
+                'headers': target.get('headers') or {'Content-Type': content_type},
+                'expires_in': target.get('expires_in'),
+            }
+        error_message = target.get('message', '알 수 없는 응답 형식')
+        logger.warning('❌ 스토리지 클라이언트: 업로드 URL 발급 API 응답 오류 - %s', error_message)
+
+    except requests.exceptions.HTTPError as e:
+        logger.warning('❌ 스토리지 클라이언트: 업로드 URL 발급 API HTTP 오류! 상태 코드: %s, 응답: %s', e.response.status_code, e.response.text)
+    except requests.exceptions.RequestException as e:
+        logger.warning('❌ 스토리지 클라이언트: 업로드 URL 발급 API 요청 오류! %s', e)
+    except ValueError: # JSON 디코딩 오류
+        logger.warning('❌ 스토리지 클라이언트: 업로드 URL 발급 API 응답 JSON 디코딩 오류!')
+    return None
+
+
+def _signed_url_expires_at(signed_url):
+    """
+    서명된 URL의 쿼리 파라미터에서 만료 시각(epoch 초)을 읽습니다.
+    GCS/S3 V4 서명(X-Goog-Date + X-Goog-Expires, X-Amz-Date + X-Amz-Expires)과
+    V2 서명(Expires)을 지원하며, 알 수 없으면 None을 반환합니다.
+    """
+    query = parse_qs(urlsplit(signed_url).query)
+    try:
+        for prefix in ('X-Goog', 'X-Amz'):
+            signed_at = query.get(f'{prefix}-Date')
+            expires = query.get(f'{prefix}-Expires')
+            if signed_at and expires:
+                started = datetime.strptime(signed_at[0], '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+                return started.timestamp() + int(expires[0])
+        if query.get('Expires'):
+            return float(query['Expires'][0])
+    except ValueError:
+        pass
+    return None
+
+
+def _signed_url_cache_ttl(signed_url, fetched_at):
+    """URL 자체의 만료보다 충분히 짧은 캐시 TTL(초)을 계산합니다."""
+    expires_at = _signed_url_expires_at(signed_url) or (fetched_at + SIGNED_URL_DEFAULT_EXPIRY)
+    remaining = expires_at - time.time()
+    return min(remaining * SIGNED_URL_CACHE_TTL_RATIO, remaining - SIGNED_URL_MIN_REMAINING)
+
+
 def get_signed_url_from_storage(blob_name):
     """
     스토리지 서비스로부터 이미지 blob 이름에 대한 서명된 URL을 가져옵니다.
+    URL이 만료되기 전까지는 워커 내 캐시에서 재사용하며, 같은 blob에 대한 동시 요청은 한 번만 호출합니다.
     성공 시 signed_url, 실패 시 None을 반환합니다.
     """
-    signed_url = None
     if not blob_name:
-        print("🔗 스토리지 클라이언트: 서명된 URL을 생성할 blob 이름이 없습니다.")
+        logger.debug('🔗 스토리지 클라이언트: 서명된 URL을 생성할 blob 이름이 없습니다.')
         return None
+    if not SIGNED_URL_CACHE_ENABLED:
+        return _request_signed_url(blob_name)
+
+    def load():
+        fetched_at = time.time()
+        signed_url = _request_signed_url(blob_name)
+        if not signed_url:
+            return None, 0
+        return signed_url, _signed_url_cache_ttl(signed_url, fetched_at)
+
+    return signed_url_cache.get_or_load(blob_name, load)
+
 
+def _request_signed_url(blob_name):
+    signed_url = None
     get_url_api_path = f"/api/images/{blob_name}/"  # 경로 마지막 / 유의
     full_get_url_api_url = f"{STORAGE_API_BASE_URL}{get_url_api_path}"
 
-    print(f"📞 스토리지 클라이언트: 서명된 URL 생성 API 호출 시도... URL: {full_get_url_api_url}")
+    logger.debug('📞 스토리지 클라이언트: 서명된 URL 생성 API 호출 시도... URL: %s', full_get_url_api_url)
     try:
-        response = requests.get(full_get_url_api_url)
+        response = timed_call('storage', 'signed_url', _session.get, full_get_url_api_url, timeout=STORAGE_SERVICE_TIMEOUT)
         response.raise_for_status()
         
         url_response_data = response.json()
 
         if url_response_data.get('signed_url'):
             signed_url = url_response_data.get('signed_url')
-            print(f"✅ 스토리지 클라이언트: 서명된 URL 생성 성공! URL: {signed_url} (Blob: {blob_name})")
+            logger.debug('✅ 스토리지 클라이언트: 서명된 URL 생성 성공! (Blob: %s)', blob_name)
         else:
             error_message = url_response_data.get('message', '알 수 없는 응답 형식')
-            print(f"❌ 스토리지 클라이언트: 서명된 URL 생성 API 응답 오류 - {error_message}")
+            logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API 응답 오류 - %s', error_message)
 
     except requests.exceptions.HTTPError as e:
-        print(f"❌ 스토리지 클라이언트: 서명된 URL 생성 API HTTP 오류! 상태 코드: {e.response.status_code}, 응답: {e.response.text}")
+        logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API HTTP 오류! 상태 코드: %s, 응답: %s', e.response.status_code, e.response.text)
     except requests.exceptions.RequestException as e:
-        print(f"❌ 스토리지 클라이언트: 서명된 URL 생성 API 요청 오류! {e}")
+        logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API 요청 오류! %s', e)
     except ValueError: # JSON 디코딩 오류
-        print(f"❌ 스토리지 클라이언트: 서명된 URL 생성 API 응답 JSON 디코딩 오류! 응답: {response.text if 'response' in locals() else '응답 객체 없음'}")
+        logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API 응답 JSON 디코딩 오류! 응답: %s', response.text if 'response' in locals() else '응답 객체 없음')
     except Exception as e:
-        print(f"❌ 스토리지 클라이언트: 서명된 URL 생성 중 예상치 못한 오류 발생! {e}")
+        logger.exception('❌ 스토리지 클라이언트: 서명된 URL 생성 중 예상치 못한 오류 발생! %s', e)
         
     return signed_url
 
 
-def delete_image_from_storage(blob_name):
+def delete_image_from_storage(blob_name, missing_ok=False):
     """
     스토리지 서비스에서 이미지를 삭제합니다.
-    성공 시 True, 실패 시 False를 반환합니다.
+    성공 시 True, 실패 시 False를 반환합니다. missing_ok=True이면 이미 없는 이미지(404)도 성공으로 봅니다.
     """
     if not blob_name:
-        print("🗑️ 스토리지 클라이언트: 삭제할 이미지의 blob 이름이 없습니다.")
+        logger.debug('🗑️ 스토리지 클라이언트: 삭제할 이미지의 blob 이름이 없습니다.')
         return False
+    signed_url_cache.delete(blob_name) # 삭제된 이미지의 서명된 URL은 더 이상 내보내지 않음
 
     delete_api_path = f"/api/images/{blob_name}/"
     full_delete_api_url = f"{STORAGE_API_BASE_URL}{delete_api_path}"
 
-    print(f"📞 스토리지 클라이언트: 이미지 삭제 API 호출 시도... URL: DELETE {full_delete_api_url}")
+    logger.debug('📞 스토리지 클라이언트: 이미지 삭제 API 호출 시도... URL: DELETE %s', full_delete_api_url)
     try:
-        response = requests.delete(full_delete_api_url)
+        response = timed_call('storage', 'delete', _session.delete, full_delete_api_url, timeout=STORAGE_SERVICE_TIMEOUT)
+        # 삭제 요청 중에 다른 요청이 다시 캐시한 URL도 지움
+        signed_url_cache.delete(blob_name)
 
         if response.status_code == 204:  # 성공 (No Content)
-            print(f"✅ 스토리지 클라이언트: 이미지 '{blob_name}' 삭제 성공 (204 No Content).")
+            logger.debug("✅ 스토리지 클라이언트: 이미지 '%s' 삭제 성공 (204 No Content).", blob_name)
             return True
         elif response.ok:  # 다른 2xx 성공 코드
             try:
                 delete_response_data = response.json()
-                print(f"✅ 스토리지 클라이언트: 이미지 '{blob_name}' 삭제 응답 (상태코드 {response.status_code}): {delete_response_data}")
+                logger.debug("✅ 스토리지 클라이언트: 이미지 '%s' 삭제 응답 (상태코드 %s): %s", blob_name, response.status_code, delete_response_data)
             except ValueError:
-                print(f"✅ 스토리지 클라이언트: 이미지 '{blob_name}' 삭제 성공 (상태코드: {response.status_code}), 응답 본문 JSON 아님: {response.text}")
+                logger.debug("✅ 스토리지 클라이언트: 이미지 '%s' 삭제 성공 (상태코드: %s), 응답 본문 JSON 아님: %s", blob_name, response.status_code, response.text)
             return True
         else:
             response.raise_for_status() # HTTP 오류 발생
@@ -122,13 +237,131 @@ def delete_image_from_storage(blob_name):
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
-            print(f"ℹ️ 스토리지 클라이언트: 삭제할 이미지 '{blob_name}'를 GCS 또는 스토리지 서비스에서 찾을 수 없습니다 (HTTP 404).")
+            logger.debug("ℹ️ 스토리지 클라이언트: 삭제할 이미지 '%s'를 GCS 또는 스토리지 서비스에서 찾을 수 없습니다 (HTTP 404).", blob_name)
+            return missing_ok
         else:
-            print(f"❌ 스토리지 클라이언트: 이미지 삭제 API HTTP 오류! 상태 코드: {e.response.status_code}, 응답: {e.response.text if e.response else '응답 텍스트 없음'}")
+            logger.warning('❌ 스토리지 클라이언트: 이미지 삭제 API HTTP 오류! 상태 코드: %s, 응답: %s', e.response.status_code, e.response.text if e.response else '응답 텍스트 없음')
         return False
     except requests.exceptions.RequestException as e:
-        print(f"❌ 스토리지 클라이언트: 이미지 삭제 API 요청 오류! {e}")
+        logger.warning('❌ 스토리지 클라이언트: 이미지 삭제 API 요청 오류! %s', e)
         return False
     except Exception as e:
-        print(f"❌ 스토리지 클라이언트: 이미지 삭제 API 호출 중 예상치 못한 오류 발생! {e}")
-        return False
\ No newline at end of file
+        logger.exception('❌ 스토리지 클라이언트: 이미지 삭제 API 호출 중 예상치 못한 오류 발생! %s', e)
+        return False
+
+
+def list_images_in_storage(prefix=None, page_size=1000):
+    """
+    스토리지 서비스의 이미지 목록을 페이지 단위로 읽어 {'name', 'updated'} dict를 하나씩 돌려줍니다.
+    (GET /api/images/?prefix=&page_size=&page_token= -> {"blobs": [...], "next_page_token": ...})
+    요청이 실패하면 예외를 올립니다.
+    """
+    page_token = None
+    while True:
+        params = {'page_size': page_size}
+        if prefix:
+            params['prefix'] = prefix
+        if page_token:
+            params['page_token'] = page_token
+        response = timed_call('storage', 'list', _session.get, f"{STORAGE_API_BASE_URL}/api/images/", params=params,
+                              timeout=STORAGE_SERVICE_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        for blob in data.get('blobs', []):
+            yield blob if isinstance(blob, dict) else {'name': blob, 'updated': None}
+        page_token = data.get('next_page_token')
+        if not page_token:
+            return
+
+
+# ---- 비동기 버전 (ASGI 뷰용, 공유 httpx.AsyncClient 사용) ----
+
+_async_signed_url_inflight = {}  # blob 이름 -> 진행 중인 조회 Task (이벤트 루프 내 single-flight)
+
+
+async def aupload_image_to_storage(file_to_upload, letter_id):
+    """upload_image_to_storage의 비동기 버전. 성공 시 blob_name, 실패 시 None을 반환합니다."""
+    if not file_to_upload:
+        return None
+    full_upload_api_url = f"{STORAGE_API_BASE_URL}/api/images/"
+    try:
+        response = await atimed_call(
+            'storage', 'upload', get_async_client().post,
+            full_upload_api_url,
+            files={'file': (file_to_upload.name, file_to_upload.read(), file_to_upload.content_type)},
+            data={'letter_id': str(letter_id)},
+        )
+        response.raise_for_status()
+        gcs_blob_name = response.json().get('blob_name')
+        if gcs_blob_name:
+            logger.debug('✅ 스토리지 클라이언트: 이미지 업로드 성공! Blob Name: %s', gcs_blob_name)
+            return gcs_blob_name
+        logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API 응답 오류 - %s', response.text)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning('❌ 스토리지 클라이언트: 이미지 업로드 API 요청 오류! %s', e)
+    return None
+
+
+async def _arequest_signed_url(blob_name):
+    try:
+        response = await atimed_call('storage', 'signed_url', get_async_client().get, f"{STORAGE_API_BASE_URL}/api/images/{blob_name}/")
+        response.raise_for_status()
+        signed_url = response.json().get('signed_url')
+        if not signed_url:
+            logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API 응답 오류 - %s', response.text)
+        return signed_url
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning('❌ 스토리지 클라이언트: 서명된 URL 생성 API 요청 오류! %s', e)
+        return None
+
+
+async def aget_signed_url_from_storage(blob_name):
+    """get_signed_url_from_storage의 비동기 버전. 같은 캐시를 공유합니다."""
+    if not blob_name:
+        return None
+    if not SIGNED_URL_CACHE_ENABLED:
+        return await _arequest_signed_url(blob_name)
+
+    signed_url = signed_url_cache.get(blob_name)
+    if signed_url is not None:
+        return signed_url
+
+    task = _async_signed_url_inflight.get(blob_name)
+    if task is None:
+        async def load():
+            fetched_at = time.time()
+            signed_url = await _arequest_signed_url(blob_name)
+            if signed_url and _async_signed_url_inflight.get(blob_name) is task:
+                signed_url_cache.set(blob_name, signed_url, ttl=_signed_url_cache_ttl(signed_url, fetched_at))
+            return signed_url
+
+        def forget(done_task):
+            if _async_signed_url_inflight.get(blob_name) is done_task:
+                del _async_signed_url_inflight[blob_name]
+
+        task = asyncio.ensure_future(load())
+        _async_signed_url_inflight[blob_name] = task
+        task.add_done_callback(forget)
+    return await asyncio.shield(task)
+
+
+async def adelete_image_from_storage(blob_name):
+    """delete_image_from_storage의 비동기 버전. 성공(또는 이미 없음 외 2xx) 시 True를 반환합니다."""
+    if not blob_name:
+        return False
+    signed_url_cache.delete(blob_name)
+    _async_signed_url_inflight.pop(blob_name, None) # 진행 중인 조회 결과는 캐시에 저장되지 않음
+    try:
+        response = await atimed_call('storage', 'delete', get_async_client().delete, f"{STORAGE_API_BASE_URL}/api/images/{blob_name}/")
+        signed_url_cache.delete(blob_name) # 삭제 요청 중에 다른 요청이 다시 캐시한 URL도 지움
+        _async_signed_url_inflight.pop(blob_name, None)
+        if response.is_success:
+            logger.debug("✅ 스토리지 클라이언트: 이미지 '%s' 삭제 성공 (상태코드: %s).", blob_name, response.status_code)
+            return True
+        if response.status_code == 404:
+            logger.debug("ℹ️ 스토리지 클라이언트: 삭제할 이미지 '%s'를 찾을 수 없습니다 (HTTP 404).", blob_name)
+        else:
+            logger.warning('❌ 스토리지 클라이언트: 이미지 삭제 API HTTP 오류! 상태 코드: %s, 응답: %s', response.status_code, response.text)
+    except httpx.HTTPError as e:
+        logger.warning('❌ 스토리지 클라이언트: 이미지 삭제 API 요청 오류! %s', e)
+    return False
@@ -0,0 +1,148 @@
+# letters/ttl_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    TTL(만료 시간)과 LRU 퇴출을 지원하는 스레드 안전한 인메모리 캐시.
+    워커 프로세스마다 하나씩 존재하며, 조회/적중 통계를 함께 기록합니다.
+
+    max_bytes와 sizeof를 주면 항목 수 외에 값의 대략적인 메모리 크기 합계로도 제한합니다.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=60.0, max_bytes=None, sizeof=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._data = OrderedDict()  # key -> (만료 시각(monotonic), 값, 크기)
+        self._bytes = 0
+        self._inflight = {}  # key -> [Event, 결과 저장 여부] (single-flight)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0  # 다른 스레드의 조회 결과를 기다려 받은 횟수
+
+    def _lookup(self, key):
+        # self._lock을 잡은 상태에서 호출
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._data.move_to_end(key)  # 최근 사용으로 표시
+        return entry
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get(self, key, default=None):
+        """만료되지 않은 값을 반환하고, 없으면 default를 반환합니다."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """값을 저장합니다. ttl이 0 이하이면 저장하지 않습니다."""
+        size = self._sizeof(value)
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def _store(self, key, value, ttl, size):
+        # self._lock을 잡은 상태에서 호출
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._remove(key)
+        self._data[key] = (time.monotonic() + ttl, value, size)
+        self._bytes += size
+        while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)  # 가장 오래 사용되지 않은 항목 퇴출
+            self.evictions += 1
+
+    def get_or_load(self, key, loader, wait_timeout=10.0):
+        """
+        캐시에 없으면 loader()를 호출해 (값, ttl)을 받아 저장하고 값을 반환합니다.
+        같은 키에 대한 동시 미스는 한 스레드만 loader를 호출하고 나머지는 그 결과를 기다립니다.
+        값이 None이면 캐시하지 않습니다.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = [threading.Event(), True]
+
+        if not leader:
+            flight[0].wait(wait_timeout)
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    self.coalesced += 1
+                    return entry[1]
+            # 앞선 조회가 실패했거나 시간 초과 -> 직접 조회 (저장은 하지 않음)
+            value, _ = loader()
+            return value
+
+        try:
+            value, ttl = loader()
+            if value is not None:
+                size = self._sizeof(value)
+                with self._lock:
+                    if flight[1]:  # 조회 중에 delete()가 불렸으면 오래된 값이므로 저장하지 않음
+                        self._store(key, value, ttl, size)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight[0].set()
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+            flight = self._inflight.get(key)
+            if flight is not None:
+                flight[1] = False
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.coalesced = 0
+
+    def stats(self):
+        """적중/미스 카운터와 현재 크기를 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
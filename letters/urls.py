@@ -1,6 +1,6 @@
 from django.urls import path
 from . import views
-from .views import health_check
+from .views import health_check, cache_stats
 # from django.conf.urls.static import static
 # from django.conf import settings
 
@@ -8,10 +8,17 @@ from .views import health_check
 app_name = "letters" 
 urlpatterns = [
     path('write/', views.write_letter_api, name="write_letter_api"), # api/letters/write
+    path('write/bulk/', views.write_letters_bulk_api, name="write_letters_bulk_api"), # 여러 편지 한 번에 작성
+    path('write/direct-upload/', views.write_letter_direct_upload_api, name="write_letter_direct_upload_api"), # 편지 작성 + 이미지 업로드 URL 발급
+    path('<int:letter_id>/image/finalize/', views.finalize_letter_image_api, name="finalize_letter_image_api"), # 직접 업로드한 이미지 확정
     path('', views.letter_list_api, name='letter_list_api'),  # 작성한 편지 목록 api/letters/
+    path('search/', views.letter_search_api, name='letter_search_api'), # 제목/본문 전문 검색 api/letters/search/?q=
+    path('analytics/moods/', views.mood_analytics_api, name='mood_analytics_api'), # 주/월별 감정 추이 ?period=week&by=created_at
     path('<int:letter_id>/', views.letter_api, name="letter_api"),
+    path('delete/bulk/', views.delete_letters_bulk_api, name='delete_letters_bulk_api'), # 여러 편지 한 번에 삭제
     path('delete/<int:letter_id>/', views.delete_letter_api_internal, name='delete_letter_api_internal'), # 편지 삭제 API 엔드포인트 (내부 API)
     path('health/', health_check, name='health_check'),
+    path('internal/cache-stats/', cache_stats, name='cache_stats'), # 워커별 캐시 적중률 (내부용)
 ] 
 
 # # 개발 중일 때만 미디어 파일 서빙
@@ -0,0 +1,83 @@
+# letters/versioning.py
+# 사용자별 편지 버전: 편지 작성/삭제/감정 분석 결과 반영 때마다 올라가며,
+# 목록/상세 API의 ETag·Last-Modified를 만들어 변경이 없으면 Letters 테이블 조회 없이 304를 돌려줍니다.
+import hashlib
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.timezone import now
+
+from .models import UserLetterVersion
+
+# 상세 응답의 서명된 URL이 만료되기 전에 ETag가 바뀌도록 하는 주기(초)
+DETAIL_ETAG_WINDOW = getattr(settings, 'LETTER_DETAIL_ETAG_WINDOW', 30)
+
+
+def bump_letter_versions(user_ids):
+    """
+    user_ids의 편지 버전을 1씩 올립니다. 편지 변경과 같은 트랜잭션 안에서 호출해야 합니다.
+    행이 없으면 먼저 만들고(동시 생성은 무시) 올리므로 동시에 쓰는 요청도 각각 반영됩니다.
+    """
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})  # 잠금 순서 고정 (교착 방지)
+    if not user_ids:
+        return
+    UserLetterVersion.objects.bulk_create(
+        [UserLetterVersion(user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+    )
+    UserLetterVersion.objects.filter(user_id__in=user_ids).update(version=F('version') + 1, updated_at=now())
+
+
+def bump_letter_version(user_id):
+    bump_letter_versions([user_id])
+
+
+def get_letter_version(user_id):
+    """ (버전, 마지막 변경 시각)을 반환합니다. 아직 변경 기록이 없으면 (0, None) """
+    row = UserLetterVersion.objects.filter(user_id=user_id).values_list('version', 'updated_at').first()
+    return row or (0, None)
+
+
+async def aget_letter_version(user_id):
+    row = await UserLetterVersion.objects.filter(user_id=user_id).values_list('version', 'updated_at').afirst()
+    return row or (0, None)
+
+
+def letter_validators(user_id, version, updated_at, scope, window=None):
+    """
+    ETag와 Last-Modified(datetime)를 계산합니다.
+    - 오늘 날짜를 포함해 날짜가 바뀌면(카테고리 변경) 새 ETag가 됩니다.
+    - scope(요청 경로 + 쿼리)를 포함해 페이지/옵션마다 다른 ETag가 됩니다.
+    - window(초)를 주면 그 주기마다 ETag가 바뀝니다. (서명된 URL이 담긴 상세 응답용)
+    """
+    current = now()
+    today = current.date()
+    last_modified = datetime.combine(today, dt_time.min, tzinfo=dt_timezone.utc)
+    parts = [str(user_id), str(version), today.isoformat(), scope]
+    if window:
+        bucket = int(time.time() // window)
+        parts.append(str(bucket))
+        last_modified = max(last_modified, datetime.fromtimestamp(bucket * window, tz=dt_timezone.utc))
+    if updated_at is not None:
+        last_modified = max(last_modified, updated_at)
+    etag = '"%s"' % hashlib.sha256(':'.join(parts).encode('utf-8')).hexdigest()[:32]
+    return etag, last_modified
+
+
+def not_modified_response(request, etag, last_modified):
+    """ If-None-Match / If-Modified-Since가 현재 값과 맞으면 304 응답을, 아니면 None을 반환합니다. """
+    response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+    if response is not None:
+        set_conditional_headers(response, etag, last_modified)
+    return response
+
+
+def set_conditional_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    # 사용자별 응답이므로 공유 캐시에는 저장하지 않고, 클라이언트는 매번 재검증
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -1,26 +1,52 @@
+import logging
+from contextlib import nullcontext
+
 from django.shortcuts import get_object_or_404
-from .models import Letters
-from .serializers import LetterSerializer, LetterCreateSerializer
-from datetime import datetime
+from .models import Letters, category_for_date
+from .serializers import LetterSerializer, LetterProjectionSerializer, LetterCreateSerializer, BulkLetterCreateSerializer, DirectUploadLetterCreateSerializer, ImageFinalizeSerializer, BulkDeleteSerializer
+from .bulk_delete import delete_user_letters
+from .mood_analytics import InvalidAnalyticsQuery, mood_trends, parse_analytics_query, remove_from_mood_summary
 from django.conf import settings
-from rest_framework.decorators import api_view # DRF 데코레이터
+from rest_framework.decorators import api_view, renderer_classes # DRF 데코레이터
 from rest_framework.response import Response # DRF의 Response 객체
 from rest_framework import status # HTTP 상태 코드
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.db import transaction
+from django.utils.timezone import now
 from django.views.decorators.http import require_GET 
 
 # 스토리지, 토큰, 이모션 파일들 임포트
-from .storage_client import upload_image_to_storage, get_signed_url_from_storage, delete_image_from_storage
-from .auth_client import verify_access_token
-from .message_producers import publish_emotion_analysis_request
+from .image_processing import IMAGE_PROCESSING_ENABLED, ImageProcessingBusy, ImageProcessingError, process_uploaded_image
+from .storage_client import upload_image_to_storage, get_signed_url_from_storage, signed_url_cache, request_upload_target
+from .blob_deletions import deleted_blob_names, enqueue_blob_deletions
+from .auth_client import verify_access_token, token_cache
+from .outbox import enqueue_emotion_analysis_request, enqueue_emotion_analysis_requests
+from .pagination import InvalidCursor, paginate_by_open_date, parse_page_size
+from .search import InvalidSearchQuery, search_available, search_letters
+from .projections import InvalidProjection, parse_projection, project_queryset
+from .fast_serialization import letter_values, serialize_letter_rows
+from .renderers import LETTER_RENDERER_CLASSES, render_json
+from .db_router import read_from_replica
+from .metrics import expose_metrics
+from .internal_access import internal_only
+from .list_cache import LIST_CACHE_ENABLED, cached_letter_list, cache_stats as letter_list_cache_stats
+from .versioning import (
+    DETAIL_ETAG_WINDOW, bump_letter_version, get_letter_version, letter_validators,
+    not_modified_response, set_conditional_headers,
+)
+
+
 
+logger = logging.getLogger(__name__)
+
+LIST_FAST_PATH = getattr(settings, 'LETTER_LIST_FAST_PATH', True) # 목록을 values() 기반 빠른 경로로 직렬화
 
 
 # Authorization 헤더에서 사용자 ID 추출하는 유틸 함수
 def get_user_from_token(request):
     #Authorization 헤더에서 직접 토큰 파싱
     auth_header = request.headers.get("Authorization")
-    print("📦 Authorization 헤더:", auth_header)
+    logger.debug('📦 Authorization 헤더 %s', '있음' if auth_header else '없음')  # 토큰 값은 기록하지 않음
     if not auth_header or not auth_header.startswith("Bearer "):
         raise Exception("Access token missing in Authorization header")
     token = auth_header.split(" ")[1]
@@ -31,6 +57,15 @@ def get_user_from_token(request):
 
 
 
+def _enqueue_emotion_analysis(letter):
+    # 호출하는 쪽의 트랜잭션 안에서 감정 분석 요청을 아웃박스에 기록
+    if letter.content:
+        enqueue_emotion_analysis_request(letter)
+        logger.debug('🐰 편지 작성: 감정 분석 요청을 아웃박스에 기록 (편지 ID: %s, 유저 ID: %s)', letter.id, letter.user_id)
+    else:
+        logger.debug('ℹ️ 편지 작성: 내용이 없어 감정 분석 요청 건너뜀. 편지 ID: %s', letter.id)
+
+
 # 편지 작성 뷰
 @api_view(['POST'])
 def write_letter_api(request):
@@ -42,66 +77,213 @@ def write_letter_api(request):
 
     serializer = LetterCreateSerializer(data=request.data)
     if serializer.is_valid():
+        # 이미지는 편지를 저장하기 전에 정규화 (읽을 수 없는 이미지면 편지를 만들지 않음)
+        image_file = request.FILES.get('image')
+        processed_image = None
+        if image_file and IMAGE_PROCESSING_ENABLED:
+            try:
+                processed_image = process_uploaded_image(image_file)
+            except ImageProcessingError as e:
+                return Response({'image': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+            except ImageProcessingBusy as e:
+                return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'})
         try:
-            letter = serializer.save(user_id=user_id, category='future')  # ✅ 데이터 저장 전에 추가 설정
-            print(f"💾 편지 작성: 편지 저장 완료! (ID: {letter.id}, User: {letter.user_id})")
+            # 편지 저장과 감정 분석 요청(아웃박스)을 한 트랜잭션으로 기록 -> 릴레이가 RabbitMQ로 발행
+            # 이미지가 있으면 요청은 업로드가 성공한 뒤 이미지 연결과 함께 기록 (업로드 실패로 지워질 편지의 요청이 발행되지 않도록)
+            with transaction.atomic():
+                letter = serializer.save(user_id=user_id, category='future')  # ✅ 데이터 저장 전에 추가 설정
+                bump_letter_version(user_id)
+                if not image_file:
+                    _enqueue_emotion_analysis(letter)
+            logger.info('💾 편지 작성: 편지 저장 완료! (ID: %s, User: %s)', letter.id, letter.user_id)
 
             # 이미지 업로드 성공/실패 여부를 나타내는 변수(롤백을 위해 사용)
             image_upload_failed = False
 
             gcs_blob_name_for_letter = None
 
-            if request.FILES.get('image'):
-                print("🖼️ 편지 작성: 이미지 파일 감지됨. letter-storage-service에 업로드 시도...")
-                file_to_upload = request.FILES['image']
+            if image_file:
+                logger.debug('🖼️ 편지 작성: 이미지 파일 감지됨. letter-storage-service에 업로드 시도...')
+                file_to_upload = processed_image.image_file() if processed_image else image_file
                 gcs_blob_name_for_letter = upload_image_to_storage(file_to_upload, letter.id)
                     
                 if gcs_blob_name_for_letter:
                     letter.image_url = gcs_blob_name_for_letter
-                    print(f"🖼️✅ 편지 작성: 이미지 업로드 성공. Blob Name: {gcs_blob_name_for_letter}")
-                    letter.save()
+                    logger.debug('🖼️✅ 편지 작성: 이미지 업로드 성공. Blob Name: %s', gcs_blob_name_for_letter)
+                    if processed_image:
+                        # 썸네일 업로드 실패는 편지 저장을 막지 않음 (목록에서 thumbnail_url이 null)
+                        letter.thumbnail_url = upload_image_to_storage(processed_image.thumbnail_file(), letter.id)
+                        if not letter.thumbnail_url:
+                            logger.warning('🖼️❌ 편지 작성: 썸네일 업로드 실패. 편지 ID: %s', letter.id)
+                    with transaction.atomic():
+                        letter.save()
+                        _enqueue_emotion_analysis(letter)
+                        bump_letter_version(user_id)
                 else:
                     # 이미지 업로드 실패 시 로깅 (편지는 이미지 없이 저장됨)
-                    print(f"🖼️❌ 편지 작성: 이미지 업로드 실패. 이미지는 저장되지 않습니다.")
+                    logger.warning('🖼️❌ 편지 작성: 이미지 업로드 실패. 이미지는 저장되지 않습니다.')
                     letter.image_url = None # 또는 빈 문자열로 명시적 설정
                     image_upload_failed = True
 
             if image_upload_failed:
-                letter.delete()
-                print(f"🗑️ 이미지 업로드 실패로 편지 삭제됨 (ID: {letter.id})")
+                letter_id = letter.id
+                with transaction.atomic():
+                    remove_from_mood_summary(delete_user_letters(user_id, ids=[letter_id]))
+                    bump_letter_version(user_id)
+                logger.warning('🗑️ 이미지 업로드 실패로 편지 삭제됨 (ID: %s)', letter_id)
                 return Response(
                     {"error": "이미지 업로드에 실패하여 편지가 저장되지 않았습니다."},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
 
-            # RabbitMQ로 감정 분석 요청 발행 (user_id 포함)
-            if letter.id and letter.user_id and letter.content:
-                print(f"🐰 편지 작성: RabbitMQ로 감정 분석 요청 발행 시도... (편지 ID: {letter.id}, 유저 ID: {letter.user_id})")
-                publish_success = publish_emotion_analysis_request(
-                    letter_id=letter.id,
-                    user_id=letter.user_id,
-                    content=letter.content
-                )
-                if not publish_success:
-                    print(f"⚠️ 편지 작성: RabbitMQ 메시지 발행 실패! (편지 ID: {letter.id})")
-            else:
-                missing_parts = []
-                if not letter.id: missing_parts.append("ID")
-                if not letter.user_id: missing_parts.append("유저 ID")
-                if not letter.content: missing_parts.append("내용")
-                print(f"ℹ️ 편지 작성: RabbitMQ 메시지 발행 건너뜀 ({', '.join(missing_parts)} 누락). 편지 ID: {letter.id if letter.id else '미정의'}")
-                
             response_serializer = LetterSerializer(letter) 
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
         except Exception as e: # letter.save() 또는 그 이후 과정에서 발생할 수 있는 예외 처리
-            print(f"❌ 편지 작성: 편지 저장 또는 후속 처리 중 오류 발생! - {e}")
+            logger.exception('❌ 편지 작성: 편지 저장 또는 후속 처리 중 오류 발생! - %s', e)
             return Response({'error': '편지 저장 중 서버 내부 오류가 발생했습니다.', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     else: # serializer.is_valid()가 False일 때
-        print(f"📝❌ 편지 작성: 폼 유효성 검사 실패! 오류: {serializer.errors}")
+        logger.info('📝❌ 편지 작성: 폼 유효성 검사 실패! 오류: %s', serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
+# 여러 편지 한 번에 작성 (가져오기/마이그레이션용)
+@api_view(['POST'])
+def write_letters_bulk_api(request):
+
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    items = request.data.get('letters') if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not items:
+        return Response({"detail": "편지 목록(배열)이 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    max_batch = getattr(settings, 'LETTER_BULK_MAX_BATCH', 500)
+    if len(items) > max_batch:
+        return Response({"detail": f"한 번에 최대 {max_batch}개까지 작성할 수 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 항목별로 검증해 실패한 항목만 오류로 보고하고, 나머지는 한 번에 저장
+    today = now().date()
+    results = [None] * len(items)
+    new_letters, new_indexes = [], []
+    for index, item in enumerate(items):
+        serializer = BulkLetterCreateSerializer(data=item)  # 다른 사용자의 blob 이름을 붙일 수 없도록 image_url은 받지 않음
+        if not serializer.is_valid():
+            results[index] = {"index": index, "status": "invalid", "errors": serializer.errors}
+            continue
+        data = dict(serializer.validated_data)
+        # save()를 거치지 않으므로 카테고리를 여기서 계산
+        data['category'] = category_for_date(data['open_date'], today)
+        new_letters.append(Letters(user_id=user_id, **data))
+        new_indexes.append(index)
+
+    if new_letters:
+        try:
+            # 편지들과 감정 분석 요청(아웃박스)을 INSERT 묶음으로 한 트랜잭션에 기록
+            with transaction.atomic():
+                created = Letters.objects.bulk_create(new_letters)
+                queued = enqueue_emotion_analysis_requests(created)
+                bump_letter_version(user_id)
+        except Exception as e:
+            logger.exception('❌ 편지 일괄 작성: 저장 중 오류 발생! - %s', e)
+            return Response({'error': '편지 저장 중 서버 내부 오류가 발생했습니다.', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info('💾 편지 일괄 작성: %s개 저장, 감정 분석 요청 %s개 기록 (User: %s)', len(created), queued, user_id)
+        for index, letter in zip(new_indexes, LetterSerializer(created, many=True).data):
+            results[index] = {"index": index, "status": "created", "letter": letter}
+
+    invalid = len(items) - len(new_letters)
+    if not new_letters:
+        response_status = status.HTTP_400_BAD_REQUEST
+    elif invalid:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_201_CREATED
+    return Response({"created": len(new_letters), "invalid": invalid, "results": results}, status=response_status)
+
+
+# 편지 작성 + 이미지 직접 업로드 1단계: 편지를 만들고 스토리지 업로드 대상을 발급
+# (이미지 바이트는 letter-service를 거치지 않고 클라이언트가 스토리지로 바로 업로드)
+@api_view(['POST'])
+def write_letter_direct_upload_api(request):
+
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    serializer = DirectUploadLetterCreateSerializer(data=request.data)
+    if not serializer.is_valid():
+        logger.info('📝❌ 편지 작성(직접 업로드): 폼 유효성 검사 실패! 오류: %s', serializer.errors)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    content_type = serializer.validated_data.pop('image_content_type')
+    filename = serializer.validated_data.pop('image_filename', None)
+    try:
+        with transaction.atomic():
+            letter = serializer.save(user_id=user_id, category='future')
+            bump_letter_version(user_id)
+        logger.info('💾 편지 작성(직접 업로드): 편지 저장 완료! (ID: %s, User: %s)', letter.id, letter.user_id)
+
+        upload_target = request_upload_target(letter.id, content_type, filename)
+        if not upload_target:
+            letter_id = letter.id
+            with transaction.atomic():
+                remove_from_mood_summary(delete_user_letters(user_id, ids=[letter_id]))
+                bump_letter_version(user_id)
+            logger.warning('🗑️ 업로드 URL 발급 실패로 편지 삭제됨 (ID: %s)', letter_id)
+            return Response(
+                {"error": "이미지 업로드 URL 발급에 실패하여 편지가 저장되지 않았습니다."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        # 확정(finalize) 시 같은 blob인지 확인하기 위해 발급한 blob 이름을 기록 (save()를 거치지 않는 UPDATE)
+        # 감정 분석 요청도 업로드 대상이 발급된 뒤에 기록해, 버려지는 편지에 대한 요청이 발행되지 않게 함
+        with transaction.atomic():
+            Letters.objects.filter(id=letter.id).update(pending_image_blob=upload_target['blob_name'])
+            _enqueue_emotion_analysis(letter)
+        return Response({
+            "letter": LetterSerializer(letter).data,
+            "upload": upload_target,
+        }, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.exception('❌ 편지 작성(직접 업로드): 편지 저장 또는 업로드 URL 발급 중 오류 발생! - %s', e)
+        return Response({'error': '편지 저장 중 서버 내부 오류가 발생했습니다.', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# 이미지 직접 업로드 2단계: 클라이언트가 업로드를 마쳤다고 알리면 blob을 편지에 연결
+@api_view(['POST'])
+def finalize_letter_image_api(request, letter_id):
+
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    serializer = ImageFinalizeSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    blob_name = serializer.validated_data['blob_name']
+
+    # 이 편지에 발급된 blob일 때만 연결 (다른 사용자의 blob을 붙이는 것을 방지)
+    with transaction.atomic():
+        updated = Letters.objects.filter(id=letter_id, user_id=user_id, pending_image_blob=blob_name).update(
+            image_url=blob_name, pending_image_blob=None
+        )
+        if updated:
+            bump_letter_version(user_id)
+    if not updated:
+        if not Letters.objects.filter(id=letter_id, user_id=user_id).exists():
+            return Response({'status': 'error', 'message': '해당 편지를 찾을 수 없거나 권한이 없습니다.'}, status=404)
+        logger.warning("❌ 이미지 확정: 편지 ID %s에 발급되지 않은 blob '%s'", letter_id, blob_name)
+        return Response({'status': 'error', 'message': '이 편지에 발급된 업로드 대상이 아닙니다.'}, status=status.HTTP_409_CONFLICT)
+
+    logger.info("🖼️✅ 이미지 확정: 편지 ID %s에 blob '%s' 연결 완료.", letter_id, blob_name)
+    letter = Letters.objects.with_current_category().get(id=letter_id)
+    return Response(LetterSerializer(letter).data, status=status.HTTP_200_OK)
+
+
 # 2️⃣ 작성된 편지 목록 보기
 @api_view(['GET'])
 def letter_list_api(request):
@@ -111,37 +293,113 @@ def letter_list_api(request):
     except Exception as e:
         return Response({"detail": str(e)}, status=401)
 
-    # --- 인증된 사용자의 편지 목록 조회 ---
-    letters_qs = Letters.objects.filter(user_id=user_id)
-    print(f"� 편지 목록: User ID '{user_id}'의 편지 {letters_qs.count()}개 조회.")
+    # 사용자 편지 버전이 그대로면 편지를 조회하지 않고 304 응답
+    version, updated_at = get_letter_version(user_id)
+    etag, last_modified = letter_validators(user_id, version, updated_at, scope=request.get_full_path())
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    # --- 인증된 사용자의 편지 목록 조회 (cursor 기반 페이지) ---
+    # 같은 버전/날짜/쿼리의 목록은 직렬화된 JSON을 캐시에서 그대로 응답
+    def build():
+        limit = parse_page_size(request.query_params.get('limit'))
+        # fields= / view= 로 고른 필드에 필요한 컬럼만 조회 (content는 요청한 경우에만)
+        fields = parse_projection(request.query_params)
+        queryset = project_queryset(Letters.objects.filter(user_id=user_id).with_current_category(), fields)
+        if LIST_FAST_PATH:
+            # 모델 인스턴스 없이 values() 행을 바로 응답 dict로 변환 (LetterProjectionSerializer와 같은 모양)
+            rows, next_cursor = paginate_by_open_date(
+                letter_values(queryset, fields), cursor=request.query_params.get('cursor'), limit=limit,
+            )
+            results = serialize_letter_rows(rows, fields)
+        else:
+            # 카테고리는 오늘 날짜 기준으로 DB에서 계산 (행마다 Python 계산/저장 없음)
+            letters_page, next_cursor = paginate_by_open_date(queryset, cursor=request.query_params.get('cursor'), limit=limit)
+            # LetterProjectionSerializer를 사용하여 선택한 필드만 직렬화
+            results = LetterProjectionSerializer(letters_page, many=True, fields=fields).data
+        logger.debug("📚 편지 목록: User ID '%s'의 편지 %s개 조회.", user_id, len(results))
+        return render_json({"results": results, "next_cursor": next_cursor})
 
-    today = datetime.now().date()
+    try:
+        # 캐시에 넣는 응답은 (primary에서 읽은) 현재 버전 키로 저장되므로 primary에서 만듦
+        # -> 지연된 replica의 이전 목록이 새 버전으로 캐시되지 않음. 캐시를 쓰지 않을 때만 replica에서 조회
+        reads = nullcontext() if LIST_CACHE_ENABLED else read_from_replica(last_write_at=updated_at)
+        with reads:
+            content = cached_letter_list(user_id, version, request.get_full_path(), build)
+    except (InvalidCursor, InvalidProjection) as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # 카테고리 업데이트 로직
-    letters_to_update = []
-    for letter_item in letters_qs:
-        original_category = letter_item.category
-        new_category = original_category
+    response = HttpResponse(content, content_type='application/json', status=status.HTTP_200_OK)
+    return set_conditional_headers(response, etag, last_modified)
 
-        if letter_item.open_date == today:
-            new_category = 'today'
-        elif letter_item.open_date > today:
-            new_category = 'future'
-        else:
-            new_category = 'past'
-        
-        if original_category != new_category:
-            letter_item.category = new_category
-            letters_to_update.append(letter_item) # 변경된 편지만 리스트에 추가
-
-    # LetterSerializer를 사용하여 편지 목록 데이터를 직렬화
-    serializer = LetterSerializer(letters_qs, many=True)
-    
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+# 편지 제목 / 본문 전문 검색 api (관련도 순, cursor 페이지)
+@api_view(['GET'])
+def letter_search_api(request):
+
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    if not search_available():
+        return Response({"detail": "이 데이터베이스에서는 검색을 지원하지 않습니다."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    # 편지가 바뀌지 않았으면 같은 검색 결과이므로 304 응답
+    version, updated_at = get_letter_version(user_id)
+    etag, last_modified = letter_validators(user_id, version, updated_at, scope=request.get_full_path())
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        limit = parse_page_size(request.query_params.get('limit'))
+        with read_from_replica(last_write_at=updated_at):
+            results, next_cursor = search_letters(
+                user_id, request.query_params.get('q'), cursor=request.query_params.get('cursor'), limit=limit,
+            )
+    except (InvalidCursor, InvalidSearchQuery) as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    logger.debug("🔎 편지 검색: User ID '%s'의 편지 %s개 일치.", user_id, len(results))
+
+    response = HttpResponse(render_json({"results": results, "next_cursor": next_cursor}),
+                            content_type='application/json', status=status.HTTP_200_OK)
+    return set_conditional_headers(response, etag, last_modified)
+
+
+# 사용자 감정 추이 api (주/월 구간별 mood, detailed_mood 개수)
+@api_view(['GET'])
+def mood_analytics_api(request):
+
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    # 감정 결과 반영 / 삭제 때 버전이 올라가므로 그대로면 304 응답
+    version, updated_at = get_letter_version(user_id)
+    etag, last_modified = letter_validators(user_id, version, updated_at, scope=request.get_full_path())
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        period, basis, start, end = parse_analytics_query(request.query_params)
+    except InvalidAnalyticsQuery as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    # 편지 테이블이 아닌 집계 테이블(MoodSummary)에서 조회
+    with read_from_replica(last_write_at=updated_at):
+        results = mood_trends(user_id, period=period, basis=basis, start=start, end=end)
+
+    response = HttpResponse(render_json({"period": period, "by": basis, "results": results}),
+                            content_type='application/json', status=status.HTTP_200_OK)
+    return set_conditional_headers(response, etag, last_modified)
 
 
 # 개별 편지 상세보기 api
 @api_view(['GET'])
+@renderer_classes(LETTER_RENDERER_CLASSES)
 def letter_api(request, letter_id):
 
     try:
@@ -149,28 +407,39 @@ def letter_api(request, letter_id):
     except Exception as e:
         return Response({"detail": str(e)}, status=401)
 
-    # --- 인증된 사용자의 특정 편지 조회 ---
-    letter = get_object_or_404(Letters, id=letter_id, user_id=user_id)
-    print(f"🔍 편지 상세 API: 편지 ID {letter_id} (소유자 ID : {user_id}) 조회 성공.")
+    # 변경이 없으면 편지 조회와 서명된 URL 요청 없이 304 응답 (서명된 URL 만료 전에 ETag가 바뀌도록 주기 포함)
+    version, updated_at = get_letter_version(user_id)
+    etag, last_modified = letter_validators(
+        user_id, version, updated_at, scope=request.get_full_path(), window=DETAIL_ETAG_WINDOW
+    )
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    # --- 인증된 사용자의 특정 편지 조회 (replica, 최근에 변경한 사용자는 primary) ---
+    with read_from_replica(last_write_at=updated_at):
+        letter = get_object_or_404(Letters.objects.with_current_category(), id=letter_id, user_id=user_id)
+    logger.debug('🔍 편지 상세 API: 편지 ID %s (소유자 ID : %s) 조회 성공.', letter_id, user_id)
 
     serializer = LetterSerializer(letter)
     response_data = serializer.data # 직렬화된 데이터 가져오기
 
     # signed_url_from_api = None --> Serializer가 blob 이름을 반환한다고 바꿈
     if letter.image_url:
-        print(f"🖼️ 편지 상세 API: 이미지 blob '{letter.image_url}'에 대한 서명된 URL 요청 시도...")
+        logger.debug("🖼️ 편지 상세 API: 이미지 blob '%s'에 대한 서명된 URL 요청 시도...", letter.image_url)
         signed_url_from_api = get_signed_url_from_storage(letter.image_url)
         response_data['image_url'] = signed_url_from_api # 직렬화된 데이터의 image_url 값을 서명된 URL로 덮어쓰기
         if signed_url_from_api:
-            print(f"🖼️✅ 편지 상세 API: 서명된 URL 생성 성공.")
+            logger.debug('🖼️✅ 편지 상세 API: 서명된 URL 생성 성공.')
         else:
-            print(f"🖼️❌ 편지 상세 API: 서명된 URL 생성 실패.")
+            logger.warning('🖼️❌ 편지 상세 API: 서명된 URL 생성 실패.')
     else:
-        print("ℹ️ 편지 상세 API: 편지에 이미지가 없습니다.")
+        logger.debug('ℹ️ 편지 상세 API: 편지에 이미지가 없습니다.')
         response_data['image_url'] = None # 이미지가 없는 경우 명시적으로 None 설정
+    response_data['thumbnail_url'] = get_signed_url_from_storage(letter.thumbnail_url) if letter.thumbnail_url else None
 
-    print(f"✅ 편지 상세 API: 편지 ID {letter.id} 데이터 준비 완료.")
-    return Response(response_data, status=status.HTTP_200_OK)
+    logger.debug('✅ 편지 상세 API: 편지 ID %s 데이터 준비 완료.', letter.id)
+    return set_conditional_headers(Response(response_data, status=status.HTTP_200_OK), etag, last_modified)
 
 
 # 4️⃣ 편지 삭제 API (내부 API)
@@ -184,33 +453,79 @@ def delete_letter_api_internal(request, letter_id):
 
     # --- 인증된 사용자의 특정 편지 삭제 ---
     try:
-        letter = Letters.objects.get(id=letter_id, user_id=user_id)
-        print(f"🗑️ 편지 삭제 API: 편지 ID {letter_id} (소유자 ID : {user_id}) 삭제 시도...")
-        
-        image_blob_name_to_delete = letter.image_url
-        letter.delete()
-        print(f"🗑️✅ 편지 삭제 API: DB에서 편지 ID {letter_id} 삭제 완료.")
-
-        if image_blob_name_to_delete:
-            print(f"🖼️🗑️ 편지 삭제 API: 스토리지에서 이미지 '{image_blob_name_to_delete}' 삭제 시도...")
-            delete_success = delete_image_from_storage(image_blob_name_to_delete)
-            if delete_success:
-                print(f"🖼️🗑️✅ 편지 삭제 API: 스토리지에서 이미지 '{image_blob_name_to_delete}' 삭제 성공.")
-            else:
-                print(f"🖼️🗑️❌ 편지 삭제 API: 스토리지에서 이미지 '{image_blob_name_to_delete}' 삭제 실패 또는 이미 없음.")
-        else:
-            print("ℹ️ 편지 삭제 API: 편지에 삭제할 이미지가 없습니다.")
-            
+        logger.debug('🗑️ 편지 삭제 API: 편지 ID %s (소유자 ID : %s) 삭제 시도...', letter_id, user_id)
+
+        # 편지 삭제와 이미지 삭제 예약을 한 트랜잭션으로 기록 -> 실제 스토리지 삭제는 drain_blob_deletions 워커가 처리
+        # blob 이름과 감정은 DELETE ... RETURNING으로 받은 삭제 시점 값을 사용 (확정되지 않은 직접 업로드 blob 포함)
+        with transaction.atomic():
+            deleted = delete_user_letters(user_id, ids=[letter_id])
+            if deleted:
+                images_queued = enqueue_blob_deletions(deleted_blob_names(deleted))
+                remove_from_mood_summary(deleted)
+                bump_letter_version(user_id)
+        if not deleted:
+            logger.info('❌ 편지 삭제 API: 편지 ID %s (소유자 ID : %s)를 찾을 수 없거나 권한이 없습니다.', letter_id, user_id)
+            return Response({'status': 'error', 'message': '해당 편지를 찾을 수 없거나 삭제 권한이 없습니다.'}, status=404)
+        logger.info('🗑️✅ 편지 삭제 API: DB에서 편지 ID %s 삭제 완료. (이미지 %s개 삭제 예약)', letter_id, images_queued)
+
         return Response({'status': 'success', 'message': '편지가 성공적으로 삭제되었습니다.'}, status=200)
-    
-    except Letters.DoesNotExist:
-        print(f"❌ 편지 삭제 API: 편지 ID {letter_id} (소유자 ID : {user_id})를 찾을 수 없거나 권한이 없습니다.")
-        return Response({'status': 'error', 'message': '해당 편지를 찾을 수 없거나 삭제 권한이 없습니다.'}, status=404)
+
     except Exception as e:
-        print(f"❌ 편지 삭제 API: 편지 ID {letter_id} 삭제 중 예상치 못한 오류 발생! {e}", exc_info=True)
+        logger.exception('❌ 편지 삭제 API: 편지 ID %s 삭제 중 예상치 못한 오류 발생! %s', letter_id, e)
         return Response({'status': 'error', 'message': '편지 삭제 중 오류가 발생했습니다.'}, status=500)
 
+# 여러 편지 한 번에 삭제 API (계정 정리 / 보관 기간 만료 작업용)
+@api_view(["POST", "DELETE"])
+def delete_letters_bulk_api(request):
+    try:
+        user_id = get_user_from_token(request)
+    except Exception as e:
+        return Response({"detail": str(e)}, status=401)
+
+    serializer = BulkDeleteSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    ids = serializer.validated_data.get('ids')
+    open_date_before = serializer.validated_data.get('open_date_before')
+
+    try:
+        # 편지 삭제(DELETE ... RETURNING)와 이미지 삭제 예약을 한 트랜잭션으로 처리
+        with transaction.atomic():
+            deleted = delete_user_letters(user_id, ids=ids, open_date_before=open_date_before)
+            images_queued = enqueue_blob_deletions(deleted_blob_names(deleted))
+            remove_from_mood_summary(deleted)
+            if deleted:
+                bump_letter_version(user_id)
+    except Exception as e:
+        logger.exception('❌ 편지 일괄 삭제 API: User ID %s 삭제 중 예상치 못한 오류 발생! %s', user_id, e)
+        return Response({'status': 'error', 'message': '편지 삭제 중 오류가 발생했습니다.'}, status=500)
+
+    logger.info('🗑️✅ 편지 일괄 삭제 API: User ID %s의 편지 %s개 삭제, 이미지 %s개 삭제 예약.', user_id, len(deleted), images_queued)
+    summary = {'status': 'success', 'deleted': len(deleted), 'images_queued': images_queued}
+    if ids is not None:
+        deleted_ids = {row['id'] for row in deleted}
+        summary['not_found'] = [letter_id for letter_id in dict.fromkeys(ids) if letter_id not in deleted_ids]
+    return Response(summary, status=200)
+
 #헬스체크 뷰
 @require_GET
 def health_check(request):
-    return JsonResponse({"status": "ok"})
\ No newline at end of file
+    return JsonResponse({"status": "ok"})
+
+
+# 워커 내 캐시 적중률 확인용 (캐시 크기/TTL 튜닝) - 내부 네트워크 / 내부 토큰만
+@require_GET
+@internal_only
+def cache_stats(request):
+    return JsonResponse({
+        "auth_token_cache": token_cache.stats(),
+        "signed_url_cache": signed_url_cache.stats(),
+        "letter_list_cache": letter_list_cache_stats(),
+    })
+
+
+# Prometheus 스크레이프용 요청 / 의존성 지연 히스토그램과 오류 카운터 - 내부 네트워크 / 내부 토큰만
+@require_GET
+@internal_only
+def metrics(request):
+    return HttpResponse(expose_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')